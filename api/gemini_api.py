@@ -1,17 +1,103 @@
 import os
+import sys
 import json
 import time
+import asyncio
 from typing import List, Dict, Any, Optional, Union
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+# Allow running this file directly as a script from the repository root
+if __name__ == "__main__" and not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import gemini_client
+from core.async_utils import run_sync
+from core.json_repair import parse_partial_json
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
+# Gemini is configured and its models are shared through core.gemini_client
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+
+# Model and settings for persona enrichment (a free model with JSON schema output)
+PERSONA_MODEL = "gemini-2.0-flash"
+
+PERSONA_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 1024,
+    "response_mime_type": "application/json",
+}
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+# Persona fields returned by Gemini; every field is requested, with "" or [] when unknown
+PERSONA_FIELD_SCHEMAS = {
+    "name": _STRING,
+    "intro": _STRING,
+    "company_industry": _STRING,
+    "company_size": _STRING,
+    "location": _STRING,
+    "timezone": _STRING,
+    "social_profile": _STRING_LIST,
+    "keywords": _STRING_LIST,
+    "interests": _STRING_LIST,
+    "skills": _STRING_LIST,
+    "education": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "school": _STRING,
+                "degree": _STRING,
+                "field": _STRING,
+                "start_date": _STRING,
+                "end_date": _STRING,
+            },
+        },
+    },
+    "work_history": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "company": _STRING,
+                "title": _STRING,
+                "start_date": _STRING,
+                "end_date": _STRING,
+                "industry": _STRING,
+            },
+        },
+    },
+}
+
+def persona_generation_config(fields: Optional[List[str]] = None) -> Dict:
+    """
+    Build a generation config that constrains the response to the persona schema.
+    
+    Args:
+        fields: Persona fields to request (defaults to all of them)
+        
+    Returns:
+        Generation config dictionary
+    """
+    fields = fields or list(PERSONA_FIELD_SCHEMAS)
+    config = dict(PERSONA_GENERATION_CONFIG)
+    config["response_schema"] = {
+        "type": "object",
+        "properties": {field: PERSONA_FIELD_SCHEMAS[field] for field in fields},
+        "required": fields,
+    }
+    return config
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
 
 def construct_profile_description(profile_blocks: List[Dict]) -> str:
     """
@@ -87,10 +173,112 @@ def construct_profile_description(profile_blocks: List[Dict]) -> str:
     
     return full_description
 
+def build_persona_prompt(description: str) -> str:
+    """
+    Build the Gemini prompt for persona enrichment.
+    
+    Args:
+        description: A string describing the profiles
+        
+    Returns:
+        The prompt text
+    """
+    # Prompt template for Gemini
+    return f"""
+    I have collected social profile information about a person. I need you to analyze this information 
+    and create a comprehensive persona JSON that can be used for LinkedIn profile finding.
+    
+    Here's the information I've gathered:
+    
+    {description}
+    
+    Based on this information, please create a JSON persona with the following fields:
+    - name: The person's full name (if available) or most likely name
+    - intro: A professional headline or introduction for the person
+    - company_industry: The industry they likely work in
+    - company_size: Estimated company size (if identifiable)
+    - location: Geographic location
+    - timezone: Likely timezone based on location (if determinable)
+    - social_profile: Array of social profile URLs
+    - keywords: Array of professional keywords that describe their expertise
+    - interests: Array of professional interests
+    - skills: Array of likely professional skills
+    - education: Any education information found
+    - work_history: Any work history information found
+    
+    Feel free to infer reasonable values for fields that aren't explicitly mentioned in the
+    profiles but can be reasonably inferred. Use "" or [] for fields that cannot be inferred.
+    """
+
+def build_missing_fields_prompt(description: str, fields: List[str]) -> str:
+    """
+    Build a prompt that asks only for persona fields missing from an earlier response.
+    
+    Args:
+        description: A string describing the profiles
+        fields: The missing persona fields
+        
+    Returns:
+        The prompt text
+    """
+    return f"""
+    I have collected social profile information about a person:
+    
+    {description}
+    
+    Based on this information, return a JSON object with only these persona fields:
+    {", ".join(fields)}
+    
+    Use the same meaning as for a LinkedIn-search persona (intro is a professional
+    headline, keywords/interests/skills are arrays). Use "" or [] when a field
+    cannot be inferred.
+    """
+
+def parse_persona_response(response) -> Optional[Dict]:
+    """
+    Parse the persona JSON from a Gemini response, repairing truncated output.
+    
+    Args:
+        response: The Gemini response
+        
+    Returns:
+        Dictionary with the persona fields that could be recovered, or None if none could
+    """
+    try:
+        response_text = response.text
+    except ValueError as e:
+        # No text (e.g. the response was blocked)
+        print(f"Error reading Gemini response: {e}")
+        return None
+    
+    persona, complete = parse_partial_json(response_text)
+    if not isinstance(persona, dict):
+        print(f"Error parsing Gemini response: {response_text[:200]}")
+        return None
+    if not complete:
+        print("Gemini response was truncated; recovered the complete fields")
+    return persona
+
+def missing_persona_fields(persona: Optional[Dict]) -> List[str]:
+    """Return the persona fields absent from a (possibly partial) response."""
+    return [field for field in PERSONA_FIELD_SCHEMAS if field not in (persona or {})]
+
+def _merge_missing_fields(persona: Optional[Dict], retry_persona: Optional[Dict],
+                          missing: List[str]) -> Optional[Dict]:
+    if not retry_persona:
+        return persona
+    merged = dict(persona or {})
+    merged.update({field: retry_persona[field] for field in missing if field in retry_persona})
+    return merged
+
 def generate_enriched_persona_with_gemini(description: str) -> Optional[Dict]:
     """
     Use Gemini to generate an enriched persona based on the profile description.
     
+    The response is constrained to the persona JSON schema. If it comes back
+    truncated, the complete fields are kept and one follow-up request asks only for
+    the missing ones.
+    
     Args:
         description: A string describing the profiles
         
@@ -102,108 +290,78 @@ def generate_enriched_persona_with_gemini(description: str) -> Optional[Dict]:
         return None
     
     try:
-        # Create a generation config for structured output
-        generation_config = {
-            "temperature": 0.2,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 1024,
-        }
-        
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-        ]
-        
-        # Prompt template for Gemini
-        prompt = f"""
-        I have collected social profile information about a person. I need you to analyze this information 
-        and create a comprehensive persona JSON that can be used for LinkedIn profile finding.
-        
-        Here's the information I've gathered:
-        
-        {description}
-        
-        Based on this information, please create a JSON persona with the following fields:
-        - name: The person's full name (if available) or most likely name
-        - intro: A professional headline or introduction for the person
-        - company_industry: The industry they likely work in
-        - company_size: Estimated company size (if identifiable)
-        - location: Geographic location
-        - timezone: Likely timezone based on location (if determinable)
-        - social_profile: Array of social profile URLs
-        - keywords: Array of professional keywords that describe their expertise
-        - interests: Array of professional interests
-        - skills: Array of likely professional skills
-        - education: Any education information found
-        - work_history: Any work history information found
-        
-        Format your response as a valid JSON object. Feel free to infer reasonable values for fields 
-        that aren't explicitly mentioned in the profiles but can be reasonably inferred.
-        
-        Return ONLY the JSON object without any additional text or explanation.
-        """
-        
-        # Initialize Gemini model (use the free model)
-        model = genai.GenerativeModel(
-            model_name="gemini-pro",
-            generation_config=generation_config,
-            safety_settings=safety_settings
+        # Shared model, concurrency limit and retries on 429/5xx
+        response = gemini_client.generate_content(
+            build_persona_prompt(description),
+            model_name=PERSONA_MODEL,
+            generation_config=persona_generation_config(),
+            safety_settings=SAFETY_SETTINGS,
         )
+        persona = parse_persona_response(response)
         
-        # Generate the response
-        response = model.generate_content(prompt)
-        
-        # Extract and parse the JSON from the response
-        try:
-            # Try to extract JSON directly from the response
-            response_text = response.text
-            
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            # Parse the JSON
-            enriched_persona = json.loads(response_text)
-            return enriched_persona
-        except (json.JSONDecodeError, IndexError) as e:
-            print(f"Error parsing Gemini response: {e}")
-            print(f"Response text: {response.text}")
-            return None
+        missing = missing_persona_fields(persona)
+        if persona is not None and missing:
+            print(f"Requesting missing persona fields: {', '.join(missing)}")
+            response = gemini_client.generate_content(
+                build_missing_fields_prompt(description, missing),
+                model_name=PERSONA_MODEL,
+                generation_config=persona_generation_config(missing),
+                safety_settings=SAFETY_SETTINGS,
+            )
+            persona = _merge_missing_fields(persona, parse_persona_response(response), missing)
+        return persona
     
     except Exception as e:
         print(f"Error with Gemini API: {e}")
         return None
 
-def generate_enriched_persona(profile_blocks: List[Dict]) -> Dict:
+async def generate_enriched_persona_with_gemini_async(description: str) -> Optional[Dict]:
     """
-    Generate an enriched persona from raw social profile data using AI.
-    Uses Gemini API for enrichment.
+    Async version of generate_enriched_persona_with_gemini (does not block the event loop).
     
     Args:
-        profile_blocks: List of dictionaries containing social profile data
+        description: A string describing the profiles
         
     Returns:
-        An enriched persona dictionary
+        Dictionary containing the enriched persona or None if unsuccessful
     """
-    # Construct a descriptive string from the profile data
-    description = construct_profile_description(profile_blocks)
+    if not GEMINI_API_KEY:
+        print("Gemini API key not set. Cannot use Gemini API.")
+        return None
+    
+    try:
+        response = await gemini_client.generate_content_async(
+            build_persona_prompt(description),
+            model_name=PERSONA_MODEL,
+            generation_config=persona_generation_config(),
+            safety_settings=SAFETY_SETTINGS,
+        )
+        persona = parse_persona_response(response)
+        
+        missing = missing_persona_fields(persona)
+        if persona is not None and missing:
+            print(f"Requesting missing persona fields: {', '.join(missing)}")
+            response = await gemini_client.generate_content_async(
+                build_missing_fields_prompt(description, missing),
+                model_name=PERSONA_MODEL,
+                generation_config=persona_generation_config(missing),
+                safety_settings=SAFETY_SETTINGS,
+            )
+            persona = _merge_missing_fields(persona, parse_persona_response(response), missing)
+        return persona
     
+    except Exception as e:
+        print(f"Error with Gemini API: {e}")
+        return None
+
+def _complete_persona(result: Optional[Dict], profile_blocks: List[Dict]) -> Dict:
+    """Fall back to a basic persona if needed and merge in the original profile URLs."""
     # Extract existing profile URLs to preserve them
     social_profile_urls = []
     for profile in profile_blocks:
         if profile.get("url"):
             social_profile_urls.append(profile.get("url"))
     
-    # Try with Gemini
-    result = None
-    if GEMINI_API_KEY:
-        result = generate_enriched_persona_with_gemini(description)
-    
     # If Gemini failed, create a basic persona from the raw data
     if result is None:
         result = create_basic_persona(profile_blocks)
@@ -218,6 +376,63 @@ def generate_enriched_persona(profile_blocks: List[Dict]) -> Dict:
     
     return result
 
+def generate_enriched_persona(profile_blocks: List[Dict]) -> Dict:
+    """
+    Generate an enriched persona from raw social profile data using AI.
+    Uses Gemini API for enrichment.
+    
+    Args:
+        profile_blocks: List of dictionaries containing social profile data
+        
+    Returns:
+        An enriched persona dictionary
+    """
+    # Construct a descriptive string from the profile data
+    description = construct_profile_description(profile_blocks)
+    
+    # Try with Gemini
+    result = None
+    if GEMINI_API_KEY:
+        result = generate_enriched_persona_with_gemini(description)
+    
+    return _complete_persona(result, profile_blocks)
+
+async def generate_enriched_persona_async(profile_blocks: List[Dict]) -> Dict:
+    """
+    Async version of generate_enriched_persona.
+    
+    Args:
+        profile_blocks: List of dictionaries containing social profile data
+        
+    Returns:
+        An enriched persona dictionary
+    """
+    description = construct_profile_description(profile_blocks)
+    
+    result = None
+    if GEMINI_API_KEY:
+        result = await generate_enriched_persona_with_gemini_async(description)
+    
+    return _complete_persona(result, profile_blocks)
+
+def generate_enriched_personas(profile_block_lists: List[List[Dict]]) -> List[Dict]:
+    """
+    Generate enriched personas for many people concurrently.
+    Requests run on one event loop, limited by GEMINI_MAX_CONCURRENCY (a worker
+    thread's loop if an event loop is already running in this thread).
+    
+    Args:
+        profile_block_lists: One list of social profile dictionaries per person
+        
+    Returns:
+        One enriched persona dictionary per person, in input order
+    """
+    async def run():
+        return await asyncio.gather(*(
+            generate_enriched_persona_async(profile_blocks) for profile_blocks in profile_block_lists
+        ))
+    return list(run_sync(run()))
+
 def create_basic_persona(profile_blocks: List[Dict]) -> Dict:
     """
     Create a basic persona from raw profile data when AI enrichment fails.
@@ -5,17 +5,96 @@ This module provides functions to enrich persona data using the People Data Labs
 """
 
 import os
+import re
+import sys
 import json
+import hashlib
+import threading
+import unicodedata
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 
+# Allow running this file directly as a script from the repository root
+if __name__ == "__main__" and not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.cache import SQLiteCache
+from core.http_client import get_session
+from core.rate_limiter import TokenBucket, get_rate_limiter
+from core.single_flight import get_single_flight
+
 # Load environment variables
 load_dotenv()
 
 # API Configuration
 PDL_API_KEY = os.environ.get("PEOPLE_API_KEY")
 PDL_API_URL = "https://api.peopledatalabs.com/v5/person/enrich"
+PDL_BULK_API_URL = "https://api.peopledatalabs.com/v5/person/bulk"
+
+# Maximum requests per bulk call (API limit)
+PDL_BULK_CHUNK_SIZE = 100
+
+# Bulk calls in flight at once
+PDL_BULK_CONCURRENCY = 4
+
+# How long matches and no-match results are cached (every PDL call is billed)
+PDL_HIT_TTL = 30 * 24 * 60 * 60
+PDL_MISS_TTL = 7 * 24 * 60 * 60
+
+_pdl_cache = None
+_pdl_cache_lock = threading.Lock()
+
+def get_pdl_cache() -> SQLiteCache:
+    """Return the persistent PDL response cache, creating it on first use."""
+    global _pdl_cache
+    if _pdl_cache is None:
+        with _pdl_cache_lock:
+            if _pdl_cache is None:
+                _pdl_cache = SQLiteCache(namespace="pdl")
+    return _pdl_cache
+
+def _normalize_text(value: Any) -> str:
+    text = unicodedata.normalize("NFKC", str(value)).lower()
+    text = re.sub(r"[.,]", " ", text)
+    return " ".join(text.split())
+
+def _normalize_profile_url(url: str) -> str:
+    url = url.strip().lower()
+    url = re.sub(r"^https?://(www\.)?", "", url)
+    return url.replace("x.com/", "twitter.com/", 1).rstrip("/")
+
+def pdl_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a create_pdl_params payload.
+    
+    Equivalent payloads share a key: names, locations, companies and emails are
+    case- and whitespace-normalized, and profile URLs are normalized and sorted.
+    
+    Args:
+        payload: Output of create_pdl_params
+        
+    Returns:
+        Hex digest identifying the request
+    """
+    params = payload.get("params", {})
+    canonical = {
+        key: _normalize_text(value)
+        for key, value in params.items() if key != "profile"
+    }
+    profiles = params.get("profile") or {}
+    canonical["profile"] = sorted(_normalize_profile_url(url) for url in profiles.values())
+    canonical["min_likelihood"] = payload.get("min_likelihood")
+    canonical["required"] = payload.get("required")
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+def _cache_pdl_response(key: str, pdl_data: Dict[str, Any]) -> None:
+    """Cache a match or no-match (404) result; errors are not cached."""
+    status = pdl_data.get("status")
+    if status == 200:
+        get_pdl_cache().set(key, pdl_data, ttl=PDL_HIT_TTL)
+    elif status == 404:
+        get_pdl_cache().set(key, {"status": 404}, ttl=PDL_MISS_TTL)
 
 def enrich_persona_with_pdl(persona: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -38,6 +117,15 @@ def enrich_persona_with_pdl(persona: Dict[str, Any]) -> Dict[str, Any]:
         print("Insufficient data for PDL enrichment.")
         return persona
     
+    # Matches and no-matches are cached, so repeats are not billed
+    key = pdl_cache_key(params)
+    pdl_data = get_pdl_cache().get(key)
+    if pdl_data is not None:
+        if pdl_data.get("status") != 200:
+            print("PDL API returned no match (cached)")
+            return persona
+        return enhance_persona_with_pdl_data(persona, pdl_data)
+    
     try:
         # Make the API request
         headers = {
@@ -45,19 +133,22 @@ def enrich_persona_with_pdl(persona: Dict[str, Any]) -> Dict[str, Any]:
             "X-Api-Key": PDL_API_KEY
         }
         
-        response = requests.post(
-            PDL_API_URL,
-            json=params,
-            headers=headers,
-            timeout=15
+        # Identical concurrent enrichments share one request
+        response = get_single_flight("pdl").do(
+            key,
+            lambda: requests.post(PDL_API_URL, json=params, headers=headers, timeout=15)
         )
         
+        if response.status_code == 404:
+            _cache_pdl_response(key, {"status": 404})
+        
         if response.status_code != 200:
             print(f"PDL API error: {response.status_code} - {response.text}")
             return persona
         
         # Parse the response
         pdl_data = response.json()
+        _cache_pdl_response(key, pdl_data)
         
         # Check if we got a valid match
         if not pdl_data.get("status") or pdl_data.get("status") != 200:
@@ -72,6 +163,128 @@ def enrich_persona_with_pdl(persona: Dict[str, Any]) -> Dict[str, Any]:
         print(f"Error enriching with PDL: {e}")
         return persona
 
+def _post_pdl_bulk(chunk: List[Dict[str, Any]], bucket: TokenBucket) -> List[Dict[str, Any]]:
+    """
+    Submit one bulk call and return its responses in request order.
+    
+    Args:
+        chunk: Up to 100 create_pdl_params payloads
+        bucket: Rate limit applied to bulk calls
+        
+    Returns:
+        One PDL response per payload ({} for requests without a response)
+    """
+    body = {
+        # min_likelihood and required are the same for every payload
+        "min_likelihood": chunk[0].get("min_likelihood"),
+        "required": chunk[0].get("required"),
+        "requests": [
+            {"params": payload["params"], "metadata": {"index": i}}
+            for i, payload in enumerate(chunk)
+        ],
+    }
+    headers = {
+        "Content-Type": "application/json",
+        "X-Api-Key": PDL_API_KEY
+    }
+    
+    bucket.acquire()
+    response = get_session().post(PDL_BULK_API_URL, json=body, headers=headers, timeout=60)
+    bucket.update(response)
+    if response.status_code != 200:
+        print(f"PDL bulk API error: {response.status_code} - {response.text}")
+        return [{} for _ in chunk]
+    
+    # Responses come back in request order; metadata confirms the position
+    results = [{} for _ in chunk]
+    for position, item in enumerate(response.json()):
+        index = (item.get("metadata") or {}).get("index", position)
+        if 0 <= index < len(chunk):
+            results[index] = item
+    return results
+
+def enrich_personas_with_pdl(personas: List[Dict[str, Any]],
+                             max_concurrency: int = PDL_BULK_CONCURRENCY,
+                             requests_per_minute: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Enrich many personas with the People Data Labs bulk API.
+    
+    Payloads are built with create_pdl_params. Cached results are used directly and
+    identical payloads within the batch are collapsed before anything is sent; the
+    remaining unique payloads are submitted in chunks of up to 100 per call, with
+    chunks running concurrently under a rate limit. Each response is mapped back to
+    its personas and applied with enhance_persona_with_pdl_data.
+    
+    Args:
+        personas: List of persona dictionaries
+        max_concurrency: Maximum bulk calls in flight at once
+        requests_per_minute: Bulk calls allowed per minute (defaults to the shared
+            per-host limit for the PDL API)
+        
+    Returns:
+        List of personas in input order (enriched where PDL found a match, otherwise
+        the original persona)
+    """
+    results = list(personas)
+    if not PDL_API_KEY:
+        print("People Data Labs API key not set. Skipping PDL enrichment.")
+        return results
+    
+    # Group personas by cache key (personas with too little data are left unchanged)
+    personas_by_key: Dict[str, List[int]] = {}
+    payload_by_key: Dict[str, Dict[str, Any]] = {}
+    for i, persona in enumerate(personas):
+        params = create_pdl_params(persona) if isinstance(persona, dict) else {}
+        if params:
+            key = pdl_cache_key(params)
+            personas_by_key.setdefault(key, []).append(i)
+            payload_by_key.setdefault(key, params)
+    
+    def apply(key, pdl_data):
+        if pdl_data.get("status") == 200:
+            for i in personas_by_key[key]:
+                results[i] = enhance_persona_with_pdl_data(personas[i], pdl_data)
+    
+    # Serve cached results; only unique uncached payloads are sent
+    keys = []
+    payloads = []
+    cache = get_pdl_cache()
+    for key, params in payload_by_key.items():
+        pdl_data = cache.get(key)
+        if pdl_data is not None:
+            apply(key, pdl_data)
+        else:
+            keys.append(key)
+            payloads.append(params)
+    if not payloads:
+        return results
+    
+    if requests_per_minute:
+        bucket = TokenBucket(requests_per_minute, max_concurrency)
+    else:
+        bucket = get_rate_limiter().bucket(PDL_BULK_API_URL)
+    
+    chunks = [
+        (keys[start:start + PDL_BULK_CHUNK_SIZE], payloads[start:start + PDL_BULK_CHUNK_SIZE])
+        for start in range(0, len(payloads), PDL_BULK_CHUNK_SIZE)
+    ]
+    
+    def run_chunk(chunk_keys, chunk_payloads):
+        try:
+            responses = _post_pdl_bulk(chunk_payloads, bucket)
+        except Exception as e:
+            print(f"Error enriching with PDL bulk API: {e}")
+            return
+        for key, pdl_data in zip(chunk_keys, responses):
+            _cache_pdl_response(key, pdl_data)
+            apply(key, pdl_data)
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        for chunk_keys, chunk_payloads in chunks:
+            pool.submit(run_chunk, chunk_keys, chunk_payloads)
+    
+    return results
+
 def create_pdl_params(persona: Dict[str, Any]) -> Dict[str, Any]:
     """
     Create parameters for the PDL API request based on persona data.
@@ -7,11 +7,13 @@ from io import BytesIO
 import requests
 import base64
 
-from core.query_generator import generate_search_queries, search_linkedin_profiles
+from core.query_generator import generate_search_queries, search_linkedin_profiles, iter_linkedin_profiles
 from core.name_expansion import expand_name_from_initial
 from core.social_scraper import scrape_social_profiles, enrich_persona_with_social_data
 from core.image_similarity import compare_image_similarity_clip, validate_persona_match
 from core.profile_scoring import score_linkedin_candidate, rank_linkedin_candidates
+from core.score_cache import create_score_cache
+from core.streaming_ranker import StreamingRanker
 from api.gemini_api import generate_enriched_persona
 from api.people_api import enrich_persona_with_pdl
 
@@ -41,6 +43,11 @@ def get_image_base64(image_path):
             img_data = img_file.read()
     return base64.b64encode(img_data).decode()
 
+@st.cache_resource
+def get_score_cache():
+    # Shared on-disk cache so re-ranking a persona reuses paid Gemini/geocoding results
+    return create_score_cache("disk")
+
 # Title and description
 st.title("🔎 LinkedIn Profile Finder")
 st.write("Find LinkedIn profiles based on a persona with advanced AI-powered scoring")
@@ -344,9 +351,42 @@ with tabs[2]:
             else:
                 st.error("SERPAPI_API_KEY not set in .env file. Cannot search LinkedIn profiles.")
 
+        if "search_queries" in st.session_state and st.button("Search and Rank Live"):
+            if os.environ.get("SERPAPI_API_KEY"):
+                live_ranking = st.empty()
+
+                def show_ranking(ranking):
+                    with live_ranking.container():
+                        st.subheader("Live Ranking")
+                        for i, result in enumerate(ranking):
+                            st.write(f"{i+1}. {result['profile']['title']} (Confidence: {result['confidence']}%)")
+
+                ranker = StreamingRanker(
+                    search_persona,
+                    k=max_results,
+                    cache=get_score_cache(),
+                    on_change=show_ranking
+                )
+                results = []
+                try:
+                    with st.spinner("Searching and scoring LinkedIn profiles as they arrive..."):
+                        for candidate in iter_linkedin_profiles(search_persona, max_results=max_results):
+                            results.append(candidate)
+                            ranker.add(candidate)
+                except Exception as e:
+                    st.error(f"Error searching LinkedIn profiles: {e}")
+                st.session_state.search_results = results
+                st.session_state.scored_results = ranker.top_k()
+            else:
+                st.error("SERPAPI_API_KEY not set in .env file. Cannot search LinkedIn profiles.")
+
         if "search_results" in st.session_state and st.button("Score and Rank Profiles"):
             with st.spinner("Scoring and ranking LinkedIn profiles..."):
-                scored_results = rank_linkedin_candidates(search_persona, st.session_state.search_results)
+                scored_results = rank_linkedin_candidates(
+                    search_persona,
+                    st.session_state.search_results,
+                    cache=get_score_cache()
+                )
                 st.session_state.scored_results = scored_results
 
                 st.subheader("Ranked LinkedIn Profiles")
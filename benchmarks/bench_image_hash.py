@@ -0,0 +1,103 @@
+"""
+Image Hash Benchmark
+
+Compares the per-image cost of perceptual hashing with full-resolution decoding
+(the original get_image_hash path: decode, convert to RGB, pHash) against the
+reduced decoding path used for URLs (JPEG draft mode straight to small grayscale).
+Images are generated synthetically, so no network access is needed:
+
+    python benchmarks/bench_image_hash.py
+    python benchmarks/bench_image_hash.py --sizes 800 2000 4000 --runs 10
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from io import BytesIO
+
+import numpy as np
+import imagehash
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.image_similarity import hash_image_bytes, load_image_for_hashing
+
+
+def make_photo(size: int, seed: int = 0) -> bytes:
+    """
+    Generate a photo-like JPEG (smooth gradients, shapes and sensor noise).
+
+    Args:
+        size: Edge length in pixels
+        seed: Random seed
+
+    Returns:
+        bytes: JPEG-encoded image
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    base = np.stack([x * 200, y * 180, (1 - x) * 160], axis=-1)
+    noise = rng.normal(0, 12, (size, size, 3))
+    img = Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = rng.integers(0, size, 2)
+        r = int(rng.integers(size // 20, size // 5))
+        draw.ellipse([x0 - r, y0 - r, x0 + r, y0 + r], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def hash_full_decode(content: bytes) -> imagehash.ImageHash:
+    """The original path: full decode, RGB conversion, then pHash."""
+    img = Image.open(BytesIO(content))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return imagehash.phash(img)
+
+
+def decoded_bytes_full(content: bytes) -> int:
+    img = Image.open(BytesIO(content)).convert("RGB")
+    return img.size[0] * img.size[1] * 3
+
+
+def decoded_bytes_fast(content: bytes) -> int:
+    img = Image.open(BytesIO(content))
+    img.draft("L", (64, 64))
+    return img.size[0] * img.size[1] * len(img.getbands())
+
+
+def time_it(func, content: bytes, runs: int) -> float:
+    func(content)  # warm-up, excludes one-off import and allocation costs
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs reduced decoding for pHash")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[400, 1000, 2000, 4000],
+                        help="image edge lengths in pixels")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per image")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'jpeg KB':>8} {'full ms':>8} {'fast ms':>8} {'speedup':>8} "
+          f"{'full MB':>8} {'fast MB':>8} {'hash dist':>9}")
+    for size in args.sizes:
+        content = make_photo(size)
+        full_ms = time_it(hash_full_decode, content, args.runs)
+        fast_ms = time_it(hash_image_bytes, content, args.runs)
+        distance = hash_full_decode(content) - hash_image_bytes(content)
+        print(f"{size:>6} {len(content) / 1024:>8.0f} {full_ms:>8.1f} {fast_ms:>8.1f} "
+              f"{full_ms / fast_ms:>7.1f}x {decoded_bytes_full(content) / 2**20:>8.2f} "
+              f"{decoded_bytes_fast(content) / 2**20:>8.2f} {distance:>9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Image Similarity Benchmark
+
+Measures throughput and accuracy of the image-similarity methods in
+core.image_similarity on a synthetic avatar corpus, without network access.
+Each identity is an original avatar plus variants produced the way profile photos
+get altered in the wild: crops, rescales, JPEG re-encodes, color shifts and a
+combination of all of them.
+
+For every method the harness reports decode, signature and compare time per
+image, memory (peak traced Python/NumPy allocations while computing signatures,
+and bytes per stored signature), and accuracy: ROC AUC, plus true/false positive rates at the
+thresholds used by validate_persona_match (0.65 in main.py, 0.7 by default).
+The original avatar plays the persona image; its own variants are genuine
+matches and every other identity's variants are impostors.
+
+    python benchmarks/bench_image_similarity.py
+    python benchmarks/bench_image_similarity.py --identities 100 --json similarity.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from io import BytesIO
+from typing import Callable, Dict, List
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.hash_index import hash_to_int, popcount64
+from core.image_embedding import cosine_similarities, get_image_embedder
+from core.image_fingerprint import (
+    FINGERPRINT_DTYPE,
+    _decode as decode_for_fingerprint,
+    compute_fingerprint,
+    fingerprint_similarities,
+)
+from core.image_similarity import hash_image_bytes, load_image_for_hashing
+
+THRESHOLDS = [0.65, 0.7]
+TRANSFORMS = ["crop", "rescale", "jpeg", "color", "combined"]
+
+
+def encode_jpeg(img: Image.Image, quality: int = 90) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_avatar(seed: int, size: int = 400) -> Image.Image:
+    """
+    Generate a synthetic avatar: a gradient background, a head-and-shoulders
+    silhouette, a few random shapes and sensor noise.
+
+    Args:
+        seed: Random seed (one identity per seed)
+        size: Edge length in pixels
+
+    Returns:
+        PIL Image in RGB mode
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    angle = rng.uniform(0, 2 * np.pi)
+    ramp = (np.cos(angle) * x + np.sin(angle) * y)[..., None]
+    start, end = rng.uniform(0, 255, 3), rng.uniform(0, 255, 3)
+    base = start + (end - start) * (ramp - ramp.min()) / (np.ptp(ramp) + 1e-9)
+    img = Image.fromarray(np.clip(base, 0, 255).astype(np.uint8))
+
+    draw = ImageDraw.Draw(img)
+    for _ in range(int(rng.integers(3, 8))):
+        x0, y0 = rng.integers(0, size, 2)
+        r = int(rng.integers(size // 12, size // 4))
+        draw.rectangle([x0 - r, y0 - r, x0 + r, y0 + r], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+
+    cx = size // 2 + int(rng.integers(-size // 10, size // 10))
+    head = int(size * rng.uniform(0.14, 0.22))
+    shirt = tuple(int(c) for c in rng.integers(0, 255, 3))
+    skin = tuple(int(c) for c in rng.integers(90, 240, 3))
+    draw.ellipse([cx - 2 * head, size - head, cx + 2 * head, size + 2 * head], fill=shirt)
+    draw.ellipse([cx - head, size // 2 - head, cx + head, size // 2 + int(1.3 * head)], fill=skin)
+
+    noisy = np.asarray(img, dtype=np.float32) + rng.normal(0, 6, (size, size, 3))
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+
+def make_variant(img: Image.Image, transform: str, rng: np.random.Generator) -> bytes:
+    """
+    Apply one synthetic alteration to an avatar and JPEG-encode the result.
+
+    Args:
+        img: Original avatar
+        transform: One of TRANSFORMS
+        rng: Random generator
+
+    Returns:
+        bytes: JPEG-encoded variant
+    """
+    quality = 90
+    if transform in ("crop", "combined"):
+        keep = rng.uniform(0.75, 0.9)
+        side = int(img.size[0] * keep)
+        left, top = rng.integers(0, img.size[0] - side + 1, 2)
+        img = img.crop((int(left), int(top), int(left) + side, int(top) + side))
+    if transform in ("rescale", "combined"):
+        scale = rng.uniform(0.25, 0.5)
+        img = img.resize((max(32, int(img.size[0] * scale)), max(32, int(img.size[1] * scale))), Image.BILINEAR)
+    if transform in ("color", "combined"):
+        img = ImageEnhance.Color(img).enhance(rng.uniform(0.6, 1.4))
+        img = ImageEnhance.Brightness(img).enhance(rng.uniform(0.8, 1.2))
+        shift = rng.integers(-15, 16, 3)
+        img = Image.fromarray(np.clip(np.asarray(img, dtype=np.int16) + shift, 0, 255).astype(np.uint8))
+    if transform == "jpeg":
+        quality = int(rng.integers(20, 41))
+    elif transform == "combined":
+        quality = 50
+    return encode_jpeg(img, quality)
+
+
+def build_corpus(identities: int, size: int, seed: int = 0) -> Dict:
+    """
+    Build originals and variants for a number of identities.
+
+    Returns:
+        Dict with "originals" (list of bytes), "variants" (list of bytes) and
+        "variant_identity"/"variant_transform" aligned with variants
+    """
+    rng = np.random.default_rng(seed)
+    originals, variants, variant_identity, variant_transform = [], [], [], []
+    for identity in range(identities):
+        img = make_avatar(seed * 100003 + identity, size)
+        originals.append(encode_jpeg(img))
+        for transform in TRANSFORMS:
+            variants.append(make_variant(img, transform, rng))
+            variant_identity.append(identity)
+            variant_transform.append(transform)
+    return {
+        "originals": originals,
+        "variants": variants,
+        "variant_identity": np.array(variant_identity),
+        "variant_transform": np.array(variant_transform),
+    }
+
+
+def phash_scores(query: int, signatures: np.ndarray) -> np.ndarray:
+    distances = popcount64(np.bitwise_xor(signatures, np.uint64(query)))
+    return 1.0 - distances / 64.0
+
+
+def get_methods() -> Dict[str, Dict[str, Callable]]:
+    """
+    Describe each similarity method as decode/extract/stack/score callables.
+    The embedding method is included only when the ONNX backend is configured.
+    """
+    methods = {
+        "phash": {
+            "decode": load_image_for_hashing,
+            "extract": lambda contents: [hash_to_int(hash_image_bytes(c)) for c in contents],
+            "stack": lambda signatures: np.asarray(signatures, dtype=np.uint64),
+            "score": phash_scores,
+        },
+        "fingerprint": {
+            "decode": decode_for_fingerprint,
+            "extract": lambda contents: [compute_fingerprint(c) for c in contents],
+            "stack": lambda signatures: np.asarray(signatures, dtype=FINGERPRINT_DTYPE),
+            "score": fingerprint_similarities,
+        },
+    }
+    embedder = get_image_embedder()
+    if embedder is not None:
+        methods["embedding"] = {
+            "decode": embedder.preprocess,
+            "extract": lambda contents: list(embedder.embed_contents(contents)),
+            "stack": np.stack,
+            "score": cosine_similarities,
+        }
+    return methods
+
+
+def roc_auc(genuine: np.ndarray, impostor: np.ndarray) -> float:
+    """Area under the ROC curve: probability a genuine pair outscores an impostor pair."""
+    scores = np.concatenate([genuine, impostor])
+    order = scores.argsort(kind="mergesort")
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Average the ranks of tied scores
+    sorted_scores = scores[order]
+    _, first, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    for start, count in zip(first, counts):
+        if count > 1:
+            ranks[order[start:start + count]] = ranks[order[start:start + count]].mean()
+    genuine_ranks = ranks[:len(genuine)].sum()
+    return float((genuine_ranks - len(genuine) * (len(genuine) + 1) / 2) / (len(genuine) * len(impostor)))
+
+
+def roc_curve(genuine: np.ndarray, impostor: np.ndarray, steps: int = 101) -> List[Dict]:
+    return [
+        {"threshold": round(t, 2), "tpr": float((genuine >= t).mean()), "fpr": float((impostor >= t).mean())}
+        for t in np.linspace(0, 1, steps)
+    ]
+
+
+def per_image_ms(func: Callable, items: List) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) * 1000 / len(items)
+
+
+def run_method(method: Dict[str, Callable], corpus: Dict, thresholds: List[float]) -> Dict:
+    """
+    Benchmark one method on the corpus.
+
+    Returns:
+        Dict with timings, memory and accuracy figures
+    """
+    contents = corpus["originals"] + corpus["variants"]
+    method["extract"](contents[:2])  # warm-up, excludes one-off import and allocation costs
+
+    decode_ms = per_image_ms(method["decode"], contents)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    signatures = method["extract"](contents)
+    signature_ms = (time.perf_counter() - start) * 1000 / len(contents)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    originals = signatures[:len(corpus["originals"])]
+    variants = method["stack"](signatures[len(corpus["originals"]):])
+
+    identity = corpus["variant_identity"]
+    transform = corpus["variant_transform"]
+    genuine, impostor, genuine_transform = [], [], []
+    start = time.perf_counter()
+    for i, query in enumerate(originals):
+        scores = method["score"](query, variants)
+        genuine.append(scores[identity == i])
+        impostor.append(scores[identity != i])
+        genuine_transform.append(transform[identity == i])
+    compares = len(originals) * len(variants)
+    compare_us = (time.perf_counter() - start) * 1e6 / compares
+
+    genuine = np.concatenate(genuine)
+    impostor = np.concatenate(impostor)
+    genuine_transform = np.concatenate(genuine_transform)
+
+    at_threshold = {}
+    for t in thresholds:
+        tpr = float((genuine >= t).mean())
+        fpr = float((impostor >= t).mean())
+        at_threshold[str(t)] = {
+            "tpr": tpr,
+            "fpr": fpr,
+            "balanced_accuracy": (tpr + 1 - fpr) / 2,
+            "tpr_by_transform": {
+                name: float((genuine[genuine_transform == name] >= t).mean()) for name in TRANSFORMS
+            },
+        }
+
+    return {
+        "decode_ms": decode_ms,
+        "signature_ms": signature_ms,
+        "compare_us": compare_us,
+        "peak_mb": peak_bytes / 2**20,
+        "signature_bytes": variants[0].nbytes if hasattr(variants[0], "nbytes") else 8,
+        "auc": roc_auc(genuine, impostor),
+        "genuine_mean": float(genuine.mean()),
+        "impostor_mean": float(impostor.mean()),
+        "thresholds": at_threshold,
+        "roc": roc_curve(genuine, impostor),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image similarity throughput and accuracy")
+    parser.add_argument("--identities", type=int, default=50, help="number of synthetic identities")
+    parser.add_argument("--size", type=int, default=400, help="avatar edge length in pixels")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=THRESHOLDS,
+                        help="similarity thresholds to report")
+    parser.add_argument("--json", help="write full results (including ROC curves) to this file")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.identities, args.size, args.seed)
+    print(f"Corpus: {len(corpus['originals'])} originals, {len(corpus['variants'])} variants "
+          f"({', '.join(TRANSFORMS)}), {args.size}px")
+
+    results = {}
+    for name, method in get_methods().items():
+        results[name] = run_method(method, corpus, args.thresholds)
+
+    print(f"\n{'method':<12} {'decode ms':>9} {'sig ms':>7} {'cmp us':>7} {'peak MB':>8} "
+          f"{'sig B':>6} {'AUC':>6} {'genuine':>8} {'impostor':>9}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['decode_ms']:>9.2f} {r['signature_ms']:>7.2f} {r['compare_us']:>7.3f} "
+              f"{r['peak_mb']:>8.2f} {r['signature_bytes']:>6} {r['auc']:>6.3f} "
+              f"{r['genuine_mean']:>8.3f} {r['impostor_mean']:>9.3f}")
+
+    for t in args.thresholds:
+        print(f"\nAt threshold {t}:")
+        print(f"{'method':<12} {'TPR':>6} {'FPR':>6} {'bal acc':>8}  " + " ".join(f"{n:>8}" for n in TRANSFORMS))
+        for name, r in results.items():
+            m = r["thresholds"][str(t)]
+            by_transform = " ".join(f"{m['tpr_by_transform'][n]:>8.2f}" for n in TRANSFORMS)
+            print(f"{name:<12} {m['tpr']:>6.2f} {m['fpr']:>6.3f} {m['balanced_accuracy']:>8.3f}  {by_transform}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"identities": args.identities, "size": args.size, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
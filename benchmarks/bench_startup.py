@@ -0,0 +1,134 @@
+"""
+Startup Benchmark
+
+Measures the cold import time of each entry point in a fresh interpreter so that
+regressions in startup cost (eager clients, heavy imports, .env loading) show up
+as numbers. Run from the repository root:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --json startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules imported by the CLI, the Streamlit app and worker processes
+ENTRY_POINTS = [
+    "core.profile_scoring",
+    "core.social_scraper",
+    "core.image_similarity",
+    "core.query_generator",
+    "api.gemini_api",
+    "api.people_api",
+    "main",
+    # Streamlit entry point; importing it outside `streamlit run` executes the
+    # script in bare mode (widgets return their defaults)
+    "app",
+]
+
+
+def parse_importtime(stderr: str, top: int) -> List[Dict]:
+    """
+    Parse `python -X importtime` output into the slowest imports by cumulative time.
+
+    Args:
+        stderr: The interpreter's stderr containing importtime lines
+        top: Number of entries to return
+
+    Returns:
+        List of {"module", "cumulative_ms"} dicts, slowest first
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative_us, module = line.split("|")
+            entries.append({"module": module.strip(), "cumulative_ms": int(cumulative_us) / 1000})
+        except ValueError:
+            continue
+    entries.sort(key=lambda e: e["cumulative_ms"], reverse=True)
+    return entries[:top]
+
+
+def measure_import(module: str, runs: int, top: int) -> Dict:
+    """
+    Import a module in a fresh interpreter several times and record wall time.
+
+    Args:
+        module: Dotted module name to import
+        runs: Number of fresh interpreter runs
+        top: Number of slowest sub-imports to report
+
+    Returns:
+        Dict with median/min/max wall time and the slowest sub-imports
+    """
+    timings = []
+    slowest = []
+    error = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+            break
+        timings.append(elapsed_ms)
+        slowest = parse_importtime(proc.stderr, top)
+
+    if error:
+        return {"module": module, "error": error}
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(min(timings), 1),
+        "max_ms": round(max(timings), 1),
+        "slowest_imports": slowest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entry point import time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreter runs per module")
+    parser.add_argument("--top", type=int, default=5, help="slowest sub-imports to show")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="modules to benchmark")
+    args = parser.parse_args()
+
+    # Baseline: bare interpreter startup, subtracted mentally from the numbers below
+    results = [measure_import("sys", args.runs, 0)]
+    results[0]["module"] = "(interpreter)"
+    for module in args.modules:
+        results.append(measure_import(module, args.runs, args.top))
+
+    for result in results:
+        if "error" in result:
+            print(f"{result['module']:<24} ERROR: {result['error']}")
+            continue
+        print(f"{result['module']:<24} median {result['median_ms']:>8.1f} ms "
+              f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+        for entry in result.get("slowest_imports", []):
+            print(f"    {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Running Coroutines from Synchronous Code
+
+Blocking wrappers around async code (batched avatar lookups, concurrent persona
+enrichment) cannot call asyncio.run() when an event loop is already running in the
+calling thread, e.g. when they are reached from a notebook or from async code. This
+module runs the coroutine on a worker thread with its own loop in that case.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code and return its result.
+
+    Uses asyncio.run() when no event loop is running in this thread; otherwise runs
+    it on a new loop in a worker thread (with a copy of the caller's context) and
+    blocks until it finishes.
+
+    Args:
+        coroutine: The coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-sync") as executor:
+        return executor.submit(context.run, asyncio.run, coroutine).result()
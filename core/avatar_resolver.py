@@ -0,0 +1,262 @@
+"""
+LinkedIn Avatar Resolver
+
+This module resolves LinkedIn profile picture URLs through the Brightdata dataset API
+in batches. All candidate profile URLs are submitted in one snapshot (or a few, for
+very large batches) instead of one snapshot per candidate, and snapshots are polled
+asynchronously with exponential backoff and jitter rather than a fixed 5-second sleep
+that blocks a thread.
+
+Results are streamed back as each snapshot completes, and resolved avatar URLs
+(including "no picture" results) are cached per LinkedIn slug so each candidate pays
+the snapshot latency at most once.
+"""
+
+import os
+import random
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from core.async_utils import run_sync
+from core.cache import SQLiteCache
+from core.http_client import get_session
+from core.instrumentation import record_call, record_cache_hit
+
+BRIGHTDATA_BASE = "https://api.brightdata.com/datasets/v3"
+BRIGHTDATA_DATASET_ID = "gd_l1viktl72bvl7bjuj0"
+
+# Profiles submitted per snapshot
+BATCH_SIZE = 100
+
+# Polling schedule: exponential backoff with jitter, bounded by an overall timeout
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_TIMEOUT = 300.0
+
+# How long resolved and unresolved avatars are cached
+AVATAR_TTL = 7 * 24 * 60 * 60
+MISSING_AVATAR_TTL = 24 * 60 * 60
+
+# Keys that may hold the profile picture URL in a Brightdata record
+PROFILE_PICTURE_KEYS = ["profile_pic_url", "profilePicture", "profile_picture", "picture", "image"]
+
+_avatar_cache = None
+_avatar_cache_lock = threading.Lock()
+
+
+def _get_avatar_cache() -> SQLiteCache:
+    global _avatar_cache
+    if _avatar_cache is None:
+        with _avatar_cache_lock:
+            if _avatar_cache is None:
+                _avatar_cache = SQLiteCache(namespace="linkedin_avatars")
+    return _avatar_cache
+
+
+def linkedin_slug(linkedin_id: str) -> str:
+    """
+    Normalize a LinkedIn ID or profile URL to its slug.
+
+    Args:
+        linkedin_id: LinkedIn ID or profile URL
+
+    Returns:
+        str: Lower-cased profile slug, e.g. "johnsmith"
+    """
+    linkedin_id = linkedin_id.strip()
+    if linkedin_id.startswith("http") or "linkedin.com" in linkedin_id:
+        linkedin_id = linkedin_id.split("?")[0].strip("/").split("/")[-1]
+    return linkedin_id.lower()
+
+
+def extract_profile_picture(profile_data) -> Optional[str]:
+    """
+    Extract the profile picture URL from a Brightdata profile record.
+
+    Args:
+        profile_data: A record from a snapshot
+
+    Returns:
+        str or None if the record has no picture
+    """
+    if not isinstance(profile_data, dict):
+        return None
+    for key in PROFILE_PICTURE_KEYS:
+        if profile_data.get(key):
+            return profile_data[key]
+    return None
+
+
+def _record_slug(record: Dict) -> Optional[str]:
+    """Find which submitted profile a snapshot record belongs to."""
+    candidates = [record.get("input_url"), record.get("url"), record.get("id"), record.get("linkedin_id")]
+    if isinstance(record.get("input"), dict):
+        candidates.insert(0, record["input"].get("url"))
+    for value in candidates:
+        if isinstance(value, str) and value:
+            return linkedin_slug(value)
+    return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with equal jitter."""
+    delay = min(POLL_MAX_DELAY, POLL_INITIAL_DELAY * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def _run_blocking(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+
+
+async def _resolve_batch(slugs: List[str], api_key: str,
+                         timeout: float) -> Dict[str, Optional[str]]:
+    """Trigger one snapshot for a batch of slugs and poll it until ready."""
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    params = {
+        "dataset_id": BRIGHTDATA_DATASET_ID,
+        "include_errors": "true",
+    }
+
+    record_call("brightdata")
+    trigger = await _run_blocking(
+        session.post,
+        f"{BRIGHTDATA_BASE}/trigger",
+        headers=headers,
+        params=params,
+        json=[{"url": f"https://www.linkedin.com/in/{slug}"} for slug in slugs],
+        timeout=30,
+    )
+    trigger.raise_for_status()
+    snap_resp = trigger.json()
+    snapshot_id = snap_resp.get("snapshot_id")
+    if not snapshot_id:
+        raise RuntimeError(f"No snapshot_id in trigger response: {snap_resp}")
+
+    print(f"Triggered snapshot {snapshot_id} for {len(slugs)} profiles")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+    while True:
+        record_call("brightdata")
+        r = await _run_blocking(
+            session.get,
+            f"{BRIGHTDATA_BASE}/snapshot/{snapshot_id}",
+            headers=headers,
+            params={"format": "json"},
+            timeout=30,
+        )
+        if r.status_code == 202:
+            delay = _backoff_delay(attempt)
+            if loop.time() + delay > deadline:
+                raise TimeoutError(f"Timed out waiting for snapshot {snapshot_id}")
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+
+        if r.status_code == 404:
+            raise RuntimeError(f"Snapshot not found: {snapshot_id}")
+        r.raise_for_status()
+        break
+
+    data = r.json()
+    records = data if isinstance(data, list) else [data]
+
+    results: Dict[str, Optional[str]] = {slug: None for slug in slugs}
+    for index, record in enumerate(records):
+        slug = _record_slug(record) if isinstance(record, dict) else None
+        if slug not in results and len(records) == len(slugs):
+            # Fall back to submission order when records carry no usable URL
+            slug = slugs[index]
+        if slug in results and results[slug] is None:
+            results[slug] = extract_profile_picture(record)
+    return results
+
+
+async def stream_linkedin_avatars(linkedin_ids: Iterable[str], batch_size: int = BATCH_SIZE,
+                                  timeout: float = POLL_TIMEOUT) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    """
+    Resolve LinkedIn profile pictures in batches, yielding results as they become ready.
+
+    Cached slugs are yielded immediately; the rest are submitted in snapshots of up to
+    batch_size profiles that are polled concurrently.
+
+    Args:
+        linkedin_ids: LinkedIn IDs or profile URLs
+        batch_size: Maximum profiles per snapshot
+        timeout: Maximum time to wait for each snapshot, in seconds
+
+    Yields:
+        (slug, profile_picture_url) tuples; the URL is None if no picture was found
+    """
+    cache = _get_avatar_cache()
+    pending = []
+    for linkedin_id in linkedin_ids:
+        if not linkedin_id:
+            continue
+        slug = linkedin_slug(linkedin_id)
+        if slug in pending:
+            continue
+        cached = cache.get(slug)
+        if cached is not None:
+            record_cache_hit("linkedin_avatar")
+            yield slug, cached or None
+        else:
+            pending.append(slug)
+
+    if not pending:
+        return
+
+    api_key = os.environ.get("BRIGHTDATA_API_KEY")
+    if not api_key:
+        print("BRIGHTDATA_API_KEY not set in environment variables")
+        for slug in pending:
+            yield slug, None
+        return
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    tasks = {asyncio.ensure_future(_resolve_batch(batch, api_key, timeout)): batch for batch in batches}
+    try:
+        for finished in asyncio.as_completed(list(tasks)):
+            try:
+                results = await finished
+            except Exception as e:
+                print(f"Error resolving LinkedIn profile pictures: {e}")
+                continue
+            for slug, picture_url in results.items():
+                cache.set(slug, picture_url or "", ttl=AVATAR_TTL if picture_url else MISSING_AVATAR_TTL)
+                yield slug, picture_url
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def resolve_linkedin_avatars(linkedin_ids: Iterable[str], batch_size: int = BATCH_SIZE,
+                             timeout: float = POLL_TIMEOUT) -> Dict[str, Optional[str]]:
+    """
+    Resolve LinkedIn profile pictures for many profiles (blocking wrapper, safe to
+    call while an event loop is running; async callers can use stream_linkedin_avatars).
+
+    Args:
+        linkedin_ids: LinkedIn IDs or profile URLs
+        batch_size: Maximum profiles per snapshot
+        timeout: Maximum time to wait for each snapshot, in seconds
+
+    Returns:
+        Dict mapping each slug to its profile picture URL, or None if unavailable
+    """
+    slugs = [linkedin_slug(linkedin_id) for linkedin_id in linkedin_ids if linkedin_id]
+
+    async def collect():
+        results = {slug: None for slug in slugs}
+        async for slug, picture_url in stream_linkedin_avatars(slugs, batch_size, timeout):
+            results[slug] = picture_url
+        return results
+
+    return run_sync(collect())
@@ -0,0 +1,174 @@
+"""
+Bluesky Batch Resolver
+
+This module resolves Bluesky profiles through the public AppView endpoint
+app.bsky.actor.getProfiles, which accepts up to 25 actors per request and, unlike
+com.atproto.repo.getRecord, returns follower, following and post counts.
+
+Two caches keep repeated lookups off the network:
+- a DID cache mapping handles to their DIDs, so lookups keep working (and hit the
+  profile cache) after a user changes handle
+- a profile cache keyed by DID
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from core.cache import SQLiteCache
+
+BLUESKY_APPVIEW_URL = "https://public.api.bsky.app/xrpc"
+
+# Maximum actors per getProfiles request (API limit)
+MAX_ACTORS_PER_REQUEST = 25
+
+# Profiles change often; handle -> DID bindings rarely do
+PROFILE_TTL = 6 * 60 * 60
+DID_TTL = 7 * 24 * 60 * 60
+
+
+def normalize_identifier(identifier: str) -> str:
+    """Return the canonical form of a Bluesky handle or DID (no @, lower-cased handle)."""
+    identifier = identifier.strip().lstrip("@")
+    return identifier if identifier.startswith("did:") else identifier.lower()
+
+
+def bluesky_actor_to_profile(identifier: str, actor: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert an app.bsky.actor.defs#profileViewDetailed to the profile dictionary used
+    by social_scraper.
+
+    Args:
+        identifier: The requested handle or DID
+        actor: The API profile view, or None if the actor was not found
+
+    Returns:
+        Profile dictionary (empty values if actor is None)
+    """
+    actor = actor or {}
+    return {
+        "platform": "bluesky",
+        "username": identifier,
+        "display_name": actor.get("displayName"),
+        "bio": actor.get("description"),
+        "followers_count": actor.get("followersCount"),
+        "following_count": actor.get("followsCount"),
+        "post_count": actor.get("postsCount"),
+        "profile_image": actor.get("avatar"),
+        "url": f"https://bsky.app/profile/{identifier}",
+    }
+
+
+class BlueskyResolver:
+    """
+    Cached, batched Bluesky profile resolver.
+
+    Args:
+        get: Function that performs a rate-limited GET for a full URL and returns a response
+        profile_cache: Cache for profile views keyed by DID (defaults to the SQLite cache)
+        did_cache: Cache for handle -> DID bindings (defaults to the SQLite cache)
+    """
+
+    def __init__(self, get: Callable, profile_cache=None, did_cache=None):
+        self.get = get
+        self.profile_cache = profile_cache if profile_cache is not None else SQLiteCache(namespace="bluesky_profiles")
+        self.did_cache = did_cache if did_cache is not None else SQLiteCache(namespace="bluesky_dids")
+
+    def cached_did(self, identifier: str) -> Optional[str]:
+        """Return the DID for a handle (or the DID itself) if it is known."""
+        identifier = normalize_identifier(identifier)
+        if identifier.startswith("did:"):
+            return identifier
+        return self.did_cache.get(identifier)
+
+    def resolve_did(self, handle: str) -> Optional[str]:
+        """
+        Resolve a handle to its DID, using the cache or com.atproto.identity.resolveHandle.
+
+        Returns:
+            The DID, or None if the handle could not be resolved
+        """
+        did = self.cached_did(handle)
+        if did:
+            return did
+        handle = normalize_identifier(handle)
+        try:
+            response = self.get(f"{BLUESKY_APPVIEW_URL}/com.atproto.identity.resolveHandle?{urlencode({'handle': handle})}")
+            if response.status_code != 200:
+                return None
+            did = response.json().get("did")
+        except Exception as e:
+            print(f"Error resolving Bluesky handle {handle}: {e}")
+            return None
+        if did:
+            self.did_cache.set(handle, did, ttl=DID_TTL)
+        return did
+
+    def _remember(self, actor: Dict[str, Any]) -> None:
+        did = actor.get("did")
+        if not did:
+            return
+        self.profile_cache.set(did, actor, ttl=PROFILE_TTL)
+        handle = actor.get("handle")
+        if handle and handle != "handle.invalid":
+            self.did_cache.set(handle.lower(), did, ttl=DID_TTL)
+
+    def fetch_profiles(self, actors: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch profile views with one getProfiles request.
+
+        Args:
+            actors: Up to 25 handles or DIDs
+
+        Returns:
+            Dict mapping each DID and lower-cased handle returned by the API to its
+            profile view (actors that do not exist are absent)
+
+        Raises:
+            requests.HTTPError: If the request fails
+        """
+        query = urlencode([("actors", actor) for actor in actors])
+        response = self.get(f"{BLUESKY_APPVIEW_URL}/app.bsky.actor.getProfiles?{query}")
+        response.raise_for_status()
+        views: Dict[str, Dict[str, Any]] = {}
+        for actor in response.json().get("profiles", []):
+            self._remember(actor)
+            views[actor.get("did")] = actor
+            if actor.get("handle"):
+                views[actor["handle"].lower()] = actor
+        return views
+
+    def resolve_many(self, identifiers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve profiles from the cache and batched getProfiles requests.
+
+        Args:
+            identifiers: Handles or DIDs (with or without @)
+
+        Returns:
+            Dict mapping each identifier to its profile (empty if the actor does not
+            exist); identifiers in failed requests are omitted
+        """
+        profiles = {}
+        # Canonical actor (DID if known, otherwise handle) -> requested identifiers
+        pending: Dict[str, List[str]] = {}
+        for identifier in identifiers:
+            canonical = normalize_identifier(identifier)
+            did = self.cached_did(canonical)
+            view = self.profile_cache.get(did) if did else None
+            if view is not None:
+                profiles[identifier] = bluesky_actor_to_profile(identifier, view)
+            else:
+                pending.setdefault(did or canonical, []).append(identifier)
+
+        actors = list(pending)
+        for start in range(0, len(actors), MAX_ACTORS_PER_REQUEST):
+            chunk = actors[start:start + MAX_ACTORS_PER_REQUEST]
+            try:
+                views = self.fetch_profiles(chunk)
+            except Exception as e:
+                print(f"Bluesky getProfiles request failed: {e}")
+                continue
+            for actor in chunk:
+                for identifier in pending[actor]:
+                    profiles[identifier] = bluesky_actor_to_profile(identifier, views.get(actor))
+        return profiles
@@ -0,0 +1,195 @@
+"""
+Shared Gemini Client
+
+This module is the single entry point for Gemini calls from persona enrichment
+(api/gemini_api) and semantic scoring (core/profile_scoring):
+- one GenerativeModel per (model name, generation config, safety settings), created
+  on first use and shared by every caller
+- a concurrency limit (GEMINI_MAX_CONCURRENCY in .env, default 8) across all
+  threads calling generate_content, and per event loop for generate_content_async
+- retries with exponential backoff and jitter on rate limiting (429) and server
+  errors (5xx)
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Calls in flight at once, per process
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Retry policy for 429 and 5xx responses
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_configured = False
+_models: Dict[str, Any] = {}
+_thread_semaphore = None
+# One asyncio semaphore per event loop (asyncio primitives are bound to their loop)
+_loop_semaphores = weakref.WeakKeyDictionary()
+
+
+def max_concurrency() -> int:
+    """Return the configured maximum number of concurrent Gemini calls."""
+    try:
+        return max(1, int(os.environ.get("GEMINI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENCY
+
+
+def _configure() -> bool:
+    """Configure the Gemini SDK with GEMINI_API_KEY once; return False if no key is set."""
+    global _configured
+    if _configured:
+        return True
+    from dotenv import load_dotenv
+    import google.generativeai as genai
+
+    load_dotenv()
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return False
+    genai.configure(api_key=api_key)
+    _configured = True
+    return True
+
+
+def get_model(model_name: str = DEFAULT_MODEL, generation_config: Optional[Dict] = None,
+              safety_settings: Optional[list] = None):
+    """
+    Return the shared GenerativeModel for a configuration, creating it on first use.
+
+    Args:
+        model_name: Gemini model name
+        generation_config: Generation config dictionary
+        safety_settings: Safety settings list
+
+    Returns:
+        The GenerativeModel, or None if Gemini could not be initialized
+    """
+    key = json.dumps([model_name, generation_config, safety_settings], sort_keys=True, default=str)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            try:
+                if not _configure():
+                    return None
+                import google.generativeai as genai
+                model = genai.GenerativeModel(
+                    model_name=model_name,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                )
+            except Exception as e:
+                logging.warning(f"Could not initialize Gemini API: {e}")
+                return None
+            _models[key] = model
+    return model
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for rate limiting (429) and server (5xx) errors."""
+    # google.api_core exceptions carry the HTTP status as an int code
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+def _backoff_delay(attempt: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _get_thread_semaphore() -> threading.BoundedSemaphore:
+    global _thread_semaphore
+    if _thread_semaphore is None:
+        with _lock:
+            if _thread_semaphore is None:
+                _thread_semaphore = threading.BoundedSemaphore(max_concurrency())
+    return _thread_semaphore
+
+
+def _get_loop_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        semaphore = _loop_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max_concurrency())
+            _loop_semaphores[loop] = semaphore
+    return semaphore
+
+
+def generate_content(prompt, model_name: str = DEFAULT_MODEL, generation_config: Optional[Dict] = None,
+                     safety_settings: Optional[list] = None, **kwargs):
+    """
+    Generate content with the shared model, under the concurrency limit and with
+    retries on 429/5xx.
+
+    Args:
+        prompt: Prompt (or contents) passed to generate_content
+        model_name: Gemini model name
+        generation_config: Generation config dictionary
+        safety_settings: Safety settings list
+        **kwargs: Passed to GenerativeModel.generate_content
+
+    Returns:
+        The Gemini response
+
+    Raises:
+        RuntimeError: If Gemini is not configured
+        Exception: The last error once retries are exhausted, or any non-retryable error
+    """
+    model = get_model(model_name, generation_config, safety_settings)
+    if model is None:
+        raise RuntimeError("Gemini API is not configured")
+    semaphore = _get_thread_semaphore()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with semaphore:
+                return model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = _backoff_delay(attempt)
+            logging.warning(f"Gemini call failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def generate_content_async(prompt, model_name: str = DEFAULT_MODEL,
+                                 generation_config: Optional[Dict] = None,
+                                 safety_settings: Optional[list] = None, **kwargs):
+    """
+    Async version of generate_content, using GenerativeModel.generate_content_async.
+    The concurrency limit applies per event loop.
+
+    Returns:
+        The Gemini response
+    """
+    model = get_model(model_name, generation_config, safety_settings)
+    if model is None:
+        raise RuntimeError("Gemini API is not configured")
+    semaphore = _get_loop_semaphore()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with semaphore:
+                return await model.generate_content_async(prompt, **kwargs)
+        except Exception as e:
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = _backoff_delay(attempt)
+            logging.warning(f"Gemini call failed ({e}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,229 @@
+"""
+GitHub Profile Resolver
+
+This module resolves GitHub profiles while spending as little of the API quota as
+possible:
+- A persistent per-user cache (SQLite) serves recently fetched profiles without
+  any request.
+- With a token, uncached users are fetched dozens at a time with one GraphQL query
+  (aliased user() lookups) instead of one REST call each.
+- Without a token, REST calls send the stored ETag as If-None-Match; 304 Not
+  Modified responses do not count against the rate limit.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.cache import SQLiteCache
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Users per GraphQL query
+GRAPHQL_BATCH_SIZE = 50
+
+# Cached profiles younger than this are served without a request; older ones are
+# revalidated (conditional REST) or refetched (GraphQL)
+FRESH_SECONDS = 6 * 60 * 60
+
+# How long ETags and profiles are kept for revalidation
+CACHE_TTL = 30 * 24 * 60 * 60
+
+GRAPHQL_USER_FIELDS = """
+    login name bio location company websiteUrl avatarUrl
+    followers { totalCount }
+    following { totalCount }
+    repositories(privacy: PUBLIC) { totalCount }
+"""
+
+
+def empty_github_profile(username: str) -> Dict[str, Any]:
+    """Return a GitHub profile dictionary with no data."""
+    return {
+        "platform": "github",
+        "username": username,
+        "display_name": None,
+        "bio": None,
+        "location": None,
+        "followers_count": None,
+        "following_count": None,
+        "repo_count": None,
+        "profile_image": None,
+        "url": f"https://github.com/{username}",
+        "company": None,
+        "blog": None
+    }
+
+
+def rest_user_to_profile(username: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST /users/{username} response to a profile dictionary."""
+    profile = empty_github_profile(username)
+    profile.update({
+        "display_name": data.get("name"),
+        "bio": data.get("bio"),
+        "location": data.get("location"),
+        "followers_count": data.get("followers"),
+        "following_count": data.get("following"),
+        "repo_count": data.get("public_repos"),
+        "profile_image": data.get("avatar_url"),
+        "company": data.get("company"),
+        "blog": data.get("blog"),
+    })
+    return profile
+
+
+def graphql_user_to_profile(username: str, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert a GraphQL User object (or None if not found) to a profile dictionary."""
+    profile = empty_github_profile(username)
+    if not data:
+        return profile
+    profile.update({
+        "display_name": data.get("name"),
+        "bio": data.get("bio"),
+        "location": data.get("location"),
+        "followers_count": (data.get("followers") or {}).get("totalCount"),
+        "following_count": (data.get("following") or {}).get("totalCount"),
+        "repo_count": (data.get("repositories") or {}).get("totalCount"),
+        "profile_image": data.get("avatarUrl"),
+        "company": data.get("company"),
+        "blog": data.get("websiteUrl"),
+    })
+    return profile
+
+
+def build_graphql_query(usernames: List[str]) -> str:
+    """Build one query that looks up each username under an alias (u0, u1, ...)."""
+    lookups = "\n".join(
+        f"u{i}: user(login: {json.dumps(username)}) {{ {GRAPHQL_USER_FIELDS} }}"
+        for i, username in enumerate(usernames)
+    )
+    return f"query {{\n{lookups}\n}}"
+
+
+class GitHubResolver:
+    """
+    Cached GitHub profile resolver.
+
+    Args:
+        request: Function (method, url, headers, **kwargs) -> response that performs
+            rate-limited HTTP requests
+        cache: Persistent cache (defaults to the SQLite cache)
+        fresh_seconds: Age up to which cached profiles are served without a request
+    """
+
+    def __init__(self, request: Callable, cache=None, fresh_seconds: float = FRESH_SECONDS):
+        self.request = request
+        self.cache = cache if cache is not None else SQLiteCache(namespace="github_users")
+        self.fresh_seconds = fresh_seconds
+
+    def _key(self, username: str) -> str:
+        return username.lower()
+
+    def cached(self, username: str, fresh_only: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a user ({"profile", "etag", "fetched_at"})."""
+        entry = self.cache.get(self._key(username))
+        if entry is None:
+            return None
+        if fresh_only and time.time() - entry["fetched_at"] > self.fresh_seconds:
+            return None
+        return entry
+
+    def _store(self, username: str, profile: Dict[str, Any], etag: Optional[str] = None) -> None:
+        self.cache.set(
+            self._key(username),
+            {"profile": profile, "etag": etag, "fetched_at": time.time()},
+            ttl=CACHE_TTL,
+        )
+
+    def fetch_graphql(self, usernames: List[str], token: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch users with batched GraphQL queries.
+
+        Args:
+            usernames: GitHub logins
+            token: GitHub token (GraphQL requires authentication)
+
+        Returns:
+            Dict mapping each resolved username to its profile (users that do not
+            exist get an empty profile; users in failed queries are omitted)
+        """
+        headers = {"Authorization": f"bearer {token}"}
+        profiles = {}
+        for start in range(0, len(usernames), GRAPHQL_BATCH_SIZE):
+            chunk = usernames[start:start + GRAPHQL_BATCH_SIZE]
+            try:
+                response = self.request("POST", GITHUB_GRAPHQL_URL, headers,
+                                        json={"query": build_graphql_query(chunk)})
+                response.raise_for_status()
+                data = response.json().get("data")
+            except Exception as e:
+                print(f"GitHub GraphQL query failed: {e}")
+                continue
+            if not data:
+                continue
+            for i, username in enumerate(chunk):
+                profile = graphql_user_to_profile(username, data.get(f"u{i}"))
+                self._store(username, profile)
+                profiles[username] = profile
+        return profiles
+
+    def fetch_rest(self, username: str, token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one user from the REST API, revalidating a cached copy with If-None-Match.
+
+        Args:
+            username: GitHub login
+            token: Optional GitHub token for higher rate limits
+
+        Returns:
+            The profile (empty if the user does not exist), or None if the request failed
+        """
+        headers = {}
+        if token:
+            headers["Authorization"] = f"token {token}"
+        entry = self.cached(username, fresh_only=False)
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        response = self.request("GET", f"{GITHUB_API_URL}/users/{username}", headers)
+        if response.status_code == 304 and entry:
+            self._store(username, entry["profile"], entry["etag"])
+            return entry["profile"]
+        if response.status_code == 404:
+            profile = empty_github_profile(username)
+            self._store(username, profile)
+            return profile
+        if response.status_code != 200:
+            print(f"GitHub API returned status code {response.status_code}")
+            return None
+
+        profile = rest_user_to_profile(username, response.json())
+        self._store(username, profile, response.headers.get("ETag"))
+        return profile
+
+    def resolve_many(self, usernames: Iterable[str], token: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve users from the cache and, with a token, from batched GraphQL queries.
+
+        Users that could not be resolved this way are omitted; callers fetch them
+        individually with fetch_rest.
+
+        Args:
+            usernames: GitHub logins
+            token: Optional GitHub token
+
+        Returns:
+            Dict mapping each resolved username to its profile
+        """
+        profiles = {}
+        missing = []
+        for username in usernames:
+            entry = self.cached(username)
+            if entry is not None:
+                profiles[username] = entry["profile"]
+            else:
+                missing.append(username)
+        if missing and token:
+            profiles.update(self.fetch_graphql(missing, token))
+        return profiles
@@ -0,0 +1,305 @@
+"""
+Perceptual Hash Index
+
+This module indexes 64-bit perceptual hashes (pHash) so a persona photo can be checked
+against a large corpus of collected avatars without comparing it to every image.
+
+Hashes are stored as a uint64 array and indexed with multi-index hashing: each hash is
+split into four 16-bit chunks and every chunk gets a sorted lookup table. Two hashes
+within Hamming distance d must agree to within floor(d / 4) bits on at least one chunk,
+so a range query only probes a few table entries per chunk and verifies the candidates
+exactly. Large radii and top-k queries fall back to a vectorized popcount scan.
+
+Indexes are saved as .npy files and loaded memory-mapped.
+"""
+
+import os
+import json
+from itertools import combinations
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import imagehash
+
+# Hash layout: 64 bits split into 4 chunks of 16 bits
+HASH_BITS = 64
+NUM_CHUNKS = 4
+CHUNK_BITS = HASH_BITS // NUM_CHUNKS
+
+# Largest per-chunk radius probed through the tables (C(16, 2) = 120 probes per chunk);
+# queries needing more fall back to a linear scan
+MAX_PROBE_RADIUS = 2
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+HashLike = Union[int, np.integer, imagehash.ImageHash]
+
+
+def hash_to_int(image_hash: imagehash.ImageHash) -> int:
+    """
+    Convert a 64-bit imagehash.ImageHash into an unsigned integer.
+
+    Args:
+        image_hash: Hash produced by imagehash.phash (hash_size=8)
+
+    Returns:
+        int: The hash bits as an unsigned 64-bit integer
+    """
+    bits = np.asarray(image_hash.hash, dtype=bool).flatten()
+    if bits.size != HASH_BITS:
+        raise ValueError(f"Expected a {HASH_BITS}-bit hash, got {bits.size} bits")
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def int_to_hash(value: int) -> imagehash.ImageHash:
+    """
+    Convert an unsigned 64-bit integer back into an imagehash.ImageHash.
+
+    Args:
+        value: Hash bits as produced by hash_to_int
+
+    Returns:
+        imagehash.ImageHash: The equivalent 8x8 hash
+    """
+    raw = np.frombuffer(int(value).to_bytes(8, "big"), dtype=np.uint8)
+    return imagehash.ImageHash(np.unpackbits(raw).astype(bool).reshape(8, 8))
+
+
+def _to_uint64(image_hash: HashLike) -> np.uint64:
+    if isinstance(image_hash, imagehash.ImageHash):
+        return np.uint64(hash_to_int(image_hash))
+    return np.uint64(int(image_hash))
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """
+    Count set bits of each element of a uint64 array.
+
+    Args:
+        values: Array of uint64 values
+
+    Returns:
+        np.ndarray: Bit counts as uint8
+    """
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.uint8)
+    as_bytes = values.view(np.uint8).reshape(-1, 8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.uint8)
+
+
+def hamming_distances(hashes: np.ndarray, query: HashLike) -> np.ndarray:
+    """
+    Compute the Hamming distance between a query hash and every hash in an array.
+
+    Args:
+        hashes: Array of uint64 hashes
+        query: Query hash (int or imagehash.ImageHash)
+
+    Returns:
+        np.ndarray: Distances as uint8, aligned with hashes
+    """
+    return popcount64(np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), _to_uint64(query)))
+
+
+def _chunk_values(hashes: np.ndarray, chunk: int) -> np.ndarray:
+    shift = np.uint64(chunk * CHUNK_BITS)
+    return ((hashes >> shift) & np.uint64(0xFFFF)).astype(np.uint16)
+
+
+def _neighbors16(value: int, radius: int) -> np.ndarray:
+    """All 16-bit values within the given Hamming radius of value."""
+    probes = [value]
+    for r in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), r):
+            flipped = value
+            for bit in bits:
+                flipped ^= 1 << bit
+            probes.append(flipped)
+    return np.array(sorted(probes), dtype=np.uint16)
+
+
+class PHashIndex:
+    """
+    Multi-index hash table over 64-bit perceptual hashes.
+
+    Keys are arbitrary strings (e.g. image URLs or content digests) returned with
+    query results.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._keys: List[str] = []
+        self._sorted_chunks: Optional[np.ndarray] = None  # (NUM_CHUNKS, N) uint16
+        self._chunk_order: Optional[np.ndarray] = None    # (NUM_CHUNKS, N) positions
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def hashes(self) -> np.ndarray:
+        return self._hashes
+
+    @property
+    def keys(self) -> List[str]:
+        return self._keys
+
+    def add(self, key: str, image_hash: HashLike) -> None:
+        """
+        Insert a single hash. Prefer add_many for bulk loads.
+
+        Args:
+            key: Identifier returned by queries
+            image_hash: Hash to insert
+        """
+        self.add_many([key], [image_hash])
+
+    def add_many(self, keys: Sequence[str], image_hashes: Iterable[HashLike]) -> None:
+        """
+        Bulk-insert hashes. Lookup tables are rebuilt lazily on the next query.
+
+        Args:
+            keys: Identifiers returned by queries
+            image_hashes: Hashes aligned with keys (ints, uint64 array or ImageHash objects)
+        """
+        if isinstance(image_hashes, np.ndarray):
+            new_hashes = image_hashes.astype(np.uint64, copy=False)
+        else:
+            new_hashes = np.array([_to_uint64(h) for h in image_hashes], dtype=np.uint64)
+        if len(keys) != len(new_hashes):
+            raise ValueError("keys and image_hashes must have the same length")
+
+        self._hashes = np.concatenate([np.asarray(self._hashes), new_hashes])
+        self._keys.extend(keys)
+        self._sorted_chunks = None
+        self._chunk_order = None
+
+    def _build_tables(self) -> None:
+        n = len(self._hashes)
+        sorted_chunks = np.empty((NUM_CHUNKS, n), dtype=np.uint16)
+        chunk_order = np.empty((NUM_CHUNKS, n), dtype=np.int64)
+        for chunk in range(NUM_CHUNKS):
+            values = _chunk_values(self._hashes, chunk)
+            order = np.argsort(values, kind="stable")
+            chunk_order[chunk] = order
+            sorted_chunks[chunk] = values[order]
+        self._sorted_chunks = sorted_chunks
+        self._chunk_order = chunk_order
+
+    def _candidates(self, query: np.uint64, chunk_radius: int) -> np.ndarray:
+        if self._sorted_chunks is None:
+            self._build_tables()
+
+        positions = []
+        for chunk in range(NUM_CHUNKS):
+            probe = _neighbors16(int(_chunk_values(np.array([query]), chunk)[0]), chunk_radius)
+            table = self._sorted_chunks[chunk]
+            lo = np.searchsorted(table, probe, side="left")
+            hi = np.searchsorted(table, probe, side="right")
+            order = self._chunk_order[chunk]
+            for start, end in zip(lo, hi):
+                if end > start:
+                    positions.append(order[start:end])
+        if not positions:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(positions))
+
+    def range_query(self, image_hash: HashLike, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Find all indexed hashes within a Hamming distance of the query.
+
+        Args:
+            image_hash: Query hash
+            max_distance: Maximum Hamming distance (inclusive)
+
+        Returns:
+            List of (key, distance) tuples, closest first
+        """
+        if len(self) == 0:
+            return []
+
+        query = _to_uint64(image_hash)
+        chunk_radius = max_distance // NUM_CHUNKS
+        if chunk_radius <= MAX_PROBE_RADIUS:
+            positions = self._candidates(query, chunk_radius)
+        else:
+            positions = np.arange(len(self._hashes))
+
+        distances = hamming_distances(self._hashes[positions], query)
+        mask = distances <= max_distance
+        positions, distances = positions[mask], distances[mask]
+        order = np.lexsort((positions, distances))
+        return [(self._keys[positions[i]], int(distances[i])) for i in order]
+
+    def nearest(self, image_hash: HashLike, k: int = 5,
+                max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Find the k closest indexed hashes to the query.
+
+        Args:
+            image_hash: Query hash
+            k: Number of results
+            max_distance: Optional cut-off on the Hamming distance
+
+        Returns:
+            List of (key, distance) tuples, closest first
+        """
+        if len(self) == 0 or k < 1:
+            return []
+
+        # Grow the radius through the multi-index tables while that stays cheap
+        limit = HASH_BITS if max_distance is None else max_distance
+        probe_limit = min(limit, (MAX_PROBE_RADIUS + 1) * NUM_CHUNKS - 1)
+        for radius in range(NUM_CHUNKS - 1, probe_limit + 1, NUM_CHUNKS):
+            matches = self.range_query(image_hash, radius)
+            if len(matches) >= k:
+                return matches[:k]
+        if probe_limit == limit:
+            return self.range_query(image_hash, limit)[:k]
+
+        distances = hamming_distances(self._hashes, image_hash)
+        k = min(k, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.lexsort((top, distances[top]))]
+        return [
+            (self._keys[i], int(distances[i]))
+            for i in top
+            if distances[i] <= limit
+        ]
+
+    def save(self, directory: str) -> None:
+        """
+        Persist the index to a directory (hashes, lookup tables and keys).
+
+        Args:
+            directory: Target directory, created if missing
+        """
+        os.makedirs(directory, exist_ok=True)
+        if self._sorted_chunks is None:
+            self._build_tables()
+        np.save(os.path.join(directory, "hashes.npy"), np.asarray(self._hashes))
+        np.save(os.path.join(directory, "sorted_chunks.npy"), self._sorted_chunks)
+        np.save(os.path.join(directory, "chunk_order.npy"), self._chunk_order)
+        with open(os.path.join(directory, "keys.json"), "w") as f:
+            json.dump(self._keys, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "PHashIndex":
+        """
+        Load an index saved with save().
+
+        Args:
+            directory: Directory containing the index files
+            mmap: Memory-map the arrays instead of reading them into RAM
+
+        Returns:
+            PHashIndex: The loaded index
+        """
+        mmap_mode = "r" if mmap else None
+        index = cls()
+        index._hashes = np.load(os.path.join(directory, "hashes.npy"), mmap_mode=mmap_mode)
+        index._sorted_chunks = np.load(os.path.join(directory, "sorted_chunks.npy"), mmap_mode=mmap_mode)
+        index._chunk_order = np.load(os.path.join(directory, "chunk_order.npy"), mmap_mode=mmap_mode)
+        with open(os.path.join(directory, "keys.json")) as f:
+            index._keys = json.load(f)
+        return index
@@ -0,0 +1,152 @@
+"""
+Streaming HTML Field Extraction
+
+The HTML fallbacks of the social scrapers only need a few fields (title, meta
+description, profile header), all of which appear near the top of the page. This
+module reads a streamed response chunk by chunk, matches the field patterns
+incrementally, and stops as soon as every field has been found or a byte cap is
+reached, so the rest of the page is neither downloaded nor scanned.
+
+Fields can be marked as required. Once the required ones have matched, optional
+fields get at most OPTIONAL_FIELD_BYTES more, so a page that simply lacks an
+optional field (e.g. a profile without a location) is not read up to the cap.
+"""
+
+import re
+import codecs
+from typing import Dict, Iterable, Optional, Pattern, Union
+
+# Maximum bytes read from one page
+HTML_MAX_BYTES = 512 * 1024
+
+# Bytes per read from the network
+CHUNK_SIZE = 16 * 1024
+
+# Characters of already-scanned text rescanned with each chunk, so fields that span
+# a chunk boundary are still found. A match longer than this that spans a boundary is
+# only found by the final full-text pass (HTMLFieldMatcher.finish), so field patterns
+# should match well under MATCH_OVERLAP characters.
+MATCH_OVERLAP = 8 * 1024
+
+# Bytes read for optional fields after every required field has matched
+OPTIONAL_FIELD_BYTES = 64 * 1024
+
+
+class HTMLFieldMatcher:
+    """
+    Incrementally matches named regex patterns against text fed in chunks.
+
+    Each chunk is searched together with the last MATCH_OVERLAP characters already
+    scanned; call finish() once no more text will be fed to search the whole text for
+    fields that are still missing.
+
+    Args:
+        patterns: Field name -> regex (string or compiled pattern); group 1 is the value
+        required: Names of the fields that must be found (defaults to all of them)
+    """
+
+    def __init__(self, patterns: Dict[str, Union[str, Pattern]], required: Optional[Iterable[str]] = None):
+        self.patterns = {
+            name: re.compile(pattern) if isinstance(pattern, str) else pattern
+            for name, pattern in patterns.items()
+        }
+        self.required = set(required) if required is not None else set(self.patterns)
+        self.matches: Dict[str, re.Match] = {}
+        self.text = ""
+        self._scanned = 0
+
+    @property
+    def done(self) -> bool:
+        """True once every pattern has matched."""
+        return len(self.matches) == len(self.patterns)
+
+    @property
+    def required_done(self) -> bool:
+        """True once every required pattern has matched."""
+        return self.required.issubset(self.matches)
+
+    def feed(self, text: str) -> None:
+        """Append text and look for the fields that have not matched yet."""
+        self.text += text
+        start = max(0, self._scanned - MATCH_OVERLAP)
+        for name, pattern in self.patterns.items():
+            if name not in self.matches:
+                match = pattern.search(self.text, start)
+                if match:
+                    self.matches[name] = match
+        self._scanned = len(self.text)
+
+    def finish(self) -> None:
+        """Search the whole text for the fields that have not matched yet."""
+        for name, pattern in self.patterns.items():
+            if name not in self.matches:
+                match = pattern.search(self.text)
+                if match:
+                    self.matches[name] = match
+
+    def group(self, name: str) -> Optional[str]:
+        """Return the stripped value (group 1) of a field, or None if it did not match."""
+        match = self.matches.get(name)
+        return match.group(1).strip() if match else None
+
+
+class StreamedPage:
+    """
+    The part of an HTML page read by read_html.
+
+    Attributes:
+        status_code: HTTP status of the response
+        text: Decoded text read before stopping
+        fields: Matcher holding the fields found in text
+        truncated: True if reading stopped before the end of the page
+    """
+
+    def __init__(self, status_code: int, fields: HTMLFieldMatcher, truncated: bool):
+        self.status_code = status_code
+        self.fields = fields
+        self.text = fields.text
+        self.truncated = truncated
+
+
+def read_html(response, patterns: Dict[str, Union[str, Pattern]],
+              max_bytes: int = HTML_MAX_BYTES, chunk_size: int = CHUNK_SIZE,
+              required: Optional[Iterable[str]] = None,
+              optional_bytes: int = OPTIONAL_FIELD_BYTES) -> StreamedPage:
+    """
+    Read a streamed response (requested with stream=True) until every pattern has
+    matched, optional_bytes past the point where the required patterns matched, or
+    max_bytes, whichever comes first, then close it.
+
+    Args:
+        response: A requests.Response opened with stream=True
+        patterns: Field name -> regex; group 1 is the value
+        max_bytes: Maximum bytes to read
+        chunk_size: Bytes per read
+        required: Names of the fields that must be found (defaults to all of them)
+        optional_bytes: Bytes read for optional fields once the required ones matched
+
+    Returns:
+        StreamedPage with the fields found (non-200 responses are not read)
+    """
+    fields = HTMLFieldMatcher(patterns, required)
+    truncated = False
+    try:
+        if response.status_code != 200:
+            return StreamedPage(response.status_code, fields, truncated=True)
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        read = 0
+        stop_at = max_bytes
+        for chunk in response.iter_content(chunk_size):
+            read += len(chunk)
+            fields.feed(decoder.decode(chunk))
+            if stop_at == max_bytes and fields.required_done:
+                stop_at = min(max_bytes, read + optional_bytes)
+            if fields.done or read >= stop_at:
+                truncated = True
+                break
+        else:
+            fields.feed(decoder.decode(b"", final=True))
+        fields.finish()
+    finally:
+        response.close()
+    return StreamedPage(response.status_code, fields, truncated)
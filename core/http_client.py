@@ -0,0 +1,38 @@
+"""
+Shared HTTP Client
+
+This module provides one process-wide requests.Session with connection pooling so
+repeated requests to the same host reuse TCP/TLS connections instead of opening a
+new one per call. urllib3 keeps a separate connection pool for each host.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of hosts with a cached connection pool, and connections kept per host
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared connection-pooled session, creating it on first use.
+
+    Returns:
+        requests.Session: Session safe to use from worker threads for plain requests
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
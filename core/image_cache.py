@@ -0,0 +1,384 @@
+"""
+Image Artifact Cache
+
+This module keeps downloaded images and the artifacts computed from them on disk so
+that image similarity does not re-download and re-hash the same avatars.
+
+The cache has two layers:
+- URL -> content digest, with the ETag/Last-Modified validators needed to revalidate
+  the URL with a conditional request instead of downloading the body again.
+- Content digest -> image bytes, computed hashes and decoded thumbnails. Identical
+  images served from different URLs share one entry.
+
+Total size on disk is bounded; the least recently used images are evicted first.
+"""
+
+import io
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+
+from core.cache import default_cache_path
+
+# Default size bound for the on-disk cache (override with IMAGE_CACHE_MAX_MB in .env)
+DEFAULT_MAX_MB = 256
+
+# How long a cached URL is trusted before it is revalidated with the origin
+DEFAULT_FRESH_SECONDS = 24 * 60 * 60
+
+
+def content_digest(content: bytes) -> str:
+    """
+    Compute the content address of an image body.
+
+    Args:
+        content: Raw image bytes
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class ImageCache:
+    """
+    Size-bounded, content-addressed on-disk cache for images and their artifacts.
+
+    Args:
+        directory: Cache directory (defaults to <CACHE_DIR>/images)
+        max_bytes: Maximum total size of stored images and thumbnails
+        fresh_seconds: Age after which a URL mapping must be revalidated
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 fresh_seconds: float = DEFAULT_FRESH_SECONDS):
+        self.directory = directory or default_cache_path("images")
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("IMAGE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+        os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    validated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    hashes TEXT NOT NULL DEFAULT '{}'
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (last_access)")
+
+    def _blob_path(self, digest: str, suffix: str = "") -> str:
+        return os.path.join(self.directory, "blobs", digest[:2], digest + suffix)
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _touch(self, digest: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+
+    # URL layer
+
+    def lookup_url(self, url: str) -> Optional[Dict]:
+        """
+        Return the cached mapping for a URL.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            Dict with digest, etag, last_modified, validated_at and fresh, or None
+        """
+        row = self._connect().execute(
+            "SELECT u.digest, u.etag, u.last_modified, u.validated_at FROM urls u "
+            "JOIN blobs b ON b.digest = u.digest WHERE u.url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        digest, etag, last_modified, validated_at = row
+        return {
+            "digest": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "validated_at": validated_at,
+            "fresh": time.time() - validated_at < self.fresh_seconds,
+        }
+
+    def conditional_headers(self, url: str, entry: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        Build If-None-Match/If-Modified-Since headers for revalidating a URL.
+
+        Args:
+            url: Image URL
+            entry: The URL's mapping if the caller already looked it up with lookup_url
+
+        Returns:
+            Dict of request headers (empty if the URL is not cached)
+        """
+        if entry is None:
+            entry = self.lookup_url(url)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_validated(self, url: str) -> Optional[str]:
+        """
+        Record a 304 Not Modified response for a URL.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            str: The digest of the still-valid cached body, or None if not cached
+        """
+        entry = self.lookup_url(url)
+        if entry is None:
+            return None
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE urls SET validated_at = ? WHERE url = ?", (time.time(), url))
+        return entry["digest"]
+
+    def store(self, url: str, content: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> str:
+        """
+        Store a downloaded image body and map the URL to it.
+
+        Args:
+            url: Image URL
+            content: Raw image bytes
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+
+        Returns:
+            str: Content digest of the stored body
+        """
+        digest = content_digest(content)
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            self._write_file(path, content)
+
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO blobs (digest, size, last_access) VALUES (?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access",
+                (digest, len(content), now),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO urls (url, digest, etag, last_modified, validated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, digest, etag, last_modified, now),
+            )
+        self.evict(keep=digest)
+        return digest
+
+    # Digest layer
+
+    def read_bytes(self, digest: str) -> Optional[bytes]:
+        """
+        Read a cached image body.
+
+        Args:
+            digest: Content digest
+
+        Returns:
+            bytes or None if the body has been evicted
+        """
+        try:
+            with open(self._blob_path(digest), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        self._touch(digest)
+        return content
+
+    def get_hashes(self, digest: str) -> Dict[str, str]:
+        """
+        Return the hashes computed for an image (e.g. {"phash": "<hex>"}).
+
+        Args:
+            digest: Content digest
+
+        Returns:
+            Dict of hash name to hex string (empty if none cached)
+        """
+        row = self._connect().execute(
+            "SELECT hashes FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return {}
+        self._touch(digest)
+        return json.loads(row[0])
+
+    def set_hashes(self, digest: str, hashes: Dict[str, str]) -> None:
+        """
+        Merge computed hashes into an image's entry.
+
+        Args:
+            digest: Content digest
+            hashes: Dict of hash name to hex string
+        """
+        conn = self._connect()
+        with conn:
+            row = conn.execute("SELECT hashes FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                return
+            merged = json.loads(row[0])
+            merged.update(hashes)
+            conn.execute(
+                "UPDATE blobs SET hashes = ?, last_access = ? WHERE digest = ?",
+                (json.dumps(merged), time.time(), digest),
+            )
+
+    def get_thumbnail(self, digest: str, size: int) -> Optional[Image.Image]:
+        """
+        Return a cached decoded thumbnail.
+
+        Args:
+            digest: Content digest
+            size: Thumbnail edge length in pixels
+
+        Returns:
+            PIL Image or None if no thumbnail of that size is cached
+        """
+        try:
+            img = Image.open(self._blob_path(digest, f".thumb{size}.png"))
+            img.load()
+        except OSError:
+            return None
+        self._touch(digest)
+        return img
+
+    def set_thumbnail(self, digest: str, size: int, thumbnail: Image.Image) -> None:
+        """
+        Store a decoded thumbnail for an image.
+
+        Args:
+            digest: Content digest
+            size: Thumbnail edge length in pixels
+            thumbnail: The thumbnail image
+        """
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format="PNG")
+        data = buffer.getvalue()
+        path = self._blob_path(digest, f".thumb{size}.png")
+        # Rewriting an existing thumbnail replaces its size rather than adding to it
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        conn = self._connect()
+        with conn:
+            updated = conn.execute(
+                "UPDATE blobs SET size = size + ?, last_access = ? WHERE digest = ?",
+                (len(data) - old_size, time.time(), digest),
+            ).rowcount
+        if updated:
+            self._write_file(path, data)
+            self.evict(keep=digest)
+
+    # Eviction
+
+    def total_bytes(self) -> int:
+        """Return the total size of cached images and thumbnails."""
+        row = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return row[0]
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Evict least recently used images until the cache fits in max_bytes.
+
+        Args:
+            keep: Digest that must not be evicted (the entry just written)
+
+        Returns:
+            int: Number of images evicted
+        """
+        with self._evict_lock:
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return 0
+
+            conn = self._connect()
+            evicted = 0
+            rows = conn.execute("SELECT digest, size FROM blobs ORDER BY last_access").fetchall()
+            for digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if digest == keep:
+                    continue
+                with conn:
+                    conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                    conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                folder = os.path.dirname(self._blob_path(digest))
+                for name in os.listdir(folder) if os.path.isdir(folder) else []:
+                    if name.startswith(digest):
+                        try:
+                            os.remove(os.path.join(folder, name))
+                        except OSError:
+                            pass
+                total -= size
+                evicted += 1
+            return evicted
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Return the shared ImageCache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ImageCache()
+    return _default_cache
@@ -0,0 +1,250 @@
+"""
+Image Embeddings
+
+This module runs a compact image-embedding model (a CLIP image tower or a face
+embedding model exported to ONNX) on CPU with ONNX Runtime. All images of a
+validation batch are embedded in one inference call, embeddings are cached by image
+content digest, and similarity is a single matrix-vector cosine product.
+
+onnxruntime is optional. The backend is enabled by pointing IMAGE_EMBEDDING_MODEL
+(in .env) at an .onnx file; without it, get_image_embedder() returns None and callers
+fall back to the perceptual fingerprints in core.image_fingerprint.
+"""
+
+import os
+import hashlib
+import threading
+from io import BytesIO
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.cache import MemoryCache
+from core.image_cache import get_image_cache
+from core.instrumentation import record_cache_hit
+
+# CLIP preprocessing constants (override for face models via IMAGE_EMBEDDING_MEAN/STD)
+DEFAULT_INPUT_SIZE = 224
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+
+# Largest number of images sent to the model in one inference call
+MAX_BATCH_SIZE = 64
+
+
+def is_available() -> bool:
+    """Return True if onnxruntime is installed and an embedding model is configured."""
+    model_path = os.environ.get("IMAGE_EMBEDDING_MODEL")
+    if not model_path or not os.path.exists(model_path):
+        return False
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _parse_floats(value: Optional[str], default):
+    if not value:
+        return default
+    return tuple(float(part) for part in value.split(","))
+
+
+def cosine_similarities(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Compute cosine similarities between one embedding and many.
+
+    Args:
+        query: L2-normalized embedding of shape (D,)
+        matrix: L2-normalized embeddings of shape (N, D)
+
+    Returns:
+        np.ndarray: Similarities of shape (N,), clipped to 0-1
+    """
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.clip(matrix @ query, 0.0, 1.0)
+
+
+class ImageEmbedder:
+    """
+    Batched CPU image embedder backed by an ONNX Runtime session.
+
+    Args:
+        model_path: Path to the .onnx model (NCHW float32 image input)
+        input_size: Edge length of the model input (read from the model if static)
+        mean: Per-channel normalization mean
+        std: Per-channel normalization standard deviation
+        num_threads: Intra-op threads (defaults to ONNX Runtime's choice)
+    """
+
+    def __init__(self, model_path: str, input_size: Optional[int] = None,
+                 mean=CLIP_MEAN, std=CLIP_STD, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        static_size = model_input.shape[-1] if len(model_input.shape) == 4 else None
+        self.input_size = input_size or (static_size if isinstance(static_size, int) else DEFAULT_INPUT_SIZE)
+        self.mean = np.asarray(mean, dtype=np.float32).reshape(3, 1, 1)
+        self.std = np.asarray(std, dtype=np.float32).reshape(3, 1, 1)
+
+        stat = os.stat(model_path)
+        self.model_id = hashlib.sha256(
+            f"{os.path.basename(model_path)}:{stat.st_size}:{int(stat.st_mtime)}".encode()
+        ).hexdigest()[:12]
+        self._memory = MemoryCache(max_entries=4096)
+
+    def preprocess(self, content: bytes) -> np.ndarray:
+        """
+        Decode image bytes into a normalized CHW float32 array.
+
+        The image is resized so its shorter side matches the input size and then
+        center-cropped, as in CLIP preprocessing.
+        """
+        img = Image.open(BytesIO(content))
+        img.draft("RGB", (self.input_size, self.input_size))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        width, height = img.size
+        scale = self.input_size / min(width, height)
+        img = img.resize((max(self.input_size, round(width * scale)),
+                          max(self.input_size, round(height * scale))), Image.BICUBIC)
+        left = (img.size[0] - self.input_size) // 2
+        top = (img.size[1] - self.input_size) // 2
+        img = img.crop((left, top, left + self.input_size, top + self.input_size))
+
+        pixels = np.asarray(img, dtype=np.float32).transpose(2, 0, 1) / 255.0
+        return (pixels - self.mean) / self.std
+
+    def embed_arrays(self, arrays: List[np.ndarray]) -> np.ndarray:
+        """
+        Embed a batch of preprocessed images.
+
+        Args:
+            arrays: Outputs of preprocess()
+
+        Returns:
+            np.ndarray: L2-normalized embeddings of shape (len(arrays), D)
+        """
+        embeddings = []
+        for start in range(0, len(arrays), MAX_BATCH_SIZE):
+            batch = np.stack(arrays[start:start + MAX_BATCH_SIZE])
+            output = self.session.run(None, {self.input_name: batch})[0]
+            if output.ndim == 3:
+                # Token outputs: use the class token
+                output = output[:, 0]
+            embeddings.append(output.reshape(len(batch), -1).astype(np.float32))
+
+        embeddings = np.concatenate(embeddings)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def embed_contents(self, contents: List[bytes]) -> np.ndarray:
+        """
+        Embed a batch of images.
+
+        Args:
+            contents: Raw image bytes
+
+        Returns:
+            np.ndarray: L2-normalized embeddings of shape (len(contents), D)
+        """
+        if not contents:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.embed_arrays([self.preprocess(content) for content in contents])
+
+    def embed_digests(self, digests: Iterable[str],
+                      load: Callable[[str], Optional[bytes]]) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Embed images identified by content digest, reusing cached embeddings.
+
+        Images without a cached embedding are embedded together in one batch.
+
+        Args:
+            digests: Content digests (see core.image_cache)
+            load: Returns the image bytes for a digest, or None if unavailable
+
+        Returns:
+            Dict mapping each digest to its embedding, or None if it could not be embedded
+        """
+        cache = get_image_cache()
+        cache_key = f"embedding:{self.model_id}"
+        results: Dict[str, Optional[np.ndarray]] = {}
+        pending_digests, pending_arrays = [], []
+
+        for digest in digests:
+            if digest in results:
+                continue
+            embedding = self._memory.get(digest)
+            if embedding is None:
+                cached = cache.get_hashes(digest).get(cache_key)
+                if cached:
+                    embedding = np.frombuffer(bytes.fromhex(cached), dtype=np.float16).astype(np.float32)
+                    self._memory.set(digest, embedding)
+            if embedding is not None:
+                record_cache_hit("image_embedding")
+                results[digest] = embedding
+                continue
+
+            results[digest] = None
+            content = load(digest)
+            if content is None:
+                continue
+            try:
+                # Decode up front so one bad image cannot fail the whole batch
+                pending_arrays.append(self.preprocess(content))
+            except Exception as e:
+                print(f"Error decoding image {digest[:12]} for embedding: {e}")
+                continue
+            pending_digests.append(digest)
+
+        if pending_arrays:
+            embeddings = self.embed_arrays(pending_arrays)
+            for digest, embedding in zip(pending_digests, embeddings):
+                results[digest] = embedding
+                self._memory.set(digest, embedding)
+                cache.set_hashes(digest, {cache_key: embedding.astype(np.float16).tobytes().hex()})
+
+        return results
+
+
+_embedder = None
+_embedder_failed = False
+_embedder_lock = threading.Lock()
+
+
+def get_image_embedder() -> Optional[ImageEmbedder]:
+    """
+    Return the shared ImageEmbedder, loading the model on first use.
+
+    Returns:
+        ImageEmbedder, or None if onnxruntime or the model is unavailable
+    """
+    global _embedder, _embedder_failed
+    if _embedder is None:
+        if _embedder_failed or not is_available():
+            return None
+        with _embedder_lock:
+            if _embedder is None and not _embedder_failed:
+                input_size = os.environ.get("IMAGE_EMBEDDING_SIZE")
+                try:
+                    _embedder = ImageEmbedder(
+                        os.environ["IMAGE_EMBEDDING_MODEL"],
+                        input_size=int(input_size) if input_size else None,
+                        mean=_parse_floats(os.environ.get("IMAGE_EMBEDDING_MEAN"), CLIP_MEAN),
+                        std=_parse_floats(os.environ.get("IMAGE_EMBEDDING_STD"), CLIP_STD),
+                    )
+                except Exception as e:
+                    print(f"Error loading image embedding model: {e}")
+                    _embedder_failed = True
+    return _embedder
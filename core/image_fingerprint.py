@@ -0,0 +1,188 @@
+"""
+Image Fingerprints
+
+This module computes a compact multi-signal fingerprint for profile photos. A single
+reduced decode of the image feeds four signals, all computed with vectorized NumPy:
+- pHash: sign of the low-frequency 8x8 DCT block of a 32x32 grayscale image
+- dHash: horizontal gradient signs of a 9x8 grayscale image
+- wHash: Haar approximation (8x8 block means) of a 64x64 grayscale image vs its median
+- color histogram: 4x4x4 RGB bins quantized to bytes
+
+A pHash alone is defeated by crops and re-encodes of LinkedIn avatars; fusing the
+signals is considerably more robust. Each fingerprint is stored as one fixed-width
+88-byte record (FINGERPRINT_DTYPE), so batches are plain NumPy arrays that can be
+scored in one shot and whose pHash column can be loaded into core.hash_index.
+"""
+
+from io import BytesIO
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.hash_index import popcount64
+
+# Edge length of the single decoded RGB image all signals are derived from
+DECODE_SIZE = 64
+
+# Histogram bins per RGB channel (4 -> 64 bins)
+HIST_BINS_PER_CHANNEL = 4
+HIST_BINS = HIST_BINS_PER_CHANNEL ** 3
+
+FINGERPRINT_DTYPE = np.dtype([
+    ("phash", "<u8"),
+    ("dhash", "<u8"),
+    ("whash", "<u8"),
+    ("hist", "u1", (HIST_BINS,)),
+])
+
+# Weights of each signal in the fused similarity score
+DEFAULT_WEIGHTS = {"phash": 0.35, "dhash": 0.25, "whash": 0.2, "hist": 0.2}
+
+
+def _dct_matrix(n: int, k: int) -> np.ndarray:
+    """First k rows of the (unnormalized) DCT-II matrix of size n."""
+    rows = np.arange(k)[:, None]
+    cols = np.arange(n)[None, :]
+    return np.cos(np.pi * rows * (2 * cols + 1) / (2 * n))
+
+
+_DCT_32_8 = _dct_matrix(32, 8)
+
+
+def _bits_to_uint64(bits: np.ndarray) -> np.uint64:
+    """Pack 64 booleans (row-major, most significant first) into a uint64."""
+    packed = np.packbits(bits.astype(bool).reshape(-1))
+    return np.uint64(int.from_bytes(packed.tobytes(), "big"))
+
+
+def _decode(content: bytes) -> np.ndarray:
+    """Decode image bytes once into a DECODE_SIZE x DECODE_SIZE RGB array."""
+    img = Image.open(BytesIO(content))
+    img.draft("RGB", (DECODE_SIZE, DECODE_SIZE))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    img = img.resize((DECODE_SIZE, DECODE_SIZE), Image.BILINEAR)
+    return np.asarray(img, dtype=np.float32)
+
+
+def _block_mean(pixels: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Downscale a 2-D array by averaging equal-sized blocks."""
+    h, w = pixels.shape
+    return pixels.reshape(rows, h // rows, cols, w // cols).mean(axis=(1, 3))
+
+
+def _resize_linear(pixels: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Bilinearly resample a 2-D array to rows x cols."""
+    h, w = pixels.shape
+    y = np.linspace(0, h - 1, rows)
+    x = np.linspace(0, w - 1, cols)
+    y0 = np.floor(y).astype(int)
+    x0 = np.floor(x).astype(int)
+    y1 = np.minimum(y0 + 1, h - 1)
+    x1 = np.minimum(x0 + 1, w - 1)
+    wy = (y - y0)[:, None]
+    wx = (x - x0)[None, :]
+    top = pixels[y0][:, x0] * (1 - wx) + pixels[y0][:, x1] * wx
+    bottom = pixels[y1][:, x0] * (1 - wx) + pixels[y1][:, x1] * wx
+    return top * (1 - wy) + bottom * wy
+
+
+def fingerprint_from_array(rgb: np.ndarray) -> np.ndarray:
+    """
+    Compute a fingerprint record from a DECODE_SIZE x DECODE_SIZE RGB array.
+
+    Args:
+        rgb: Float array of shape (DECODE_SIZE, DECODE_SIZE, 3) with values 0-255
+
+    Returns:
+        np.ndarray: A single FINGERPRINT_DTYPE record
+    """
+    # ITU-R 601 luma, as used by PIL's "L" conversion
+    gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    record = np.zeros((), dtype=FINGERPRINT_DTYPE)
+
+    lowfreq = _DCT_32_8 @ _block_mean(gray, 32, 32) @ _DCT_32_8.T
+    record["phash"] = _bits_to_uint64(lowfreq > np.median(lowfreq))
+
+    small = _resize_linear(gray, 8, 9)
+    record["dhash"] = _bits_to_uint64(small[:, 1:] > small[:, :-1])
+
+    approximation = _block_mean(gray, 8, 8)
+    record["whash"] = _bits_to_uint64(approximation > np.median(approximation))
+
+    quantized = np.clip(rgb // (256 // HIST_BINS_PER_CHANNEL), 0, HIST_BINS_PER_CHANNEL - 1).astype(np.int64)
+    bins = (quantized[..., 0] * HIST_BINS_PER_CHANNEL + quantized[..., 1]) * HIST_BINS_PER_CHANNEL + quantized[..., 2]
+    counts = np.bincount(bins.reshape(-1), minlength=HIST_BINS).astype(np.float64)
+    record["hist"] = np.round(counts / counts.sum() * 255).astype(np.uint8)
+
+    return record
+
+
+def compute_fingerprint(content: bytes) -> np.ndarray:
+    """
+    Decode image bytes once and compute their fingerprint record.
+
+    Args:
+        content: Raw image bytes
+
+    Returns:
+        np.ndarray: A single FINGERPRINT_DTYPE record
+    """
+    return fingerprint_from_array(_decode(content))
+
+
+def fingerprint_to_hex(record: np.ndarray) -> str:
+    """Serialize a fingerprint record to a hex string (for caches)."""
+    return np.asarray(record, dtype=FINGERPRINT_DTYPE).tobytes().hex()
+
+
+def fingerprint_from_hex(value: str) -> np.ndarray:
+    """Deserialize a fingerprint record produced by fingerprint_to_hex."""
+    return np.frombuffer(bytes.fromhex(value), dtype=FINGERPRINT_DTYPE)[0]
+
+
+def fingerprint_similarities(query: np.ndarray, records: np.ndarray,
+                             weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Compute fused similarity scores between one fingerprint and many.
+
+    Args:
+        query: A single FINGERPRINT_DTYPE record
+        records: Array of FINGERPRINT_DTYPE records
+        weights: Optional weights per signal (defaults to DEFAULT_WEIGHTS)
+
+    Returns:
+        np.ndarray: Similarity scores between 0 and 1, aligned with records
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    records = np.atleast_1d(np.asarray(records, dtype=FINGERPRINT_DTYPE))
+    total_weight = sum(weights.values())
+
+    score = np.zeros(len(records), dtype=np.float64)
+    for field in ("phash", "dhash", "whash"):
+        distance = popcount64(np.bitwise_xor(records[field], query[field]))
+        score += weights.get(field, 0.0) * (1.0 - distance / 64.0)
+
+    # Histogram intersection of the normalized color distributions
+    intersection = np.minimum(records["hist"].astype(np.int32), query["hist"].astype(np.int32)).sum(axis=1)
+    score += weights.get("hist", 0.0) * np.clip(intersection / 255.0, 0.0, 1.0)
+
+    return score / total_weight
+
+
+def fingerprint_similarity(a: np.ndarray, b: np.ndarray,
+                           weights: Optional[Dict[str, float]] = None) -> float:
+    """
+    Compute the fused similarity score between two fingerprints.
+
+    Args:
+        a: FINGERPRINT_DTYPE record
+        b: FINGERPRINT_DTYPE record
+        weights: Optional weights per signal (defaults to DEFAULT_WEIGHTS)
+
+    Returns:
+        float: Similarity between 0 and 1
+    """
+    return float(fingerprint_similarities(a, np.asarray([b], dtype=FINGERPRINT_DTYPE), weights)[0])
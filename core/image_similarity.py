@@ -1,12 +1,28 @@
 import os
-import requests
 import imagehash
 import numpy as np
 from PIL import Image
 from io import BytesIO
-from typing import Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from dotenv import load_dotenv
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+from core.avatar_resolver import linkedin_slug, resolve_linkedin_avatars
+from core.cache import MemoryCache
+from core.http_client import get_session
+from core.image_cache import get_image_cache
+from core.image_embedding import cosine_similarities, get_image_embedder
+from core.image_fingerprint import (
+    FINGERPRINT_DTYPE,
+    compute_fingerprint,
+    fingerprint_from_hex,
+    fingerprint_similarities,
+    fingerprint_similarity,
+    fingerprint_to_hex,
+)
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +30,90 @@ load_dotenv()
 # Constants
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+# Per-request timeout for image downloads (seconds)
+IMAGE_REQUEST_TIMEOUT = 10
+
+# Largest image body we download; profile photos are far smaller (override with IMAGE_MAX_BYTES in .env)
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+# Edge length images are decoded to before hashing (phash works on a 32x32 grayscale image)
+HASH_DECODE_SIZE = 64
+
+# Batch hashing defaults: overall deadline, download threads and concurrent fetches per host
+BATCH_DEADLINE = 15.0
+DOWNLOAD_WORKERS = 16
+PER_HOST_LIMIT = 4
+
+# Hashes computed in this session, keyed by URL, so the persona image is hashed once
+_session_hashes = MemoryCache(max_entries=4096)
+
+def _read_capped_body(response, max_bytes: int) -> Optional[bytes]:
+    """
+    Read a streamed response body, aborting once it exceeds max_bytes.
+    Returns None for oversized payloads.
+    """
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        response.close()
+        return None
+    
+    chunks = []
+    received = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        received += len(chunk)
+        if received > max_bytes:
+            response.close()
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def resolve_image_digest(url: str, timeout: float = IMAGE_REQUEST_TIMEOUT) -> Optional[str]:
+    """
+    Map an image URL to the content digest of its body in the image cache.
+    Downloads the image only if it is not cached or has changed upstream
+    (revalidated with ETag/Last-Modified).
+    
+    Returns None if the image cannot be fetched.
+    """
+    if not url:
+        return None
+    
+    cache = get_image_cache()
+    entry = cache.lookup_url(url)
+    if entry and entry["fresh"]:
+        return entry["digest"]
+    
+    try:
+        session = get_session()
+        headers = {"User-Agent": USER_AGENT}
+        headers.update(cache.conditional_headers(url, entry))
+        response = session.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code == 304:
+            response.close()
+            digest = cache.mark_validated(url)
+            if digest:
+                return digest
+            # Entry was evicted in the meantime; fetch the full body
+            response = session.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout, stream=True)
+        response.raise_for_status()
+        
+        max_bytes = int(os.environ.get("IMAGE_MAX_BYTES", MAX_IMAGE_BYTES))
+        content = _read_capped_body(response, max_bytes)
+        if content is None:
+            print(f"Image at {url} exceeds {max_bytes} bytes, skipping")
+            return None
+        return cache.store(
+            url,
+            content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    except Exception as e:
+        print(f"Error fetching image from {url}: {e}")
+        return None
+
+
 def load_image_from_url(url: str) -> Optional[Image.Image]:
     """
     Load an image from a URL and return it as a PIL Image.
@@ -23,10 +123,13 @@ def load_image_from_url(url: str) -> Optional[Image.Image]:
         return None
     
     try:
-        headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        img = Image.open(BytesIO(response.content))
+        digest = resolve_image_digest(url)
+        if digest is None:
+            return None
+        content = get_image_cache().read_bytes(digest)
+        if content is None:
+            return None
+        img = Image.open(BytesIO(content))
         
         # Convert to RGB if needed
         if img.mode != "RGB":
@@ -38,98 +141,41 @@ def load_image_from_url(url: str) -> Optional[Image.Image]:
         return None
 
 
+def load_image_thumbnail(url: str, size: int = 128) -> Optional[Image.Image]:
+    """
+    Load a small RGB thumbnail of an image, decoding the full image only once per content.
+    Returns None if the image cannot be loaded.
+    """
+    digest = resolve_image_digest(url)
+    if digest is None:
+        return None
+    
+    cache = get_image_cache()
+    thumbnail = cache.get_thumbnail(digest, size)
+    if thumbnail is not None:
+        return thumbnail
+    
+    img = load_image_from_url(url)
+    if img is None:
+        return None
+    img.thumbnail((size, size))
+    cache.set_thumbnail(digest, size, img)
+    return img
+
+
 def get_linkedin_profile_image(linkedin_id: str) -> Optional[str]:
     """
     Fetch a LinkedIn profile picture URL using Brightdata API.
     Returns None if the profile picture cannot be fetched.
+    
+    For many candidates use core.avatar_resolver.resolve_linkedin_avatars, which
+    submits them in one snapshot instead of one snapshot per profile.
     """
     if not linkedin_id:
         return None
     
-    # Extract the username from the LinkedIn ID if it's a full URL
-    if linkedin_id.startswith("http"):
-        linkedin_id = linkedin_id.strip("/")
-        linkedin_id = linkedin_id.split("/")[-1]
-    
-    # Get API key from environment variables
-    api_key = os.environ.get("BRIGHTDATA_API_KEY")
-    if not api_key:
-        print("BRIGHTDATA_API_KEY not set in environment variables")
-        return None
-    
     try:
-        BASE = "https://api.brightdata.com/datasets/v3"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-        params = {
-            "dataset_id": "gd_l1viktl72bvl7bjuj0",
-            "include_errors": "true",
-        }
-        
-        # Construct the LinkedIn URL
-        linkedin_url = f"https://www.linkedin.com/in/{linkedin_id}"
-        
-        # Trigger the snapshot
-        trigger = requests.post(
-            f"{BASE}/trigger",
-            headers=headers,
-            params=params,
-            json=[{"url": linkedin_url}],
-        )
-        trigger.raise_for_status()
-        snap_resp = trigger.json()
-        snapshot_id = snap_resp.get("snapshot_id")
-        if not snapshot_id:
-            print(f"No snapshot_id in trigger response: {snap_resp}")
-            return None
-        
-        print(f"Triggered snapshot: {snapshot_id}")
-        
-        # Wait for the snapshot to be ready
-        download_url = f"{BASE}/snapshot/{snapshot_id}"
-        for attempt in range(60):  # ~5 minutes max
-            r = requests.get(download_url, headers=headers)
-            
-            if r.status_code == 202:
-                try:
-                    status = r.json().get("status")
-                except ValueError:
-                    status = "unknown"
-                print(f"[{attempt+1:02d}/60] task not completed status={status}")
-                time.sleep(5)
-                continue
-            
-            if r.status_code == 404:
-                print(f"Snapshot not found: {snapshot_id}")
-                return None
-            
-            r.raise_for_status()
-            
-            data = r.json()
-            print("Snapshot ready, fetched results.")
-            
-            # Extract profile picture URL from the response
-            if isinstance(data, list) and len(data) > 0:
-                profile_data = data[0]
-            else:
-                profile_data = data
-                
-            # Try to get the profile picture URL using different possible keys
-            profile_pic_url = None
-            possible_keys = ["profile_pic_url", "profilePicture", "profile_picture", "picture", "image"]
-            
-            for key in possible_keys:
-                if isinstance(profile_data, dict) and key in profile_data:
-                    profile_pic_url = profile_data[key]
-                    if profile_pic_url:
-                        break
-            
-            return profile_pic_url
-        
-        print("Timed out waiting for snapshot to be ready")
-        return None
+        return resolve_linkedin_avatars([linkedin_id]).get(linkedin_slug(linkedin_id))
     except Exception as e:
         print(f"Error fetching LinkedIn profile picture for {linkedin_id}: {e}")
         return None
@@ -140,22 +186,200 @@ def get_image_hash(image: Union[str, Image.Image]) -> Optional[imagehash.ImageHa
     Calculate perceptual hash for an image URL or PIL Image.
     """
     try:
-        # Load image if URL is provided
+        # Load image if URL is provided, reusing hashes cached for its content
         if isinstance(image, str):
-            img = load_image_from_url(image)
-            if img is None:
+            img_hash = _session_hashes.get(image)
+            if img_hash is not None:
+                return img_hash
+            
+            digest = resolve_image_digest(image)
+            if digest is None:
                 return None
-        else:
-            img = image
+            return _hash_cached_image(image, digest)
         
         # Calculate perceptual hash (using phash for better accuracy)
-        img_hash = imagehash.phash(img)
+        img_hash = imagehash.phash(image)
         return img_hash
     except Exception as e:
         print(f"Error generating image hash: {e}")
         return None
 
 
+def load_image_for_hashing(content: bytes, size: int = HASH_DECODE_SIZE) -> Image.Image:
+    """
+    Decode image bytes straight to a small grayscale image for perceptual hashing.
+    
+    JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2 to 1/8 while
+    decoding and skip chroma, so a multi-megapixel photo never materializes at full
+    resolution. Other formats are converted and reduced after decoding.
+    """
+    img = Image.open(BytesIO(content))
+    img.draft("L", (size, size))
+    if img.mode != "L":
+        img = img.convert("L")
+    if max(img.size) > size:
+        img.thumbnail((size, size), Image.BILINEAR)
+    return img
+
+
+def hash_image_bytes(content: bytes) -> imagehash.ImageHash:
+    """
+    Compute the pHash of raw image bytes using the reduced decoding path.
+    """
+    return imagehash.phash(load_image_for_hashing(content))
+
+
+def _hash_cached_image(url: str, digest: str) -> Optional[imagehash.ImageHash]:
+    """
+    Return the pHash of a cached image body, decoding and hashing it only if needed.
+    """
+    cache = get_image_cache()
+    cached = cache.get_hashes(digest).get("phash")
+    if cached:
+        img_hash = imagehash.hex_to_hash(cached)
+    else:
+        content = cache.read_bytes(digest)
+        if content is None:
+            return None
+        img_hash = hash_image_bytes(content)
+        cache.set_hashes(digest, {"phash": str(img_hash)})
+    
+    _session_hashes.set(url, img_hash)
+    return img_hash
+
+
+def _host_limited_downloader(urls: List[str], end_time: float, per_host_limit: int):
+    """
+    Build a download function for a batch of URLs that allows at most per_host_limit
+    concurrent requests per host and gives up at end_time (time.monotonic()).
+    The function returns (url, digest), with digest None on failure or timeout.
+    """
+    host_limits = {urlparse(url).netloc: threading.BoundedSemaphore(per_host_limit) for url in urls}
+    
+    def download(url):
+        remaining = end_time - time.monotonic()
+        semaphore = host_limits[urlparse(url).netloc]
+        if remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            return url, None
+        try:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                return url, None
+            return url, resolve_image_digest(url, timeout=min(IMAGE_REQUEST_TIMEOUT, remaining))
+        finally:
+            semaphore.release()
+    
+    return download
+
+
+def resolve_image_digests(urls: Iterable[str], deadline: float = BATCH_DEADLINE,
+                          download_workers: int = DOWNLOAD_WORKERS,
+                          per_host_limit: int = PER_HOST_LIMIT) -> Dict[str, Optional[str]]:
+    """
+    Download many images concurrently into the image cache.
+    
+    Args:
+        urls: Image URLs
+        deadline: Overall time budget in seconds
+        download_workers: Maximum concurrent downloads
+        per_host_limit: Maximum concurrent downloads per host
+        
+    Returns:
+        Dict mapping each URL to its content digest, or None if it could not be fetched in time
+    """
+    pending = list(dict.fromkeys(url for url in urls if url))
+    results: Dict[str, Optional[str]] = {url: None for url in pending}
+    if not pending:
+        return results
+    
+    end_time = time.monotonic() + deadline
+    download = _host_limited_downloader(pending, end_time, per_host_limit)
+    pool = ThreadPoolExecutor(max_workers=min(download_workers, len(pending)))
+    try:
+        futures = [pool.submit(download, url) for url in pending]
+        done, not_done = wait(futures, timeout=max(0.0, end_time - time.monotonic()))
+        for future in done:
+            url, digest = future.result()
+            results[url] = digest
+        if not_done:
+            print(f"Image download deadline reached with {len(not_done)} images pending")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+
+def hash_images(urls: Iterable[str], deadline: float = BATCH_DEADLINE,
+                download_workers: int = DOWNLOAD_WORKERS,
+                hash_workers: Optional[int] = None,
+                per_host_limit: int = PER_HOST_LIMIT) -> Dict[str, Optional[imagehash.ImageHash]]:
+    """
+    Download and hash many images concurrently.
+    
+    Downloads run on a pooled HTTP session in a bounded thread pool, with at most
+    per_host_limit concurrent requests per host. Decoding and hashing run in a
+    separate pool so slow downloads do not hold up CPU work. Images not finished
+    before the deadline are returned as None.
+    
+    Args:
+        urls: Image URLs to hash
+        deadline: Overall time budget in seconds
+        download_workers: Maximum concurrent downloads
+        hash_workers: Maximum concurrent decode+hash jobs (defaults to CPU count)
+        per_host_limit: Maximum concurrent downloads per host
+        
+    Returns:
+        Dict mapping each URL to its pHash, or None if it could not be hashed in time
+    """
+    results: Dict[str, Optional[imagehash.ImageHash]] = {}
+    pending = []
+    for url in urls:
+        if not url or url in results:
+            continue
+        results[url] = _session_hashes.get(url)
+        if results[url] is None:
+            pending.append(url)
+    
+    if not pending:
+        return results
+    
+    end_time = time.monotonic() + deadline
+    download = _host_limited_downloader(pending, end_time, per_host_limit)
+    
+    def decode_and_hash(url, digest):
+        try:
+            return url, _hash_cached_image(url, digest)
+        except Exception as e:
+            print(f"Error generating image hash for {url}: {e}")
+            return url, None
+    
+    download_pool = ThreadPoolExecutor(max_workers=min(download_workers, len(pending)))
+    hash_pool = ThreadPoolExecutor(max_workers=hash_workers or os.cpu_count() or 4)
+    downloads = {download_pool.submit(download, url) for url in pending}
+    hashing = set()
+    try:
+        while downloads or hashing:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                print(f"Image hashing deadline reached with {len(downloads) + len(hashing)} images pending")
+                break
+            done, _ = wait(downloads | hashing, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, value = future.result()
+                if future in downloads:
+                    downloads.discard(future)
+                    if value:
+                        hashing.add(hash_pool.submit(decode_and_hash, url, value))
+                else:
+                    hashing.discard(future)
+                    results[url] = value
+    finally:
+        download_pool.shutdown(wait=False, cancel_futures=True)
+        hash_pool.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+
 def compute_similarity(hash1: imagehash.ImageHash, hash2: imagehash.ImageHash) -> float:
     """
     Compute similarity between two image hashes.
@@ -174,10 +398,63 @@ def compute_similarity(hash1: imagehash.ImageHash, hash2: imagehash.ImageHash) -
         return 0.0
 
 
-def compare_image_similarity_clip(url1: str, url2: str) -> float:
+def find_similar_images(image: Union[str, Image.Image], index, max_distance: int = 10) -> List[Tuple[str, float]]:
+    """
+    Look up an image in a perceptual hash index (see core.hash_index.PHashIndex).
+    
+    Args:
+        image: Image URL or PIL Image to look up
+        index: PHashIndex built over previously collected avatars
+        max_distance: Maximum Hamming distance between pHashes
+        
+    Returns:
+        List of (key, similarity) tuples, most similar first
+    """
+    img_hash = get_image_hash(image)
+    if img_hash is None:
+        return []
+    
+    return [
+        (key, 1.0 - (distance / 64.0))
+        for key, distance in index.range_query(img_hash, max_distance)
+    ]
+
+
+def get_image_fingerprint(url: str) -> Optional[np.ndarray]:
+    """
+    Compute the multi-hash fingerprint (see core.image_fingerprint) of an image URL.
+    Fingerprints are cached by content digest, so each image is decoded at most once.
+    Returns None if the image cannot be loaded.
+    """
+    try:
+        digest = resolve_image_digest(url)
+        if digest is None:
+            return None
+        return _fingerprint_cached_image(digest)
+    except Exception as e:
+        print(f"Error generating image fingerprint for {url}: {e}")
+        return None
+
+
+def _fingerprint_cached_image(digest: str) -> Optional[np.ndarray]:
+    """Fingerprint an image already in the image cache, reusing a stored fingerprint."""
+    cache = get_image_cache()
+    cached = cache.get_hashes(digest).get("fingerprint")
+    if cached:
+        return fingerprint_from_hex(cached)
+    
+    content = cache.read_bytes(digest)
+    if content is None:
+        return None
+    fingerprint = compute_fingerprint(content)
+    cache.set_hashes(digest, {"fingerprint": fingerprint_to_hex(fingerprint)})
+    return fingerprint
+
+
+def compare_image_fingerprints(url1: str, url2: str) -> float:
     """
-    Compare two images using perceptual hashing and return a similarity score.
-    Note: Function name kept the same for backward compatibility.
+    Compare two images using their fused multi-hash fingerprints.
+    More robust to crops and re-encodes than a single pHash.
     
     Args:
         url1: URL of the first image
@@ -186,17 +463,107 @@ def compare_image_similarity_clip(url1: str, url2: str) -> float:
     Returns:
         Similarity score between 0 and 1
     """
-    # Get image hashes
-    hash1 = get_image_hash(url1)
-    hash2 = get_image_hash(url2)
+    fingerprint1 = get_image_fingerprint(url1)
+    fingerprint2 = get_image_fingerprint(url2)
     
-    # Check if we have valid hashes
-    if hash1 is None or hash2 is None:
-        print("Could not generate valid hashes for both images")
+    if fingerprint1 is None or fingerprint2 is None:
+        print("Could not generate valid fingerprints for both images")
         return 0.0
     
-    # Compute similarity
-    return compute_similarity(hash1, hash2)
+    return fingerprint_similarity(fingerprint1, fingerprint2)
+
+
+def _query_image_digest(image: str) -> Optional[str]:
+    """Map a persona image (URL or local file path) to a content digest in the image cache."""
+    if image.startswith(("http://", "https://")):
+        return resolve_image_digest(image)
+    try:
+        with open(image, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        print(f"Error reading image {image}: {e}")
+        return None
+    return get_image_cache().store("file://" + os.path.abspath(image), content)
+
+
+def image_similarities(query_image: str, urls: Iterable[str],
+                       deadline: float = BATCH_DEADLINE) -> Dict[str, Optional[float]]:
+    """
+    Compare one image with many candidate images.
+    
+    All images are downloaded concurrently. When the ONNX embedding backend is
+    configured (see core.image_embedding), images missing a cached embedding are
+    embedded in one batch and scored with a single matrix-vector cosine product;
+    otherwise the fused perceptual fingerprints are used.
+    
+    Args:
+        query_image: URL or local file path of the reference image
+        urls: Candidate image URLs
+        deadline: Time budget in seconds for downloading the images
+        
+    Returns:
+        Dict mapping each URL to a similarity between 0 and 1, or None if it could not be compared
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+    results: Dict[str, Optional[float]] = {url: None for url in urls}
+    if not urls or not query_image:
+        return results
+    
+    is_remote = query_image.startswith(("http://", "https://"))
+    digests = resolve_image_digests(urls + [query_image] if is_remote else urls, deadline)
+    query_digest = digests.get(query_image) if is_remote else _query_image_digest(query_image)
+    if query_digest is None:
+        print("Could not load the reference image")
+        return results
+    
+    candidates = {url: digests[url] for url in urls if digests.get(url)}
+    if not candidates:
+        return results
+    
+    embedder = get_image_embedder()
+    if embedder is not None:
+        cache = get_image_cache()
+        vectors = embedder.embed_digests([query_digest, *candidates.values()], cache.read_bytes)
+        query = vectors.get(query_digest)
+        if query is None:
+            return results
+        scored = [url for url, digest in candidates.items() if vectors.get(digest) is not None]
+        if scored:
+            matrix = np.stack([vectors[candidates[url]] for url in scored])
+            for url, similarity in zip(scored, cosine_similarities(query, matrix)):
+                results[url] = float(similarity)
+        return results
+    
+    query = _fingerprint_cached_image(query_digest)
+    if query is None:
+        return results
+    fingerprints = {url: _fingerprint_cached_image(digest) for url, digest in candidates.items()}
+    scored = [url for url, fingerprint in fingerprints.items() if fingerprint is not None]
+    if scored:
+        records = np.asarray([fingerprints[url] for url in scored], dtype=FINGERPRINT_DTYPE)
+        for url, similarity in zip(scored, fingerprint_similarities(query, records)):
+            results[url] = float(similarity)
+    return results
+
+
+def compare_image_similarity_clip(url1: str, url2: str) -> float:
+    """
+    Compare two images and return a similarity score.
+    Uses the ONNX embedding backend when configured, otherwise the fused perceptual
+    fingerprints, so the score matches image_similarities and validate_persona_match.
+    
+    Args:
+        url1: URL of the first image
+        url2: URL of the second image
+        
+    Returns:
+        Similarity score between 0 and 1
+    """
+    similarity = image_similarities(url1, [url2]).get(url2)
+    if similarity is None:
+        print("Could not compare the two images")
+        return 0.0
+    return similarity
 
 
 def compare_linkedin_with_persona(linkedin_id: str, persona_image_url: str) -> Tuple[float, Optional[str]]:
@@ -226,7 +593,10 @@ def compare_linkedin_with_persona(linkedin_id: str, persona_image_url: str) -> T
 def validate_persona_match(linkedin_candidates: list, persona: dict, threshold: float = 0.7) -> list:
     """
     Validate LinkedIn profile candidates against a persona image.
-    Currently disabled due to issues with image similarity.
+    
+    Candidate avatars are taken from the candidate's image_url when present and are
+    otherwise resolved in one batched Brightdata request. All avatars are then
+    compared with the persona image in one batch (see image_similarities).
     
     Args:
         linkedin_candidates: List of LinkedIn profile candidates
@@ -234,32 +604,50 @@ def validate_persona_match(linkedin_candidates: list, persona: dict, threshold:
         threshold: Minimum similarity score to consider a match (0-1)
         
     Returns:
-        List of candidates with default image similarity values
+        List of candidates with image_similarity, profile_image and image_match set
     """
-    # Skip image similarity check for now
-    print("Image similarity check is currently disabled")
-    
-    # Add default values to candidates
     for candidate in linkedin_candidates:
         candidate["image_similarity"] = 0.0
-        candidate["profile_image"] = None
+        candidate["profile_image"] = candidate.get("image_url")
         candidate["image_match"] = False
     
+    persona_image = persona.get("image") or persona.get("image_url")
+    if not persona_image:
+        print("No persona image provided, skipping image validation")
+        return linkedin_candidates
+    
+    unresolved = [
+        candidate["link"] for candidate in linkedin_candidates
+        if not candidate["profile_image"] and "linkedin.com/in/" in candidate.get("link", "")
+    ]
+    if unresolved:
+        avatars = resolve_linkedin_avatars(unresolved)
+        for candidate in linkedin_candidates:
+            if not candidate["profile_image"] and "linkedin.com/in/" in candidate.get("link", ""):
+                candidate["profile_image"] = avatars.get(linkedin_slug(candidate["link"]))
+    
+    similarities = image_similarities(
+        persona_image,
+        [candidate["profile_image"] for candidate in linkedin_candidates if candidate["profile_image"]],
+    )
+    for candidate in linkedin_candidates:
+        similarity = similarities.get(candidate["profile_image"]) if candidate["profile_image"] else None
+        if similarity is not None:
+            candidate["image_similarity"] = similarity
+            candidate["image_match"] = similarity >= threshold
+    
     return linkedin_candidates
 
 
 # Example usage
 if __name__ == "__main__":
-    print("Image similarity functionality is currently disabled.")
-    print("To test other functionality, you can use the following code:")
-    
-    # Example of how to use the disabled functionality
-    # linkedin_id = "https://www.linkedin.com/in/zhawtof/"
-    # persona_image = "https://drive.google.com/file/d/1G4nkXOR_f-RGKdXw0HJctVmVVcSU6VS2/view?usp=drive_link"
-    
-    # if os.environ.get("BRIGHTDATA_API_KEY"):
-    #     sim, linkedin_url = compare_linkedin_with_persona(linkedin_id, persona_image)
-    #     print(f"LinkedIn profile similarity: {sim:.4f}")
-    #     print(f"LinkedIn profile image URL: {linkedin_url}")
-    # else:
-    #     print("BRIGHTDATA_API_KEY not set in environment variables")
\ No newline at end of file
+    linkedin_id = "https://www.linkedin.com/in/zhawtof/"
+    persona_image = "https://drive.google.com/file/d/1G4nkXOR_f-RGKdXw0HJctVmVVcSU6VS2/view?usp=drive_link"
+    
+    print(f"Embedding backend: {'onnxruntime' if get_image_embedder() else 'perceptual fingerprints'}")
+    if os.environ.get("BRIGHTDATA_API_KEY"):
+        sim, linkedin_url = compare_linkedin_with_persona(linkedin_id, persona_image)
+        print(f"LinkedIn profile similarity: {sim:.4f}")
+        print(f"LinkedIn profile image URL: {linkedin_url}")
+    else:
+        print("BRIGHTDATA_API_KEY not set in environment variables")
@@ -0,0 +1,218 @@
+"""
+Scoring Instrumentation
+
+This module records per-scorer wall time, external call counts and cache hits for
+the scoring pipeline so slow rankings can be attributed to Gemini, Nominatim,
+social scraping or fuzzy matching.
+
+Metrics are collected into the ScoringMetrics active in the current context (see
+collect_metrics) and also added to process-wide totals. Batches of scored results
+can be summarised into latency histograms with aggregate_timings.
+"""
+
+import json
+import time
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Upper bounds (milliseconds) of the histogram buckets used by aggregate_timings
+HISTOGRAM_BUCKETS_MS = [1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")]
+
+_current_metrics = contextvars.ContextVar("scoring_metrics", default=None)
+
+# Process-wide counters, across all scoring runs
+_totals_lock = threading.Lock()
+_total_calls = Counter()
+_total_cache_hits = Counter()
+
+
+class ScoringMetrics:
+    """
+    Timings and counters collected while scoring a single candidate.
+    """
+
+    def __init__(self):
+        self.timings_ms: Dict[str, float] = {}
+        self.calls = Counter()
+        self.cache_hits = Counter()
+        self._lock = threading.Lock()
+
+    def add_timing(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.timings_ms[name] = self.timings_ms.get(name, 0.0) + elapsed_ms
+
+    def add_call(self, service: str, count: int = 1) -> None:
+        with self._lock:
+            self.calls[service] += count
+
+    def add_cache_hit(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            self.cache_hits[name] += count
+
+    def as_dict(self) -> Dict:
+        """Return the metrics in the shape used for a result's 'timings' section."""
+        with self._lock:
+            return {
+                "scorers_ms": {name: round(ms, 3) for name, ms in self.timings_ms.items()},
+                "total_ms": round(sum(self.timings_ms.values()), 3),
+                "external_calls": dict(self.calls),
+                "cache_hits": dict(self.cache_hits),
+            }
+
+
+@contextmanager
+def collect_metrics() -> Iterator[ScoringMetrics]:
+    """
+    Collect metrics for everything run inside the block (in this thread/task).
+
+    Yields:
+        ScoringMetrics: The collector that receives timings and counters
+    """
+    metrics = ScoringMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def current_metrics() -> Optional[ScoringMetrics]:
+    """Return the collector active in the current context, if any."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Measure the wall time of the block and attribute it to a scorer name.
+
+    Args:
+        name: Scorer or stage name, e.g. "semantic"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.add_timing(name, (time.perf_counter() - start) * 1000)
+
+
+def record_call(service: str, count: int = 1) -> None:
+    """
+    Count an external call (e.g. "gemini", "nominatim", "scrape:github").
+
+    Args:
+        service: Name of the external service
+        count: Number of calls to add
+    """
+    with _totals_lock:
+        _total_calls[service] += count
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add_call(service, count)
+
+
+def record_cache_hit(name: str, count: int = 1) -> None:
+    """
+    Count a cache hit that avoided recomputation or an external call.
+
+    Args:
+        name: Name of the cache, e.g. "score:semantic"
+        count: Number of hits to add
+    """
+    with _totals_lock:
+        _total_cache_hits[name] += count
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add_cache_hit(name, count)
+
+
+def get_totals() -> Dict[str, Dict[str, int]]:
+    """Return process-wide external call and cache hit counts."""
+    with _totals_lock:
+        return {"external_calls": dict(_total_calls), "cache_hits": dict(_total_cache_hits)}
+
+
+def reset_totals() -> None:
+    """Reset the process-wide counters."""
+    with _totals_lock:
+        _total_calls.clear()
+        _total_cache_hits.clear()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def aggregate_timings(results: List[Dict]) -> Dict:
+    """
+    Aggregate the 'timings' sections of a batch of scored results into histograms.
+
+    Args:
+        results: Scored candidates produced with include_timings=True
+
+    Returns:
+        Dict with per-scorer latency statistics and bucket counts, plus summed
+        external call and cache hit counts
+    """
+    samples: Dict[str, List[float]] = {}
+    calls = Counter()
+    cache_hits = Counter()
+
+    for result in results:
+        timings = result.get("timings")
+        if not timings:
+            continue
+        for name, ms in timings.get("scorers_ms", {}).items():
+            samples.setdefault(name, []).append(ms)
+        samples.setdefault("total", []).append(timings.get("total_ms", 0.0))
+        calls.update(timings.get("external_calls", {}))
+        cache_hits.update(timings.get("cache_hits", {}))
+
+    scorers = {}
+    for name, values in samples.items():
+        values = sorted(values)
+        buckets = []
+        for bound in HISTOGRAM_BUCKETS_MS:
+            label = "+Inf" if bound == float("inf") else str(bound)
+            buckets.append({"le_ms": label, "count": sum(1 for v in values if v <= bound)})
+        scorers[name] = {
+            "count": len(values),
+            "sum_ms": round(sum(values), 3),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(_percentile(values, 0.50), 3),
+            "p95_ms": round(_percentile(values, 0.95), 3),
+            "max_ms": round(values[-1], 3),
+            "buckets": buckets,
+        }
+
+    return {
+        "scorers": scorers,
+        "external_calls": dict(calls),
+        "cache_hits": dict(cache_hits),
+    }
+
+
+def export_histograms(results: List[Dict], path: Optional[str] = None) -> str:
+    """
+    Export the aggregated latency histograms of a batch as JSON.
+
+    Args:
+        results: Scored candidates produced with include_timings=True
+        path: Optional file to write the JSON to
+
+    Returns:
+        str: The JSON document
+    """
+    document = json.dumps(aggregate_timings(results), indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(document)
+    return document
@@ -0,0 +1,118 @@
+"""
+Tolerant JSON Parsing
+
+LLM responses are sometimes cut off by the output token limit, leaving an object
+with a half-written last field. Instead of discarding the whole response, this
+module scans the text once, remembers the last point at which every top-level field
+(or top-level array element) so far was complete, and closes the open container
+from there. A field cut off anywhere inside its value, including a half-written
+nested array or object, is dropped as a whole, so callers can tell exactly which
+fields are missing.
+"""
+
+import json
+from typing import Any, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence (```json ... ```) if present."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if "```" in text:
+            text = text[:text.rindex("```")]
+    return text.strip()
+
+
+def _repair(text: str) -> Optional[str]:
+    """Return text cut after the last complete top-level value, with the root closed."""
+    stack = []            # open containers: ["{", expecting_key] or ["["]
+    cut, cut_stack = 0, []
+    in_string = escaped = is_key = False
+    token_start = None
+
+    def mark(position):
+        # Only top-level values count; a nested value completing says nothing
+        # about whether the field containing it is complete
+        nonlocal cut, cut_stack
+        if len(stack) <= 1:
+            cut, cut_stack = position, [entry[0] for entry in stack]
+
+    def end_token(position):
+        nonlocal token_start
+        if token_start is not None:
+            try:
+                json.loads(text[token_start:position])
+                mark(position)
+            except ValueError:
+                pass
+            token_start = None
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not is_key:
+                    mark(i + 1)
+            continue
+
+        if char in ' \t\r\n,:}]':
+            end_token(i)
+        if char == '"':
+            in_string = True
+            is_key = bool(stack) and stack[-1][0] == "{" and stack[-1][1]
+        elif char == "{":
+            stack.append(["{", True])
+        elif char == "[":
+            stack.append(["["])
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            mark(i + 1)
+        elif char == ":":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = False
+        elif char == ",":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = True
+        elif not char.isspace() and token_start is None:
+            token_start = i
+    # A number or literal running into the end of the text may itself be cut off
+    # (e.g. 12 of 125), so it is dropped
+
+    if cut == 0:
+        return None
+    repaired = text[:cut].rstrip().rstrip(",")
+    return repaired + "".join(_CLOSERS[opener] for opener in reversed(cut_stack))
+
+
+def parse_partial_json(text: str) -> Tuple[Optional[Any], bool]:
+    """
+    Parse JSON, repairing output that was truncated.
+
+    Args:
+        text: JSON text, possibly inside a code fence and possibly cut off
+
+    Returns:
+        (value, complete): the parsed value (None if nothing could be recovered) and
+        whether the text parsed without repair
+    """
+    text = strip_code_fences(text)
+    try:
+        return json.loads(text), True
+    except ValueError:
+        pass
+    repaired = _repair(text)
+    if repaired is None:
+        return None, False
+    try:
+        return json.loads(repaired), False
+    except ValueError:
+        return None, False
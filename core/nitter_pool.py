@@ -0,0 +1,202 @@
+"""
+Nitter Instance Pool
+
+This module manages the Nitter mirrors used to scrape Twitter profiles without an
+API token. Public Nitter instances come and go, so instead of walking a fixed list
+in order (paying a full timeout for every dead mirror on every call), the pool:
+- keeps a health table per instance (success rate, smoothed latency, consecutive
+  failures), persisted in the SQLite cache so it survives restarts
+- sends hedged requests to the two healthiest instances at once and takes the
+  first valid response
+- temporarily ejects instances that keep failing, with exponential backoff
+
+A "user not found" page is a valid answer and counts as a success for the instance.
+Attempts cancelled locally (a TimeoutError from the rate limiter or the scrape
+deadline) say nothing about the instance and leave its health unchanged.
+"""
+
+import os
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.cache import SQLiteCache
+
+DEFAULT_INSTANCES = [
+    "https://nitter.net",
+    "https://nitter.unixfox.eu",
+    "https://nitter.42l.fr",
+    "https://nitter.pussthecat.org",
+    "https://nitter.nixnet.services",
+]
+
+# Number of instances raced per attempt
+HEDGE_WIDTH = 2
+
+# Worker threads for hedged requests; losing hedges keep a worker until they finish
+HEDGE_WORKERS = 16
+
+# Consecutive failures before an instance is ejected, and the first ejection period
+EJECT_AFTER_FAILURES = 3
+EJECT_SECONDS = 5 * 60
+MAX_EJECT_SECONDS = 6 * 60 * 60
+
+# Smoothing factor for the latency moving average, and the latency assumed for new instances
+LATENCY_ALPHA = 0.3
+DEFAULT_LATENCY = 2.0
+
+
+class NitterPool:
+    """
+    Health-tracked pool of Nitter instances.
+
+    Args:
+        instances: Base URLs of the instances (defaults to NITTER_INSTANCES in .env
+            as a comma-separated list, or DEFAULT_INSTANCES)
+        health_store: Cache used to persist the health table (defaults to the SQLite cache)
+    """
+
+    def __init__(self, instances: Optional[List[str]] = None, health_store=None):
+        if instances is None:
+            configured = os.environ.get("NITTER_INSTANCES")
+            instances = [i.strip() for i in configured.split(",") if i.strip()] if configured else DEFAULT_INSTANCES
+        self.instances = [instance.rstrip("/") for instance in instances]
+        self._store = health_store if health_store is not None else SQLiteCache(namespace="nitter_health")
+        self._lock = threading.Lock()
+        self._health: Dict[str, Dict] = {}
+        for instance in self.instances:
+            self._health[instance] = self._store.get(instance) or {
+                "successes": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "latency": DEFAULT_LATENCY,
+                "ejected_until": 0.0,
+            }
+        self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="nitter")
+
+    def health(self) -> Dict[str, Dict]:
+        """Return a snapshot of the health table."""
+        with self._lock:
+            return {instance: dict(stats) for instance, stats in self._health.items()}
+
+    @staticmethod
+    def _expected_cost(stats: Dict) -> float:
+        # Smoothed success rate, so new instances start at 0.5
+        success_rate = (stats["successes"] + 1) / (stats["successes"] + stats["failures"] + 2)
+        return stats["latency"] / success_rate
+
+    def ranked(self, include_ejected: bool = True) -> List[str]:
+        """
+        Return instances from healthiest to least healthy.
+        Ejected instances come last, soonest-to-return first.
+        """
+        now = time.time()
+        with self._lock:
+            live = [i for i in self.instances if self._health[i]["ejected_until"] <= now]
+            ejected = [i for i in self.instances if self._health[i]["ejected_until"] > now]
+            live.sort(key=lambda i: self._expected_cost(self._health[i]))
+            ejected.sort(key=lambda i: self._health[i]["ejected_until"])
+        return live + ejected if include_ejected else live
+
+    def record(self, instance: str, ok: bool, latency: float) -> None:
+        """
+        Record the outcome of a request to an instance.
+
+        Args:
+            instance: Instance base URL
+            ok: Whether the instance returned a valid response
+            latency: Request duration in seconds
+        """
+        with self._lock:
+            stats = self._health[instance]
+            if ok:
+                stats["successes"] += 1
+                stats["consecutive_failures"] = 0
+                stats["ejected_until"] = 0.0
+                stats["latency"] = (1 - LATENCY_ALPHA) * stats["latency"] + LATENCY_ALPHA * latency
+            else:
+                stats["failures"] += 1
+                stats["consecutive_failures"] += 1
+                excess = stats["consecutive_failures"] - EJECT_AFTER_FAILURES
+                if excess >= 0:
+                    period = min(MAX_EJECT_SECONDS, EJECT_SECONDS * (2 ** excess))
+                    stats["ejected_until"] = time.time() + period
+            snapshot = dict(stats)
+        self._store.set(instance, snapshot)
+
+    def _attempt(self, instance: str, path: str, get: Callable, validate: Callable[[str], bool],
+                 not_found: Callable) -> Tuple[Optional[str], Optional[str]]:
+        """Return (outcome, html), where outcome is "ok", "not_found" or None (failed)."""
+        start = time.monotonic()
+        outcome, html = None, None
+        try:
+            response = get(f"{instance}{path}")
+            if response.status_code == 200 and validate(response.text):
+                outcome, html = "ok", response.text
+            elif not_found(response):
+                outcome = "not_found"
+        except TimeoutError:
+            # Cancelled locally by the rate limiter or the scrape deadline
+            return None, None
+        except Exception:
+            pass
+        self.record(instance, outcome is not None, time.monotonic() - start)
+        return outcome, html
+
+    def fetch(self, path: str, get: Callable, validate: Callable[[str], bool],
+              max_attempts: Optional[int] = None,
+              not_found: Optional[Callable] = None) -> Optional[Tuple[str, str]]:
+        """
+        Fetch a path from the healthiest instances, racing HEDGE_WIDTH at a time.
+
+        Args:
+            path: Path to request, e.g. "/username"
+            get: Function that performs a GET for a full URL and returns a response
+            validate: Returns True if a response body contains the expected data
+            max_attempts: Maximum number of instances to try (defaults to all)
+            not_found: Returns True if a response says the requested resource does not
+                exist (defaults to a 404 status)
+
+        Returns:
+            (instance, html) of the first valid response, or None if no instance succeeded
+            or an instance reported that the resource does not exist
+        """
+        if not_found is None:
+            not_found = lambda response: response.status_code == 404
+        # Skip ejected instances; if every instance is ejected, probe the one due back first
+        candidates = self.ranked(include_ejected=False)[:max_attempts] or self.ranked()[:1]
+        for start in range(0, len(candidates), HEDGE_WIDTH):
+            batch = candidates[start:start + HEDGE_WIDTH]
+            # Run each hedge in a copy of the caller's context (e.g. its scrape deadline)
+            futures = {
+                self._executor.submit(contextvars.copy_context().run, self._attempt,
+                                      instance, path, get, validate, not_found): instance
+                for instance in batch
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome, html = future.result()
+                    # Losing hedges finish in the background and still update the health table
+                    if outcome == "ok":
+                        return futures[future], html
+                    if outcome == "not_found":
+                        return None
+        return None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_nitter_pool() -> NitterPool:
+    """Return the shared NitterPool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = NitterPool()
+    return _pool
@@ -8,37 +8,90 @@ industry matching, location proximity, social profile matching, and image simila
 
 import os
 import re
+import sys
 import json
-import math
-from typing import Dict, List, Optional, Tuple, Union
 import logging
-import google.generativeai as genai
-from dotenv import load_dotenv
+import threading
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 
 from fuzzywuzzy import fuzz
-import geopy.distance
-from timezonefinder import TimezoneFinder
-import pytz
-from datetime import datetime
-import requests
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core.social_scraper import scrape_social_profiles, enrich_persona_with_social_data
 
-# Load environment variables
-load_dotenv()
+# Allow running this file directly as a script from the repository root
+if __name__ == "__main__" and not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.score_cache import DegradedScore, ScoreCache
+from core.instrumentation import collect_metrics, timed, record_call
+from core.single_flight import get_single_flight
+from core import gemini_client
+
+# Gemini model used for semantic scoring
+SEMANTIC_MODEL = "gemini-2.0-flash"
 
-# Initialize Gemini API
-try:
-    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-    gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-except Exception as e:
-    logging.warning(f"Could not initialize Gemini API: {e}")
-    gemini_model = None
+# Fixed instant at which timezone offsets are compared. Standard (non-DST) offsets
+# at a fixed instant keep location scores deterministic, so cached scores do not
+# drift when clocks change.
+TIMEZONE_REFERENCE = datetime(2024, 1, 15, 12, 0)
+
+# Heavy clients (Gemini, TimezoneFinder polygons, Nominatim) are created on first use
+# so importing this module stays fast for the CLI, the Streamlit app and workers.
+_lazy_lock = threading.Lock()
+_timezone_finder = None
+_geolocator = None
+
+def get_gemini_model():
+    """
+    Return the shared Gemini model used for semantic scoring (see core.gemini_client).
+    
+    Returns:
+        The Gemini GenerativeModel, or None if it could not be initialized
+    """
+    return gemini_client.get_model(SEMANTIC_MODEL)
 
-# Initialize TimezoneFinder for location scoring
-tf = TimezoneFinder()
+def get_timezone_finder():
+    """
+    Return the shared TimezoneFinder, loading its polygon data on first use.
+    
+    Returns:
+        TimezoneFinder: The timezone lookup instance
+    """
+    global _timezone_finder
+    if _timezone_finder is None:
+        with _lazy_lock:
+            if _timezone_finder is None:
+                from timezonefinder import TimezoneFinder
+                _timezone_finder = TimezoneFinder()
+    return _timezone_finder
+
+def get_geolocator():
+    """
+    Return the shared Nominatim geocoder, creating it on first use.
+    
+    Returns:
+        Nominatim: The geocoder instance
+    """
+    global _geolocator
+    if _geolocator is None:
+        with _lazy_lock:
+            if _geolocator is None:
+                from geopy.geocoders import Nominatim
+                _geolocator = Nominatim(user_agent="linkedin_profile_finder")
+    return _geolocator
+
+def _geocode(geolocator, location: str):
+    """Geocode a location, sharing the request with identical concurrent lookups."""
+    def geocode():
+        record_call("nominatim")
+        return geolocator.geocode(location)
+    return get_single_flight("nominatim").do(location, geocode)
+
+def __getattr__(name):
+    # Backward compatibility for the former eagerly-initialized module globals
+    if name == 'gemini_model':
+        return get_gemini_model()
+    if name == 'tf':
+        return get_timezone_finder()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def compute_name_score(persona_name: str, candidate_name: str) -> float:
     """
@@ -84,11 +137,16 @@ def compute_semantic_score(persona_intro: str, candidate_intro: str) -> float:
         candidate_intro: The introduction text from the LinkedIn candidate
         
     Returns:
-        float: A score between 0 and 1 indicating semantic similarity
+        float: A score between 0 and 1 indicating semantic similarity (a DegradedScore
+        of 0.0 if Gemini is unavailable or fails, so it is not cached)
     """
-    if not persona_intro or not candidate_intro or not gemini_model:
+    if not persona_intro or not candidate_intro:
         return 0.0
     
+    gemini_model = get_gemini_model()
+    if not gemini_model:
+        return DegradedScore(0.0)
+    
     try:
         # Create a prompt for semantic similarity analysis
         prompt = f"""Compare the following two professional descriptions and provide a similarity score between 0 and 1.
@@ -97,8 +155,9 @@ def compute_semantic_score(persona_intro: str, candidate_intro: str) -> float:
         Description 1: {persona_intro}
         Description 2: {candidate_intro}"""
 
-        # Get response from Gemini
-        response = gemini_model.generate_content(prompt)
+        # Get response from Gemini (shared client: concurrency limit and retries on 429/5xx)
+        record_call("gemini")
+        response = gemini_client.generate_content(prompt, model_name=SEMANTIC_MODEL)
         
         # Extract the score from the response
         try:
@@ -108,11 +167,11 @@ def compute_semantic_score(persona_intro: str, candidate_intro: str) -> float:
             return score
         except ValueError:
             logging.error("Could not parse similarity score from Gemini response")
-            return 0.0
+            return DegradedScore(0.0)
             
     except Exception as e:
         logging.error(f"Error computing semantic score with Gemini: {e}")
-        return 0.0
+        return DegradedScore(0.0)
 
 def compute_industry_score(persona_industry: str, candidate_industry: str) -> float:
     """
@@ -142,6 +201,11 @@ def compute_industry_score(persona_industry: str, candidate_industry: str) -> fl
     
     return weighted_score
 
+def _standard_offset_hours(tz) -> float:
+    """Return a timezone's standard (DST-free) UTC offset in hours at TIMEZONE_REFERENCE."""
+    offset = tz.utcoffset(TIMEZONE_REFERENCE) - (tz.dst(TIMEZONE_REFERENCE) or timedelta(0))
+    return offset.total_seconds() / 3600
+
 def compute_location_score(persona_location: str, candidate_location: str, 
                           persona_timezone: Optional[str] = None) -> float:
     """
@@ -153,7 +217,8 @@ def compute_location_score(persona_location: str, candidate_location: str,
         persona_timezone: The timezone from the persona (optional)
         
     Returns:
-        float: A score between 0 and 1 indicating location similarity
+        float: A score between 0 and 1 indicating location similarity (a DegradedScore
+        if geocoding failed and only the text similarity was used)
     """
     if not persona_location or not candidate_location:
         return 0.0
@@ -167,12 +232,13 @@ def compute_location_score(persona_location: str, candidate_location: str,
     
     # Try to get more precise location matching with geopy
     location_match_score = 0.0
+    geocoding_failed = False
     try:
-        from geopy.geocoders import Nominatim
-        geolocator = Nominatim(user_agent="linkedin_profile_finder")
+        import geopy.distance
+        geolocator = get_geolocator()
         
-        persona_geo = geolocator.geocode(persona_location)
-        candidate_geo = geolocator.geocode(candidate_location)
+        persona_geo = _geocode(geolocator, persona_location)
+        candidate_geo = _geocode(geolocator, candidate_location)
         
         if persona_geo and candidate_geo:
             # Calculate distance in km
@@ -199,7 +265,8 @@ def compute_location_score(persona_location: str, candidate_location: str,
             if persona_timezone:
                 try:
                     # Get timezone for candidate location
-                    candidate_tz_name = tf.timezone_at(
+                    import pytz
+                    candidate_tz_name = get_timezone_finder().timezone_at(
                         lat=candidate_geo.latitude, 
                         lng=candidate_geo.longitude
                     )
@@ -208,10 +275,9 @@ def compute_location_score(persona_location: str, candidate_location: str,
                         candidate_tz = pytz.timezone(candidate_tz_name)
                         persona_tz = pytz.timezone(persona_timezone)
                         
-                        # Calculate time difference in hours
-                        now = datetime.now()
-                        candidate_offset = candidate_tz.utcoffset(now).total_seconds() / 3600
-                        persona_offset = persona_tz.utcoffset(now).total_seconds() / 3600
+                        # Calculate the difference between standard offsets in hours
+                        candidate_offset = _standard_offset_hours(candidate_tz)
+                        persona_offset = _standard_offset_hours(persona_tz)
                         
                         hour_diff = abs(candidate_offset - persona_offset)
                         
@@ -234,6 +300,7 @@ def compute_location_score(persona_location: str, candidate_location: str,
                 location_match_score = (location_match_score * 0.7) + (timezone_match * 0.3)
     except Exception as e:
         logging.warning(f"Error computing precise location match: {e}")
+        geocoding_failed = True
     
     # Combine text similarity and geolocation score (if available)
     if location_match_score > 0:
@@ -241,7 +308,8 @@ def compute_location_score(persona_location: str, candidate_location: str,
     else:
         final_score = text_similarity
     
-    return final_score
+    # A text-only fallback after a geocoding error is not cached
+    return DegradedScore(final_score) if geocoding_failed else final_score
 
 def extract_username_from_url(url: str) -> Optional[str]:
     """
@@ -292,7 +360,10 @@ def compute_social_score(persona_socials: List[Dict], candidate_socials: List[Di
     persona_urls = [profile.get('url', '') for profile in persona_socials if profile.get('url')]
     candidate_urls = [profile.get('url', '') for profile in candidate_socials if profile.get('url')]
     
+    from core.social_scraper import scrape_social_profiles
+    
     # Scrape detailed profile information
+    record_call("social_scrape", len(persona_urls) + len(candidate_urls))
     persona_profiles = scrape_social_profiles(persona_urls)
     candidate_profiles = scrape_social_profiles(candidate_urls)
     
@@ -379,17 +450,28 @@ def compute_image_score(persona_image_url: str, candidate_image_url: str) -> flo
     
     return 0.0  # Will be replaced by CLIP similarity in main.py
 
-def score_linkedin_candidate(persona: Dict, candidate: Dict) -> Dict:
+def score_linkedin_candidate(persona: Dict, candidate: Dict,
+                             cache: Optional[ScoreCache] = None,
+                             include_timings: bool = False) -> Dict:
     """
     Score a LinkedIn candidate against the persona using multiple scoring methods.
     
     Args:
         persona: The user persona dict
         candidate: The LinkedIn candidate dict
+        cache: Optional ScoreCache used to reuse previously computed component scores
+        include_timings: Add a 'timings' section with per-scorer wall time,
+            external call counts and cache hits
         
     Returns:
         Dict: A dictionary with individual scores and confidence score
     """
+    if include_timings:
+        with collect_metrics() as metrics:
+            result = score_linkedin_candidate(persona, candidate, cache=cache)
+        result['timings'] = metrics.as_dict()
+        return result
+    
     # Extract relevant fields from persona and candidate
     persona_name = persona.get('name', '')
     candidate_name = candidate.get('title', '')  # LinkedIn search result title often has the name
@@ -429,13 +511,19 @@ def score_linkedin_candidate(persona: Dict, candidate: Dict) -> Dict:
     persona_image_url = persona.get('image_url', '')
     candidate_image_url = candidate.get('image_url', '')
     
+    def component_score(component, compute):
+        with timed(component):
+            if cache is None:
+                return compute()
+            return cache.get_or_compute(component, persona, candidate, compute)
+    
     # Compute individual scores
-    name_score = compute_name_score(persona_name, candidate_name)
-    semantic_score = compute_semantic_score(persona_intro, candidate_intro)
-    industry_score = compute_industry_score(persona_industry, candidate_industry)
-    location_score = compute_location_score(persona_location, candidate_location, persona_timezone)
-    social_score = compute_social_score(persona_socials, candidate_socials)
-    image_score = compute_image_score(persona_image_url, candidate_image_url)
+    name_score = component_score('name', lambda: compute_name_score(persona_name, candidate_name))
+    semantic_score = component_score('semantic', lambda: compute_semantic_score(persona_intro, candidate_intro))
+    industry_score = component_score('industry', lambda: compute_industry_score(persona_industry, candidate_industry))
+    location_score = component_score('location', lambda: compute_location_score(persona_location, candidate_location, persona_timezone))
+    social_score = component_score('social', lambda: compute_social_score(persona_socials, candidate_socials))
+    image_score = component_score('image', lambda: compute_image_score(persona_image_url, candidate_image_url))
     
     # Calculate the confidence score
     confidence_score = (
@@ -474,13 +562,18 @@ def score_linkedin_candidate(persona: Dict, candidate: Dict) -> Dict:
     
     return result
 
-def rank_linkedin_candidates(persona: Dict, candidates: List[Dict]) -> List[Dict]:
+def rank_linkedin_candidates(persona: Dict, candidates: List[Dict],
+                             cache: Optional[ScoreCache] = None,
+                             include_timings: bool = False) -> List[Dict]:
     """
     Score and rank LinkedIn candidates based on similarity to a persona.
     
     Args:
         persona: Dictionary containing persona information
         candidates: List of LinkedIn candidate profiles to score
+        cache: Optional ScoreCache shared across reruns for the same persona
+        include_timings: Add a 'timings' section to each result
+            (see core.instrumentation.aggregate_timings for batch histograms)
         
     Returns:
         List of scored and ranked candidates
@@ -488,7 +581,9 @@ def rank_linkedin_candidates(persona: Dict, candidates: List[Dict]) -> List[Dict
     # Score each candidate
     scored_candidates = []
     for candidate in candidates:
-        scored_candidate = score_linkedin_candidate(persona, candidate)
+        scored_candidate = score_linkedin_candidate(
+            persona, candidate, cache=cache, include_timings=include_timings
+        )
         scored_candidates.append(scored_candidate)
     
     # Sort by confidence score in descending order
@@ -0,0 +1,152 @@
+"""
+Social Profile Store
+
+This module keeps scraped social profiles on disk, keyed by (platform, canonical
+username), so enriching or scoring the same persona twice does not scrape the same
+profiles twice. It is backed by SQLiteCache (SQLite in WAL mode), so several worker
+processes can read it concurrently.
+
+Each platform has its own freshness TTL. Entries older than that are still served
+for a while (stale-while-revalidate) while a background thread refreshes them;
+only entries past MAX_STALE_SECONDS count as misses.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.cache import SQLiteCache
+
+# Seconds a stored profile is considered fresh, per platform
+PLATFORM_TTLS = {
+    "twitter": 24 * 60 * 60,
+    "github": 24 * 60 * 60,
+    "bluesky": 12 * 60 * 60,
+}
+DEFAULT_TTL = 24 * 60 * 60
+
+# How long past its TTL a stale profile may still be served while it is refreshed
+MAX_STALE_SECONDS = 7 * 24 * 60 * 60
+
+# Worker threads for background refreshes
+REFRESH_WORKERS = 2
+
+Job = Tuple[str, str]
+
+
+def canonical_username(platform: str, username: str) -> str:
+    """Return the canonical form of a username (no @, lower-cased; DIDs unchanged)."""
+    username = username.strip().lstrip("@")
+    if platform == "bluesky" and username.startswith("did:"):
+        return username
+    return username.lower()
+
+
+def has_profile_data(profile: Dict[str, Any]) -> bool:
+    """Return True if a scraped profile contains data worth storing."""
+    if profile.get("timed_out"):
+        return False
+    return any(
+        profile.get(field) is not None
+        for field in ("display_name", "bio", "location", "followers_count", "profile_image")
+    )
+
+
+class ProfileStore:
+    """
+    Persistent store of scraped profiles with stale-while-revalidate reads.
+
+    Args:
+        cache: Backing cache (defaults to the SQLite cache)
+        ttls: Overrides for PLATFORM_TTLS
+    """
+
+    def __init__(self, cache=None, ttls: Optional[Dict[str, float]] = None):
+        self.cache = cache if cache is not None else SQLiteCache(namespace="social_profiles")
+        self.ttls = dict(PLATFORM_TTLS)
+        self.ttls.update(ttls or {})
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="profile-refresh")
+
+    @staticmethod
+    def _key(platform: str, username: str) -> str:
+        return f"{platform}:{canonical_username(platform, username)}"
+
+    def ttl(self, platform: str) -> float:
+        """Return the freshness TTL for a platform."""
+        return self.ttls.get(platform, DEFAULT_TTL)
+
+    def put(self, platform: str, username: str, profile: Dict[str, Any]) -> None:
+        """Store a scraped profile (profiles without data are not stored)."""
+        if not has_profile_data(profile):
+            return
+        self.cache.set(
+            self._key(platform, username),
+            {"profile": profile, "fetched_at": time.time()},
+            ttl=self.ttl(platform) + MAX_STALE_SECONDS,
+        )
+
+    def lookup(self, jobs: Iterable[Job]) -> Tuple[Dict[Job, Dict[str, Any]], List[Job]]:
+        """
+        Look up (platform, username) jobs.
+
+        Returns:
+            (profiles, stale): stored profiles for every job found, and the jobs among
+            them whose profile is past its TTL and should be refreshed
+        """
+        profiles = {}
+        stale = []
+        now = time.time()
+        for platform, username in jobs:
+            entry = self.cache.get(self._key(platform, username))
+            if entry is None:
+                continue
+            profiles[(platform, username)] = entry["profile"]
+            if now - entry["fetched_at"] > self.ttl(platform):
+                stale.append((platform, username))
+        return profiles, stale
+
+    def refresh_in_background(self, jobs: List[Job],
+                              scrape: Callable[[List[Job]], Dict[Job, Dict[str, Any]]]) -> None:
+        """
+        Re-scrape stale jobs on a background thread and store the results.
+        Jobs already being refreshed are skipped.
+
+        Args:
+            jobs: (platform, username) jobs to refresh
+            scrape: Function that scrapes jobs and returns {job: profile}
+        """
+        with self._lock:
+            keys = {self._key(*job): job for job in jobs}
+            keys = {key: job for key, job in keys.items() if key not in self._refreshing}
+            self._refreshing.update(keys)
+        if not keys:
+            return
+
+        def refresh():
+            try:
+                for (platform, username), profile in scrape(list(keys.values())).items():
+                    self.put(platform, username, profile)
+            except Exception as e:
+                print(f"Error refreshing stored social profiles: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(keys)
+
+        self._executor.submit(refresh)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Return the shared ProfileStore, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProfileStore()
+    return _store
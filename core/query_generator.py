@@ -4,6 +4,8 @@ from typing import Dict, List, Any, Set, Tuple
 from nameparser import HumanName
 from serpapi import GoogleSearch
 
+from core.single_flight import get_single_flight
+
 # Import our name expansion module if available
 try:
     from core.name_expansion import expand_name_from_initial
@@ -289,21 +291,21 @@ def generate_search_queries(persona: Dict[str, Any]) -> List[str]:
     # Return only the query strings, not their scores
     return [query for query, _ in ranked_queries]
 
-def search_linkedin_profiles(persona, max_results=5):
+def iter_linkedin_profiles(persona, max_results=5):
     """
-    Search for LinkedIn profiles using generated queries.
-    This is a helper function to demonstrate usage of the query generator.
+    Yield LinkedIn profile candidates as soon as each search response arrives.
+    Lets callers start scoring before every query has been run.
     
     Args:
         persona: Dictionary containing person information
-        max_results: Maximum number of results to return
+        max_results: Maximum number of results to yield
         
-    Returns:
-        List of dictionaries containing LinkedIn profile information
+    Yields:
+        Dictionaries containing LinkedIn profile information
     """
     queries = generate_search_queries(persona)
     seen = set()
-    candidates = []
+    found = 0
     
     # Get SERPAPI API key from environment variables
     api_key = os.environ.get("SERPAPI_API_KEY")
@@ -318,23 +320,35 @@ def search_linkedin_profiles(persona, max_results=5):
             "num": max_results
         }
 
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        # Identical concurrent searches (e.g. from several sessions) share one request
+        results = get_single_flight("serpapi").do(
+            (query, max_results), lambda: GoogleSearch(params).get_dict()
+        )
         for result in results.get("organic_results", []):
             link = result.get("link", "")
             snippet = result.get("snippet", "")
             if "linkedin.com/in/" in link and link not in seen:
-                candidates.append({
+                seen.add(link)
+                found += 1
+                yield {
                     "link": link,
                     "title": result.get("title"),
                     "snippet": snippet
-                })
-                seen.add(link)
+                }
 
-            if len(candidates) >= max_results:
-                break
-
-        if len(candidates) >= max_results:
-            break
+            if found >= max_results:
+                return
 
-    return candidates
\ No newline at end of file
+def search_linkedin_profiles(persona, max_results=5):
+    """
+    Search for LinkedIn profiles using generated queries.
+    This is a helper function to demonstrate usage of the query generator.
+    
+    Args:
+        persona: Dictionary containing person information
+        max_results: Maximum number of results to return
+        
+    Returns:
+        List of dictionaries containing LinkedIn profile information
+    """
+    return list(iter_linkedin_profiles(persona, max_results=max_results))
@@ -0,0 +1,253 @@
+"""
+Per-Host Rate Limiting
+
+This module provides token-bucket rate limiting with one bucket per host, so a
+request to GitHub never delays a request to Bluesky. Limits are configured per
+platform (GitHub authenticated/unauthenticated, Twitter API, Bluesky, Nitter) and
+adapt to the server's own signals: Retry-After pauses the host, and
+X-RateLimit-Remaining/X-RateLimit-Reset cap the local budget at what the server
+says is left.
+
+Buckets hand out reservations under a short lock and never sleep while holding
+it, so the same limiter can be shared by worker threads (acquire) and asyncio
+tasks (acquire_async).
+"""
+
+import os
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# Requests per minute and burst size for each platform. GitHub allows 60 requests
+# per hour without a token and 5000 per hour with one; the Twitter v2 user lookup
+# allows 300 requests per 15 minutes; the Bluesky AppView allows 3000 per 5 minutes;
+# People Data Labs bulk calls (up to 100 people each) are kept to 10 per minute.
+PLATFORM_LIMITS: Dict[str, Tuple[float, int]] = {
+    "github": (1.0, 10),
+    "github_authenticated": (80.0, 20),
+    "github_html": (20.0, 5),
+    "twitter_api": (20.0, 5),
+    "bluesky": (300.0, 20),
+    "pdl": (10.0, 2),
+    "nitter": (20.0, 3),
+    "default": (20.0, 3),
+}
+
+# Hosts that map to a platform; everything else uses the "default" limit
+HOST_PLATFORMS = {
+    "api.github.com": "github",
+    "github.com": "github_html",
+    "api.twitter.com": "twitter_api",
+    "api.x.com": "twitter_api",
+    "bsky.social": "bluesky",
+    "public.api.bsky.app": "bluesky",
+    "bsky.app": "bluesky",
+    "api.peopledatalabs.com": "pdl",
+}
+
+# Longest pause honored from a Retry-After or rate-limit reset header
+MAX_BACKOFF_SECONDS = 15 * 60
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds from now."""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _header(headers, *names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        per_minute: Sustained requests per minute
+        burst: Maximum number of requests allowed back to back
+    """
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a token, going into debt if none is available.
+
+        Args:
+            max_wait: Give up instead of reserving if the wait would be longer
+
+        Returns:
+            float: Seconds the caller must wait before sending its request,
+            or None if that would exceed max_wait (no token is taken)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max((1 - self.tokens) / self.rate if self.tokens < 1 else 0.0, self.blocked_until - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket for the given number of seconds (e.g. after a 429)."""
+        seconds = min(max(0.0, seconds), MAX_BACKOFF_SECONDS)
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def limit_remaining(self, remaining: int) -> None:
+        """Cap the available tokens at the number of requests the server says are left."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remaining))
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Block the calling thread until a request may be sent.
+
+        Returns:
+            bool: False if the wait would exceed max_wait (the caller should skip the request)
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait (without blocking the event loop) until a request may be sent.
+
+        Returns:
+            bool: False if the wait would exceed max_wait (the caller should skip the request)
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def update(self, response) -> None:
+        """
+        Adapt the bucket to the rate-limit headers of a response.
+
+        Args:
+            response: A requests.Response (or any object with headers and status_code)
+        """
+        headers = response.headers
+
+        retry_after = _header(headers, "Retry-After")
+        if retry_after is not None and response.status_code in (429, 503):
+            seconds = _parse_retry_after(retry_after)
+            if seconds is not None:
+                self.pause(seconds)
+
+        remaining = _header(headers, "X-RateLimit-Remaining", "x-rate-limit-remaining", "RateLimit-Remaining")
+        if remaining is None or not remaining.strip().isdigit():
+            return
+        remaining = int(remaining)
+        self.limit_remaining(remaining)
+
+        if remaining == 0 or response.status_code == 429:
+            reset = _header(headers, "X-RateLimit-Reset", "x-rate-limit-reset", "RateLimit-Reset")
+            if reset and reset.strip().isdigit():
+                # Epoch seconds on GitHub, Twitter and Bluesky
+                self.pause(int(reset) - time.time())
+
+
+class RateLimiter:
+    """
+    Collection of per-host token buckets.
+
+    Args:
+        limits: Overrides for PLATFORM_LIMITS, as platform -> (per_minute, burst)
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.limits = dict(PLATFORM_LIMITS)
+        self.limits.update(limits or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def platform_for(host: str) -> str:
+        """Return the platform whose limit applies to a host."""
+        host = host.lower()
+        platform = HOST_PLATFORMS.get(host)
+        if platform == "github" and os.environ.get("GITHUB_TOKEN"):
+            return "github_authenticated"
+        if platform:
+            return platform
+        if "nitter" in host:
+            return "nitter"
+        return "default"
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Return the bucket for a URL's host, creating it on first use."""
+        host = urlparse(url).netloc.lower() or url.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    per_minute, burst = self.limits.get(self.platform_for(host), self.limits["default"])
+                    bucket = TokenBucket(per_minute, burst)
+                    self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str, max_wait: Optional[float] = None) -> bool:
+        """Block until a request to url's host is allowed (see TokenBucket.acquire)."""
+        return self.bucket(url).acquire(max_wait)
+
+    async def acquire_async(self, url: str, max_wait: Optional[float] = None) -> bool:
+        """Wait asynchronously until a request to url's host is allowed (see TokenBucket.acquire_async)."""
+        return await self.bucket(url).acquire_async(max_wait)
+
+    def update(self, url: str, response) -> None:
+        """
+        Adapt the host's bucket to the rate-limit headers of a response.
+
+        Args:
+            url: The requested URL
+            response: A requests.Response (or any object with headers and status_code)
+        """
+        self.bucket(url).update(response)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the shared RateLimiter, creating it on first use."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
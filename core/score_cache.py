@@ -0,0 +1,179 @@
+"""
+Score Cache
+
+This module caches the component scores computed by core.profile_scoring so that
+re-ranking the same persona (e.g. after changing max_results or rerunning a batch)
+does not repeat paid Gemini and geocoding calls.
+
+Each component score is keyed on a stable hash of only the persona and candidate
+fields that component reads, the candidate link and the scorer version. Editing
+one persona field therefore only invalidates the component scores that depend on it.
+"""
+
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.cache import MemoryCache, SQLiteCache
+from core.instrumentation import record_cache_hit
+
+# Bump when any scoring function changes so stale scores are not reused
+SCORER_VERSION = "2"
+
+# Default time-to-live of scores in the on-disk cache
+DEFAULT_DISK_TTL = 30 * 24 * 60 * 60
+
+# Persona and candidate fields read by each component score
+COMPONENT_FIELDS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "name": (("name",), ("title",)),
+    "semantic": (("intro",), ("snippet",)),
+    "industry": (("company_industry",), ("snippet",)),
+    "location": (("location", "timezone"), ("snippet",)),
+    "social": (("social_profiles",), ()),
+    "image": (("image_url",), ("image_url",)),
+}
+
+
+def fingerprint(data: Any) -> str:
+    """
+    Compute a stable SHA-256 hash of JSON-serializable data.
+
+    Args:
+        data: Any JSON-serializable value
+
+    Returns:
+        str: Hex digest that does not depend on dict key order
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def persona_fingerprint(persona: Dict, fields: Tuple[str, ...]) -> str:
+    """
+    Hash the given scoring-relevant fields of a persona.
+
+    Args:
+        persona: The user persona dict
+        fields: Names of the persona fields to include
+
+    Returns:
+        str: Hex digest of the selected fields
+    """
+    return fingerprint({field: persona.get(field) for field in fields})
+
+
+def candidate_fingerprint(candidate: Dict, fields: Tuple[str, ...]) -> str:
+    """
+    Hash a candidate's link together with the given fields (typically the snippet).
+
+    Args:
+        candidate: The LinkedIn candidate dict
+        fields: Names of the candidate fields to include
+
+    Returns:
+        str: Hex digest of the link and selected fields
+    """
+    data = {field: candidate.get(field) for field in fields}
+    data["link"] = candidate.get("link", "")
+    return fingerprint(data)
+
+
+class DegradedScore(float):
+    """
+    A fallback score returned when a scorer could not do its real work (e.g. Gemini
+    unavailable or rate limited, geocoding failed). It behaves like a float, but
+    ScoreCache does not store it, so the score is recomputed on the next run.
+    """
+
+
+class ScoreCache:
+    """
+    Component-level cache for candidate scores.
+
+    Works with any backend exposing get(key, default) and set(key, value, ttl),
+    such as core.cache.MemoryCache or core.cache.SQLiteCache.
+    """
+
+    def __init__(self, backend=None, ttl: Optional[float] = None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def component_key(self, component: str, persona: Dict, candidate: Dict) -> str:
+        """
+        Build the cache key for one component score of a persona/candidate pair.
+
+        Args:
+            component: Component name (one of COMPONENT_FIELDS)
+            persona: The user persona dict
+            candidate: The LinkedIn candidate dict
+
+        Returns:
+            str: Cache key
+        """
+        persona_fields, candidate_fields = COMPONENT_FIELDS[component]
+        return ":".join([
+            SCORER_VERSION,
+            component,
+            persona_fingerprint(persona, persona_fields),
+            candidate_fingerprint(candidate, candidate_fields),
+        ])
+
+    def get_or_compute(self, component: str, persona: Dict, candidate: Dict,
+                       compute: Callable[[], float]) -> float:
+        """
+        Return the cached component score or compute and store it.
+        DegradedScore results are returned but not stored.
+
+        Args:
+            component: Component name (one of COMPONENT_FIELDS)
+            persona: The user persona dict
+            candidate: The LinkedIn candidate dict
+            compute: Zero-argument function computing the score on a miss
+
+        Returns:
+            float: The component score
+        """
+        key = self.component_key(component, persona, candidate)
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            record_cache_hit(f"score:{component}")
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        score = compute()
+        if not isinstance(score, DegradedScore):
+            self.backend.set(key, score, ttl=self.ttl)
+        return score
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def create_score_cache(backend: str = "memory", path: Optional[str] = None,
+                       ttl: Optional[float] = None) -> ScoreCache:
+    """
+    Create a ScoreCache with an in-memory or on-disk backend.
+
+    Args:
+        backend: "memory" or "disk"
+        path: SQLite file for the disk backend (defaults to the shared cache file)
+        ttl: Optional time-to-live in seconds for cached scores (the disk backend
+            defaults to DEFAULT_DISK_TTL)
+
+    Returns:
+        ScoreCache: The configured score cache
+    """
+    if backend == "memory":
+        return ScoreCache(MemoryCache(), ttl=ttl)
+    if backend == "disk":
+        return ScoreCache(SQLiteCache(path, namespace="scores"), ttl=ttl if ttl is not None else DEFAULT_DISK_TTL)
+    raise ValueError(f"Unknown score cache backend: {backend}")
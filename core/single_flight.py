@@ -0,0 +1,134 @@
+"""
+Request Coalescing (Single-Flight)
+
+Concurrent scoring runs and several Streamlit sessions often ask for the same
+external resource at the same moment: the same social profile, geocode string,
+SERP query or PDL person. This module lets identical concurrent calls share one
+in-flight request: the first caller for a key runs it, later callers for the same
+key wait for and receive its result (or exception). Nothing is cached once the
+call has finished; that is left to the caches.
+
+Each group keeps per-key counts of executed and coalesced calls, and coalesced
+calls are also reported to the scoring instrumentation as cache hits
+("coalesced:<group>").
+
+Results are shared between callers and must be treated as read-only.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from core.instrumentation import record_cache_hit
+
+# Keys with per-key counts kept per group (oldest keys are dropped first)
+MAX_TRACKED_KEYS = 10000
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Group of coalesced calls, keyed by caller-chosen keys.
+
+    Args:
+        name: Group name used in metrics, e.g. "nominatim"
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats: Dict[Hashable, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) unless a call for key is already in flight, in which
+        case wait for that call and return its result (or raise its exception).
+
+        Args:
+            key: Identity of the request
+            func: Function performing the request
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_TRACKED_KEYS:
+                    del self._stats[next(iter(self._stats))]
+                stats = self._stats[key] = {"executed": 0, "coalesced": 0}
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                stats["executed"] += 1
+            else:
+                stats["coalesced"] += 1
+
+        if not leader:
+            record_cache_hit(f"coalesced:{self.name}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Return executed/coalesced counts in total and per key.
+
+        Returns:
+            Dict with "executed", "coalesced" and "keys" ({key: {"executed", "coalesced"}})
+        """
+        with self._lock:
+            keys = {str(key): dict(stats) for key, stats in self._stats.items()}
+        return {
+            "executed": sum(stats["executed"] for stats in keys.values()),
+            "coalesced": sum(stats["coalesced"] for stats in keys.values()),
+            "keys": keys,
+        }
+
+    def reset_metrics(self) -> None:
+        """Clear the per-key counts."""
+        with self._lock:
+            self._stats.clear()
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the shared SingleFlight group with the given name, creating it on first use."""
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.get(name)
+            if group is None:
+                group = SingleFlight(name)
+                _groups[name] = group
+    return group
+
+
+def single_flight_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return the metrics of every group, keyed by group name."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.metrics() for name, group in groups.items()}
@@ -3,32 +3,167 @@ import os
 import requests
 import json
 import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse, parse_qs
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from core.bluesky_resolver import BlueskyResolver
+from core.github_resolver import GitHubResolver
+from core.html_stream import HTMLFieldMatcher, StreamedPage, read_html
+from core.http_client import get_session
+from core.instrumentation import record_call
+from core.nitter_pool import get_nitter_pool
+from core.profile_store import canonical_username, get_profile_store
+from core.rate_limiter import get_rate_limiter
+from core.single_flight import get_single_flight
+from core.twitter_resolver import TwitterUserBatcher, twitter_user_to_profile
+
+# Environment variables are read at call time; entry points (main.py, app.py)
+# load the .env file once at startup.
 
 # User agent to mimic a browser
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
-# Rate limiting parameters
-MAX_REQUESTS_PER_MINUTE = 20
-REQUEST_INTERVAL = 60 / MAX_REQUESTS_PER_MINUTE  # seconds between requests
-last_request_time = 0
+# Nitter page title, present on every valid profile page
+NITTER_DISPLAY_NAME_PATTERN = r'<title>(.*?)\(@.*?\)</title>'
 
-def rate_limit():
-    """Simple rate limiting mechanism"""
-    global last_request_time
-    current_time = time.time()
-    time_since_last_request = current_time - last_request_time
-    
-    if time_since_last_request < REQUEST_INTERVAL:
-        sleep_time = REQUEST_INTERVAL - time_since_last_request
-        time.sleep(sleep_time)
-    
-    last_request_time = time.time()
+# Fields read from the HTML fallbacks (group 1 is the value). Pages are streamed;
+# once the required fields have matched, the others get a bounded amount of extra
+# reading (see core.html_stream.read_html).
+NITTER_HTML_PATTERNS = {
+    "display_name": NITTER_DISPLAY_NAME_PATTERN,
+    "bio": re.compile(r'<div class="profile-bio">(.*?)</div>', re.DOTALL),
+    "location": r'<div class="profile-location">(.*?)</div>',
+    "followers": r'<span class="profile-stat-header">Followers</span>\s*<span class="profile-stat-num">(.*?)</span>',
+    "following": r'<span class="profile-stat-header">Following</span>\s*<span class="profile-stat-num">(.*?)</span>',
+}
+TWITTER_HTML_PATTERNS = {
+    "display_name": r'<meta name="twitter:title" content="(.*?)(?:\(@.*?\))?"/>',
+    "bio": r'<meta name="description" content="(.*?)"/>',
+}
+GITHUB_HTML_PATTERNS = {
+    "display_name": r'<span class="p-name vcard-fullname d-block overflow-hidden".*?>(.*?)</span>',
+    "bio": re.compile(r'<div class="p-note user-profile-bio mb-3.*?>\s*<div.*?>(.*?)</div>', re.DOTALL),
+    "location": r'<li.*?><svg.*?octicon-location.*?>\s*<span class="p-label">(.*?)</span>',
+    "company": r'<li.*?><svg.*?octicon-organization.*?>\s*<span class="p-org">(.*?)</span>',
+}
+BLUESKY_HTML_PATTERNS = {
+    "display_name": r'<title>(.*?) \(.*?\) - Bluesky</title>',
+    "bio": r'<meta name="description" content="(.*?)"/>',
+}
+# Fields every HTML fallback needs; the rest are optional
+HTML_REQUIRED_FIELDS = ("display_name",)
+
+# Overall time budget for scraping one persona's social profiles (seconds)
+SCRAPE_DEADLINE = 20.0
+SCRAPE_WORKERS = 8
+
+# Deadline (time.monotonic()) of the scrape the current thread is working for
+_scrape_deadline = contextvars.ContextVar("scrape_deadline", default=None)
+
+def rate_limit(url: str) -> None:
+    """Wait until the per-host rate limit allows a request to url"""
+    get_rate_limiter().acquire(url)
+
+def _remaining_time() -> Optional[float]:
+    deadline = _scrape_deadline.get()
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Scrape deadline reached")
+    return remaining
+
+def rate_limited_request(method: str, url: str, headers: Dict[str, str], timeout: float = 10,
+                         **kwargs) -> requests.Response:
+    """
+    Send a request on the pooled session under its host's rate limit, adapting the
+    limit to the response headers. Inside scrape_social_profiles, waits and timeouts
+    are bounded by the scrape deadline (TimeoutError once it has passed, including
+    a request timeout shortened by the deadline).
+    """
+    limiter = get_rate_limiter()
+    if not limiter.acquire(url, max_wait=_remaining_time()):
+        raise TimeoutError(f"Rate limit for {urlparse(url).netloc} would exceed the scrape deadline")
+    remaining = _remaining_time()
+    cut_short = remaining is not None and remaining < timeout
+    if cut_short:
+        timeout = remaining
+    try:
+        response = get_session().request(method, url, headers=headers, timeout=timeout, **kwargs)
+    except requests.Timeout as e:
+        if cut_short:
+            # The scrape deadline, not the host, ended the request
+            raise TimeoutError(f"Request to {urlparse(url).netloc} ran into the scrape deadline") from e
+        raise
+    limiter.update(url, response)
+    return response
+
+def rate_limited_get(url: str, headers: Dict[str, str], timeout: float = 10) -> requests.Response:
+    """GET a URL under its host's rate limit (see rate_limited_request)"""
+    return rate_limited_request("GET", url, headers, timeout)
+
+def rate_limited_fetch_html(url: str, patterns: Dict[str, Any]) -> StreamedPage:
+    """
+    Stream an HTML page under its host's rate limit, reading only until the field
+    patterns have matched or the byte cap is reached (see core.html_stream.read_html)
+    """
+    response = rate_limited_request("GET", url, {"User-Agent": USER_AGENT}, stream=True)
+    return read_html(response, patterns, required=HTML_REQUIRED_FIELDS)
+
+def _parse_stat_count(value: str) -> int:
+    """Convert a displayed count such as 1,234 / 5.6K / 1.2M to a number"""
+    if 'K' in value:
+        return int(float(value.replace('K', '')) * 1000)
+    if 'M' in value:
+        return int(float(value.replace('M', '')) * 1000000)
+    return int(value.replace(',', ''))
+
+_twitter_batcher = None
+_twitter_batcher_lock = threading.Lock()
+
+def get_twitter_batcher() -> TwitterUserBatcher:
+    """Return the shared Twitter lookup batcher, creating it on first use"""
+    global _twitter_batcher
+    if _twitter_batcher is None:
+        with _twitter_batcher_lock:
+            if _twitter_batcher is None:
+                def get(url):
+                    headers = {
+                        "Authorization": f"Bearer {os.environ.get('TWITTER_BEARER_TOKEN', '')}",
+                        "User-Agent": USER_AGENT
+                    }
+                    return rate_limited_get(url, headers)
+                _twitter_batcher = TwitterUserBatcher(get)
+    return _twitter_batcher
+
+_github_resolver = None
+_github_resolver_lock = threading.Lock()
+
+def get_github_resolver() -> GitHubResolver:
+    """Return the shared GitHub resolver, creating it on first use"""
+    global _github_resolver
+    if _github_resolver is None:
+        with _github_resolver_lock:
+            if _github_resolver is None:
+                def request(method, url, headers, **kwargs):
+                    return rate_limited_request(method, url, {"User-Agent": USER_AGENT, **headers}, **kwargs)
+                _github_resolver = GitHubResolver(request)
+    return _github_resolver
+
+_bluesky_resolver = None
+_bluesky_resolver_lock = threading.Lock()
+
+def get_bluesky_resolver() -> BlueskyResolver:
+    """Return the shared Bluesky resolver, creating it on first use"""
+    global _bluesky_resolver
+    if _bluesky_resolver is None:
+        with _bluesky_resolver_lock:
+            if _bluesky_resolver is None:
+                _bluesky_resolver = BlueskyResolver(lambda url: rate_limited_get(url, {"User-Agent": USER_AGENT}))
+    return _bluesky_resolver
 
 def extract_username_from_url(url: str, platform: str) -> Optional[str]:
     """Extract username from a social media URL"""
@@ -63,7 +198,7 @@ def extract_username_from_url(url: str, platform: str) -> Optional[str]:
     
     return None
 
-def scrape_twitter_profile(username: str) -> Dict[str, Any]:
+def scrape_twitter_profile(username: str, use_api: bool = True) -> Dict[str, Any]:
     """
     Scrape Twitter profile information using multiple methods.
     
@@ -72,10 +207,11 @@ def scrape_twitter_profile(username: str) -> Dict[str, Any]:
     2. Fallback to direct HTML scraping if available
     3. Public API endpoints if configured
     
+    Methods 1 and 2 are used when the API is not configured or use_api is False
+    (e.g. after a batched API lookup for the handle has just failed).
+    
     Returns a dictionary with profile information or empty values if unavailable.
     """
-    rate_limit()
-    
     profile_data = {
         "platform": "twitter",
         "username": username,
@@ -90,133 +226,62 @@ def scrape_twitter_profile(username: str) -> Dict[str, Any]:
     }
     
     # Check if Twitter API token is available
-    twitter_bearer_token = os.environ.get("TWITTER_BEARER_TOKEN")
-    
-    # Method 1: Try Nitter instances first if no API is available
-    if not twitter_bearer_token:
-        print(f"Twitter API key not available. Using Nitter fallback for {username}")
-        nitter_instances = [
-            "https://nitter.net",
-            "https://nitter.unixfox.eu",
-            "https://nitter.42l.fr",
-            "https://nitter.pussthecat.org",
-            "https://nitter.nixnet.services"
-        ]
-        
-        for instance in nitter_instances:
+    use_api = use_api and bool(os.environ.get("TWITTER_BEARER_TOKEN"))
+    
+    # Method 1: Try the healthiest Nitter instances first if the API is not used
+    if not use_api:
+        print(f"Twitter API not used. Using Nitter fallback for {username}")
+        result = get_nitter_pool().fetch(
+            f"/{username}",
+            get=lambda url: rate_limited_fetch_html(url, NITTER_HTML_PATTERNS),
+            validate=lambda html: re.search(NITTER_DISPLAY_NAME_PATTERN, html) is not None,
+        )
+        if result:
+            instance, html = result
+            print(f"Fetched Twitter profile for {username} from {instance}")
+            fields = HTMLFieldMatcher(NITTER_HTML_PATTERNS)
+            fields.feed(html)
             try:
-                url = f"{instance}/{username}"
-                headers = {"User-Agent": USER_AGENT}
-                response = requests.get(url, headers=headers, timeout=10)
-                
-                if response.status_code != 200:
-                    continue
-                    
-                # Simple HTML parsing to extract data
-                html = response.text
+                profile_data["display_name"] = fields.group("display_name")
                 
-                # Extract display name
-                display_name_match = re.search(r'<title>(.*?)\(@.*?\)</title>', html)
-                if display_name_match:
-                    profile_data["display_name"] = display_name_match.group(1).strip()
-                
-                # Extract bio
-                bio_match = re.search(r'<div class="profile-bio">(.*?)</div>', html, re.DOTALL)
-                if bio_match:
-                    bio = bio_match.group(1).strip()
+                bio = fields.group("bio")
+                if bio is not None:
                     # Clean HTML tags
-                    bio = re.sub(r'<[^>]+>', '', bio)
-                    profile_data["bio"] = bio
-                
-                # Extract location
-                location_match = re.search(r'<div class="profile-location">(.*?)</div>', html)
-                if location_match:
-                    profile_data["location"] = location_match.group(1).strip()
+                    profile_data["bio"] = re.sub(r'<[^>]+>', '', bio)
                 
-                # Extract follower count
-                followers_match = re.search(r'<span class="profile-stat-header">Followers</span>\s*<span class="profile-stat-num">(.*?)</span>', html)
-                if followers_match:
-                    followers_str = followers_match.group(1).strip()
-                    # Convert K/M to numbers
-                    if 'K' in followers_str:
-                        profile_data["followers_count"] = int(float(followers_str.replace('K', '')) * 1000)
-                    elif 'M' in followers_str:
-                        profile_data["followers_count"] = int(float(followers_str.replace('M', '')) * 1000000)
-                    else:
-                        profile_data["followers_count"] = int(followers_str.replace(',', ''))
+                profile_data["location"] = fields.group("location")
                 
-                # Extract following count
-                following_match = re.search(r'<span class="profile-stat-header">Following</span>\s*<span class="profile-stat-num">(.*?)</span>', html)
-                if following_match:
-                    following_str = following_match.group(1).strip()
-                    # Convert K/M to numbers
-                    if 'K' in following_str:
-                        profile_data["following_count"] = int(float(following_str.replace('K', '')) * 1000)
-                    elif 'M' in following_str:
-                        profile_data["following_count"] = int(float(following_str.replace('M', '')) * 1000000)
-                    else:
-                        profile_data["following_count"] = int(following_str.replace(',', ''))
-                
-                # If we got this far, we have some data, so break out of the loop
-                if profile_data["display_name"]:
-                    break
-                    
-            except Exception as e:
-                # Silently continue to the next instance
-                continue
+                # Convert K/M to numbers
+                if fields.group("followers"):
+                    profile_data["followers_count"] = _parse_stat_count(fields.group("followers"))
+                if fields.group("following"):
+                    profile_data["following_count"] = _parse_stat_count(fields.group("following"))
+            except ValueError as e:
+                print(f"Error parsing Nitter profile for {username}: {e}")
     
         # Method 2: Try direct HTML scraping (limited effectiveness due to Twitter's JS rendering)
         if not profile_data["display_name"]:
             try:
-                url = f"https://twitter.com/{username}"
-                headers = {"User-Agent": USER_AGENT}
-                response = requests.get(url, headers=headers, timeout=10)
+                page = rate_limited_fetch_html(f"https://twitter.com/{username}", TWITTER_HTML_PATTERNS)
                 
-                if response.status_code == 200:
-                    html = response.text
-                    
-                    # Try to extract name from meta tags or other static HTML elements
-                    display_name_match = re.search(r'<meta name="twitter:title" content="(.*?)(?:\(@.*?\))?"/>', html)
-                    if display_name_match:
-                        profile_data["display_name"] = display_name_match.group(1).strip()
-                    
-                    # Extract bio from meta description
-                    bio_match = re.search(r'<meta name="description" content="(.*?)"/>', html)
-                    if bio_match:
-                        profile_data["bio"] = bio_match.group(1).strip()
+                if page.status_code == 200:
+                    # Name from the twitter:title meta tag, bio from the meta description
+                    profile_data["display_name"] = page.fields.group("display_name")
+                    profile_data["bio"] = page.fields.group("bio")
             
             except Exception:
                 # Silent failure - move to next method
                 pass
     
     # Method 3: If available, try Twitter API v2 with bearer token
-    # This requires a developer account and proper authentication
-    if twitter_bearer_token and not profile_data["display_name"]:
+    # This requires a developer account and proper authentication. Lookups from
+    # concurrent callers are micro-batched into shared /2/users/by requests.
+    if use_api and not profile_data["display_name"]:
         try:
             print(f"Using Twitter API for {username}")
-            url = f"https://api.twitter.com/2/users/by/username/{username}?user.fields=description,location,public_metrics,profile_image_url"
-            headers = {
-                "Authorization": f"Bearer {twitter_bearer_token}",
-                "User-Agent": USER_AGENT
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "data" in data:
-                    user_data = data["data"]
-                    
-                    profile_data["display_name"] = user_data.get("name")
-                    profile_data["bio"] = user_data.get("description")
-                    profile_data["location"] = user_data.get("location")
-                    profile_data["profile_image"] = user_data.get("profile_image_url")
-                    
-                    if "public_metrics" in user_data:
-                        metrics = user_data["public_metrics"]
-                        profile_data["followers_count"] = metrics.get("followers_count")
-                        profile_data["following_count"] = metrics.get("following_count")
-                        profile_data["tweet_count"] = metrics.get("tweet_count")
+            users = get_twitter_batcher().lookup([username], timeout=_remaining_time())
+            if users.get(username.lower()):
+                profile_data.update(twitter_user_to_profile(username, users[username.lower()]))
         except Exception as e:
             print(f"Error using Twitter API: {e}")
     
@@ -229,8 +294,6 @@ def scrape_github_profile(username: str) -> Dict[str, Any]:
     The GitHub API allows a limited number of unauthenticated requests.
     This function tries the API first, then falls back to HTML scraping if needed.
     """
-    rate_limit()
-    
     profile_data = {
         "platform": "github",
         "username": username,
@@ -246,36 +309,17 @@ def scrape_github_profile(username: str) -> Dict[str, Any]:
         "blog": None
     }
     
-    # Method 1: Try GitHub API
+    # Method 1: Try GitHub API (cached, revalidated with the stored ETag)
     try:
-        # GitHub's public API endpoint for user data
-        url = f"https://api.github.com/users/{username}"
-        
-        # Set up headers
-        headers = {"User-Agent": USER_AGENT}
-        
         # Add token if available for higher rate limits
         github_token = os.environ.get("GITHUB_TOKEN")
-        if github_token:
-            headers["Authorization"] = f"token {github_token}"
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            profile_data["display_name"] = data.get("name")
-            profile_data["bio"] = data.get("bio")
-            profile_data["location"] = data.get("location")
-            profile_data["followers_count"] = data.get("followers")
-            profile_data["following_count"] = data.get("following")
-            profile_data["repo_count"] = data.get("public_repos")
-            profile_data["profile_image"] = data.get("avatar_url")
-            profile_data["company"] = data.get("company")
-            profile_data["blog"] = data.get("blog")
+        profile = get_github_resolver().fetch_rest(username, github_token)
+        if profile is not None:
+            profile_data.update(profile)
+            profile_data["username"] = username
         else:
             # If API fails, we'll try HTML scraping next
-            print(f"GitHub API returned status code {response.status_code}, trying HTML scraping")
+            print("GitHub API request failed, trying HTML scraping")
             
     except Exception as e:
         # If API fails, we'll try HTML scraping next
@@ -284,32 +328,13 @@ def scrape_github_profile(username: str) -> Dict[str, Any]:
     # Method 2: If API failed, try HTML scraping
     if not profile_data["display_name"]:
         try:
-            url = f"https://github.com/{username}"
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=10)
+            page = rate_limited_fetch_html(f"https://github.com/{username}", GITHUB_HTML_PATTERNS)
             
-            if response.status_code == 200:
-                html = response.text
-                
-                # Extract name
-                name_match = re.search(r'<span class="p-name vcard-fullname d-block overflow-hidden".*?>(.*?)</span>', html)
-                if name_match:
-                    profile_data["display_name"] = name_match.group(1).strip()
-                
-                # Extract bio
-                bio_match = re.search(r'<div class="p-note user-profile-bio mb-3.*?>\s*<div.*?>(.*?)</div>', html, re.DOTALL)
-                if bio_match:
-                    profile_data["bio"] = bio_match.group(1).strip()
-                
-                # Extract location
-                location_match = re.search(r'<li.*?><svg.*?octicon-location.*?>\s*<span class="p-label">(.*?)</span>', html)
-                if location_match:
-                    profile_data["location"] = location_match.group(1).strip()
-                
-                # Extract company
-                company_match = re.search(r'<li.*?><svg.*?octicon-organization.*?>\s*<span class="p-org">(.*?)</span>', html)
-                if company_match:
-                    profile_data["company"] = company_match.group(1).strip()
+            if page.status_code == 200:
+                # Name, bio, location and company from the profile sidebar
+                for field in ("display_name", "bio", "location", "company"):
+                    if page.fields.group(field) is not None:
+                        profile_data[field] = page.fields.group(field)
                 
         except Exception as e:
             print(f"Error with GitHub HTML scraping: {e}")
@@ -320,11 +345,9 @@ def scrape_bluesky_profile(identifier: str) -> Dict[str, Any]:
     """
     Scrape Bluesky profile information using Bluesky API
     
-    This function tries the public API first, then falls back to HTML scraping if needed.
-    The authenticated API would provide more data, but requires credentials.
+    This function tries the public AppView first (batched and cached through
+    BlueskyResolver), then the profile record, then falls back to HTML scraping.
     """
-    rate_limit()
-    
     profile_data = {
         "platform": "bluesky",
         "username": identifier,
@@ -337,51 +360,49 @@ def scrape_bluesky_profile(identifier: str) -> Dict[str, Any]:
         "url": f"https://bsky.app/profile/{identifier}"
     }
     
-    # Method 1: Try official API endpoint
-    try:
-        url = f"https://bsky.social/xrpc/com.atproto.repo.getRecord?repo={identifier}&collection=app.bsky.actor.profile&rkey=self"
-        
-        headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            profile_value = data.get("value", {})
-            
-            profile_data["display_name"] = profile_value.get("displayName")
-            profile_data["bio"] = profile_value.get("description")
-            
-            # For followers and following, we would need authenticated APIs
-            # This is just placeholder logic
-            
-            # Try to get the avatar URL if available
-            if "avatar" in profile_value:
-                profile_data["profile_image"] = profile_value.get("avatar")
-        else:
-            print(f"Bluesky API returned status code {response.status_code}")
-            
-    except Exception as e:
-        print(f"Error with Bluesky API: {e}")
+    # Method 1: Try the public AppView (cached; includes follower and post counts)
+    resolver = get_bluesky_resolver()
+    profile = resolver.resolve_many([identifier]).get(identifier)
+    if profile is not None:
+        profile_data.update(profile)
     
-    # Method 2: If API fails, try HTML scraping
+    # Method 2: Fall back to the profile record on the PDS, addressed by DID so it
+    # still works after a handle change
     if not profile_data["display_name"]:
         try:
-            url = f"https://bsky.app/profile/{identifier}"
+            repo = resolver.resolve_did(identifier) or identifier
+            url = f"https://bsky.social/xrpc/com.atproto.repo.getRecord?repo={repo}&collection=app.bsky.actor.profile&rkey=self"
+            
             headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = rate_limited_get(url, headers)
             
             if response.status_code == 200:
-                html = response.text
+                data = response.json()
+                profile_value = data.get("value", {})
                 
-                # These patterns may need updating as Bluesky's HTML structure changes
-                display_name_match = re.search(r'<title>(.*?) \(.*?\) - Bluesky</title>', html)
-                if display_name_match:
-                    profile_data["display_name"] = display_name_match.group(1).strip()
+                profile_data["display_name"] = profile_value.get("displayName")
+                profile_data["bio"] = profile_value.get("description")
                 
-                # Try to extract bio from meta tags
-                bio_match = re.search(r'<meta name="description" content="(.*?)"/>', html)
-                if bio_match:
-                    profile_data["bio"] = bio_match.group(1).strip()
+                # Try to get the avatar URL if available
+                if "avatar" in profile_value:
+                    profile_data["profile_image"] = profile_value.get("avatar")
+            else:
+                print(f"Bluesky API returned status code {response.status_code}")
+                
+        except Exception as e:
+            print(f"Error with Bluesky API: {e}")
+    
+    # Method 3: If the APIs fail, try HTML scraping
+    if not profile_data["display_name"]:
+        try:
+            page = rate_limited_fetch_html(f"https://bsky.app/profile/{identifier}", BLUESKY_HTML_PATTERNS)
+            
+            if page.status_code == 200:
+                # These patterns may need updating as Bluesky's HTML structure changes
+                if page.fields.group("display_name") is not None:
+                    profile_data["display_name"] = page.fields.group("display_name")
+                if page.fields.group("bio") is not None:
+                    profile_data["bio"] = page.fields.group("bio")
                 
         except Exception as e:
             print(f"Error with Bluesky HTML scraping: {e}")
@@ -404,43 +425,234 @@ def identify_platform(url: str) -> Optional[str]:
     
     return None
 
-def scrape_social_profiles(social_urls: List[str]) -> List[Dict]:
+PROFILE_URL_TEMPLATES = {
+    "twitter": "https://twitter.com/{username}",
+    "github": "https://github.com/{username}",
+    "bluesky": "https://bsky.app/profile/{username}",
+}
+
+SCRAPERS = {
+    "twitter": scrape_twitter_profile,
+    "github": scrape_github_profile,
+    "bluesky": scrape_bluesky_profile,
+}
+
+def _resolve_twitter_profiles(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
     """
-    Scrape multiple social media profiles and return enriched data
-    
-    Args:
-        social_urls: List of social media profile URLs
-        
-    Returns:
-        List of dictionaries containing profile data for each URL
+    Resolve Twitter profiles with the API v2 batch lookup (requires TWITTER_BEARER_TOKEN).
+    Handles it does not resolve had their lookup fail or time out.
     """
-    if not social_urls:
-        return []
+    if not os.environ.get("TWITTER_BEARER_TOKEN"):
+        return {}
+    users = get_twitter_batcher().lookup(usernames, timeout=_remaining_time())
+    return {
+        username: twitter_user_to_profile(username, users[username.lower()])
+        for username in usernames if username.lower() in users
+    }
+
+def _resolve_bluesky_profiles(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolve Bluesky profiles from the cache and getProfiles requests of 25 actors"""
+    return get_bluesky_resolver().resolve_many(usernames)
+
+def _resolve_github_profiles(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolve GitHub profiles from the cache and, with GITHUB_TOKEN, batched GraphQL queries"""
+    return get_github_resolver().resolve_many(usernames, os.environ.get("GITHUB_TOKEN"))
+
+# Platforms that can resolve many profiles per request. A resolver returns the
+# profiles it resolved; the rest fall back to the per-profile scraper.
+BATCH_RESOLVERS = {
+    "twitter": _resolve_twitter_profiles,
+    "github": _resolve_github_profiles,
+    "bluesky": _resolve_bluesky_profiles,
+}
+
+def _scrape_twitter_without_api(username: str) -> Dict[str, Any]:
+    """Scrape a Twitter profile without the API, whose batched lookup just failed for it"""
+    return scrape_twitter_profile(username, use_api=False)
+
+# Per-profile scrapers for profiles a batch resolver did not resolve, where the
+# default scraper would retry the same failing API
+BATCH_FALLBACKS = {
+    "twitter": _scrape_twitter_without_api,
+}
+
+def _run_with_deadline(deadline: float, func, *args):
+    token = _scrape_deadline.set(deadline)
+    try:
+        return func(*args)
+    finally:
+        _scrape_deadline.reset(token)
+
+def _scrape_one(platform: str, username: str, after_batch: bool = False) -> Dict[str, Dict[str, Any]]:
+    scraper = BATCH_FALLBACKS.get(platform, SCRAPERS[platform]) if after_batch else SCRAPERS[platform]
+
+    def scrape():
+        record_call(f"scrape:{platform}")
+        return scraper(username)
+
+    # Concurrent scrapes of the same profile (e.g. from several sessions) share one request
+    profile = get_single_flight("social_scrape").do(
+        (platform, canonical_username(platform, username), scraper.__name__), scrape
+    )
+    return {username: profile}
+
+def _resolve_batch(platform: str, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    record_call(f"scrape:{platform}_batch")
+    return BATCH_RESOLVERS[platform](usernames)
+
+def _run_scrape_jobs(jobs: List[tuple], deadline: float) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Scrape (platform, username) jobs concurrently within a deadline.
+    Batch resolvers run first; profiles they do not resolve are scraped one by one.
+    Workers run in a copy of the caller's context, so their calls are counted in the
+    caller's scoring metrics.
+    """
+    by_platform: Dict[str, List[str]] = {}
+    for platform, username in jobs:
+        by_platform.setdefault(platform, []).append(username)
     
-    results = []
+    end_time = time.monotonic() + deadline
+    results = {}
+    futures = {}
+    pool = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS)
     
-    for url in social_urls:
+    def submit_each(platform, usernames, after_batch=False):
+        for username in usernames:
+            future = pool.submit(contextvars.copy_context().run, _run_with_deadline, end_time,
+                                 _scrape_one, platform, username, after_batch)
+            futures[future] = (platform, [username], False)
+    
+    try:
+        for platform, usernames in by_platform.items():
+            if platform in BATCH_RESOLVERS:
+                future = pool.submit(contextvars.copy_context().run, _run_with_deadline, end_time,
+                                     _resolve_batch, platform, usernames)
+                futures[future] = (platform, usernames, True)
+            else:
+                submit_each(platform, usernames)
+        
+        while futures:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                platform, usernames, is_batch = futures.pop(future)
+                try:
+                    resolved = future.result()
+                except Exception as e:
+                    print(f"Error scraping {platform} profiles: {e}")
+                    resolved = {}
+                for username, profile in resolved.items():
+                    results[(platform, username)] = profile
+                if is_batch:
+                    submit_each(platform, [u for u in usernames if u not in resolved], after_batch=True)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+def _parse_social_urls(social_urls: List[str]) -> List[tuple]:
+    """Map URLs to unique (platform, username) pairs, in order"""
+    jobs = []
+    seen = set()
+    for url in social_urls or []:
         platform = identify_platform(url)
         if not platform:
             continue
         
         username = extract_username_from_url(url, platform)
-        if not username:
-            continue
-        
-        # Call the appropriate scraper based on the platform
-        if platform == "twitter":
-            profile_data = scrape_twitter_profile(username)
-        elif platform == "github":
-            profile_data = scrape_github_profile(username)
-        elif platform == "bluesky":
-            profile_data = scrape_bluesky_profile(username)
-        else:
+        if not username or (platform, username.lower()) in seen:
             continue
+        seen.add((platform, username.lower()))
+        jobs.append((platform, username))
+    return jobs
+
+def scrape_social_profiles_batch(social_url_lists: List[List[str]],
+                                 deadline: float = SCRAPE_DEADLINE) -> List[List[Dict]]:
+    """
+    Scrape the social profiles of many personas at once
+    
+    Profiles are collected across all personas, so shared profiles are scraped once
+    and platforms with batch APIs (e.g. Twitter) resolve up to 100 profiles per
+    request. Profiles already in the profile store are served from it (stale ones
+    are refreshed in the background). Results are fanned back out per persona.
+    
+    Args:
+        social_url_lists: One list of social media profile URLs per persona
+        deadline: Overall time budget in seconds
         
-        results.append(profile_data)
+    Returns:
+        One list of profile dictionaries per persona (see scrape_social_profiles)
+    """
+    persona_jobs = [_parse_social_urls(urls) for urls in social_url_lists]
+    
+    # Deduplicate across personas, case-insensitively
+    canonical = {}
+    for jobs in persona_jobs:
+        for platform, username in jobs:
+            canonical.setdefault((platform, username.lower()), (platform, username))
+    
+    # Serve stored profiles (refreshing stale ones in the background); scrape the rest
+    results = {}
+    if canonical:
+        store = get_profile_store()
+        results, stale = store.lookup(canonical.values())
+        if stale:
+            store.refresh_in_background(stale, lambda jobs: _run_scrape_jobs(jobs, SCRAPE_DEADLINE))
+        missing = [job for job in canonical.values() if job not in results]
+        if missing:
+            scraped = _run_scrape_jobs(missing, deadline)
+            for (platform, username), profile in scraped.items():
+                store.put(platform, username, profile)
+            results.update(scraped)
+    
+    persona_results = []
+    reported = set()
+    for jobs in persona_jobs:
+        profiles = []
+        for platform, username in jobs:
+            job = canonical[(platform, username.lower())]
+            if job in results:
+                profile = dict(results[job])
+                profile["username"] = username
+                profiles.append(profile)
+                continue
+            
+            if job not in reported:
+                print(f"Scraping {platform} profile {username} did not finish within {deadline}s")
+                reported.add(job)
+            profiles.append({
+                "platform": platform,
+                "username": username,
+                "display_name": None,
+                "bio": None,
+                "location": None,
+                "url": PROFILE_URL_TEMPLATES[platform].format(username=username),
+                "timed_out": True,
+            })
+        persona_results.append(profiles)
+    
+    return persona_results
+
+def scrape_social_profiles(social_urls: List[str], deadline: float = SCRAPE_DEADLINE) -> List[Dict]:
+    """
+    Scrape multiple social media profiles concurrently and return enriched data
     
-    return results
+    Profiles are read through the profile store; the others are scraped in parallel
+    on the pooled session, under the per-host rate limits. Profiles that have not finished when the deadline passes are
+    returned as partial entries (platform, username and url only, timed_out=True).
+    
+    Args:
+        social_urls: List of social media profile URLs
+        deadline: Overall time budget in seconds
+        
+    Returns:
+        List of dictionaries containing profile data for each URL
+    """
+    if not social_urls:
+        return []
+    return scrape_social_profiles_batch([social_urls], deadline)[0]
 
 def enrich_persona_with_social_data(persona: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -499,6 +711,11 @@ def enrich_persona_with_social_data(persona: Dict[str, Any]) -> Dict[str, Any]:
 
 # Example usage
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
     # Example social profile URLs
     social_urls = [
         "https://twitter.com/github",
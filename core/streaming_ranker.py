@@ -0,0 +1,117 @@
+"""
+Streaming Ranker
+
+This module scores LinkedIn candidates incrementally as they arrive from the search
+stage instead of waiting for the complete candidate list. A bounded min-heap keeps
+the current top-k, and callers are notified (or handed the updated ranking) after
+every arrival so the first plausible matches can be shown right away.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.profile_scoring import score_linkedin_candidate
+from core.score_cache import ScoreCache
+
+
+class StreamingRanker:
+    """
+    Maintain a bounded top-k ranking of scored candidates.
+
+    Args:
+        persona: The user persona dict
+        k: Number of top candidates to keep
+        cache: Optional ScoreCache passed through to score_linkedin_candidate
+        on_change: Optional callback receiving the new top-k whenever it changes
+        include_timings: Add a 'timings' section to each scored result
+    """
+
+    def __init__(self, persona: Dict, k: int = 10, cache: Optional[ScoreCache] = None,
+                 on_change: Optional[Callable[[List[Dict]], None]] = None,
+                 include_timings: bool = False):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.persona = persona
+        self.k = k
+        self.cache = cache
+        self.on_change = on_change
+        self.include_timings = include_timings
+        self.scored_count = 0
+        self._heap = []  # min-heap of (confidence, -arrival, result)
+        self._arrival = itertools.count()
+        self._seen_links = set()
+
+    def add(self, candidate: Dict) -> List[Dict]:
+        """
+        Score one candidate and update the top-k.
+
+        Args:
+            candidate: The LinkedIn candidate dict
+
+        Returns:
+            List of the current top-k scored candidates, best first
+        """
+        link = candidate.get("link")
+        if link and link in self._seen_links:
+            return self.top_k()
+        if link:
+            self._seen_links.add(link)
+
+        result = score_linkedin_candidate(
+            self.persona, candidate, cache=self.cache, include_timings=self.include_timings
+        )
+        self.scored_count += 1
+
+        # Earlier arrivals win ties, matching the stable sort in rank_linkedin_candidates
+        entry = (result["confidence"], -next(self._arrival), result)
+        changed = True
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            changed = False
+
+        ranking = self.top_k()
+        if changed and self.on_change:
+            self.on_change(ranking)
+        return ranking
+
+    def add_many(self, candidates: Iterable[Dict]) -> List[Dict]:
+        """
+        Score a chunk of candidates and update the top-k.
+
+        Args:
+            candidates: Iterable of LinkedIn candidate dicts
+
+        Returns:
+            List of the current top-k scored candidates, best first
+        """
+        ranking = self.top_k()
+        for candidate in candidates:
+            ranking = self.add(candidate)
+        return ranking
+
+    def top_k(self) -> List[Dict]:
+        """Return the current top-k scored candidates, best first."""
+        return [result for _, _, result in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+def stream_rank_candidates(persona: Dict, candidates: Iterable[Dict], k: int = 10,
+                           cache: Optional[ScoreCache] = None) -> Iterator[List[Dict]]:
+    """
+    Score candidates as they arrive and yield the updated top-k after each one.
+
+    Args:
+        persona: Dictionary containing persona information
+        candidates: Iterable (e.g. a generator over search results) of LinkedIn candidates
+        k: Number of top candidates to keep
+        cache: Optional ScoreCache shared across reruns for the same persona
+
+    Yields:
+        List of the current top-k scored candidates, best first
+    """
+    ranker = StreamingRanker(persona, k=k, cache=cache)
+    for candidate in candidates:
+        yield ranker.add(candidate)
@@ -0,0 +1,163 @@
+"""
+Twitter Batch Resolver
+
+This module resolves Twitter profiles through the API v2 batch lookup
+(/2/users/by?usernames=...), which accepts up to 100 handles per request, instead of
+one /2/users/by/username/{username} request per handle.
+
+Bulk runs pass every handle of a batch of personas at once. Single lookups go
+through TwitterUserBatcher, which holds each request for a short linger window so
+that concurrent callers share one API call. A batch sent by the linger timer runs
+in the context of the caller that started the timer, so that caller's scrape
+deadline also bounds the batch's rate-limit waits and request timeout.
+"""
+
+import threading
+import contextvars
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+TWITTER_USERS_URL = "https://api.twitter.com/2/users/by"
+USER_FIELDS = "description,location,public_metrics,profile_image_url"
+
+# Maximum handles per lookup request (API limit)
+MAX_USERNAMES_PER_REQUEST = 100
+
+# How long a single lookup waits for others to join its batch (seconds)
+LINGER_SECONDS = 0.05
+
+
+def twitter_user_to_profile(username: str, user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert an API v2 user object to the profile dictionary used by social_scraper.
+
+    Args:
+        username: The requested handle
+        user: The API user object, or None if the user was not found
+
+    Returns:
+        Profile dictionary (empty values if user is None)
+    """
+    user = user or {}
+    metrics = user.get("public_metrics") or {}
+    return {
+        "platform": "twitter",
+        "username": username,
+        "display_name": user.get("name"),
+        "bio": user.get("description"),
+        "location": user.get("location"),
+        "followers_count": metrics.get("followers_count"),
+        "following_count": metrics.get("following_count"),
+        "tweet_count": metrics.get("tweet_count"),
+        "profile_image": user.get("profile_image_url"),
+        "url": f"https://twitter.com/{username}",
+    }
+
+
+def lookup_twitter_users(usernames: Iterable[str], get: Callable) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Look up Twitter users in chunks of up to 100 handles per request.
+
+    Args:
+        usernames: Twitter handles (without @)
+        get: Function that performs an authenticated GET for a full URL and returns a response
+
+    Returns:
+        Dict mapping each lower-cased handle to its API user object, or None if not found
+
+    Raises:
+        requests.HTTPError: If a lookup request fails
+    """
+    handles = list(dict.fromkeys(username.lower() for username in usernames if username))
+    users: Dict[str, Optional[Dict[str, Any]]] = {handle: None for handle in handles}
+    for start in range(0, len(handles), MAX_USERNAMES_PER_REQUEST):
+        chunk = handles[start:start + MAX_USERNAMES_PER_REQUEST]
+        response = get(f"{TWITTER_USERS_URL}?usernames={','.join(chunk)}&user.fields={USER_FIELDS}")
+        response.raise_for_status()
+        for user in response.json().get("data", []):
+            users[user.get("username", "").lower()] = user
+    return users
+
+
+class TwitterUserBatcher:
+    """
+    Micro-batches concurrent Twitter lookups into shared batch requests.
+
+    Args:
+        get: Function that performs an authenticated GET for a full URL
+        linger: Seconds to wait for more handles before sending a batch
+        max_batch: Handles that trigger an immediate send
+    """
+
+    def __init__(self, get: Callable, linger: float = LINGER_SECONDS,
+                 max_batch: int = MAX_USERNAMES_PER_REQUEST):
+        self.get = get
+        self.linger = linger
+        self.max_batch = max_batch
+        self._pending: Dict[str, Future] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _take_batch(self) -> Dict[str, Future]:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return batch
+
+    def _send(self, batch: Dict[str, Future]) -> None:
+        if not batch:
+            return
+        try:
+            users = lookup_twitter_users(list(batch), self.get)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for handle, future in batch.items():
+            future.set_result(users.get(handle))
+
+    def _flush(self) -> None:
+        self._send(self._take_batch())
+
+    def lookup(self, usernames: List[str], timeout: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up handles, sharing requests with concurrent callers.
+
+        Args:
+            usernames: Twitter handles
+            timeout: Maximum seconds to wait for the results
+
+        Returns:
+            Dict mapping each lower-cased handle to its API user object, or None if not
+            found (handles that failed or timed out are omitted)
+        """
+        futures: Dict[str, Future] = {}
+        full_batches = []
+        with self._lock:
+            for username in usernames:
+                handle = username.lower()
+                future = self._pending.get(handle)
+                if future is None:
+                    future = Future()
+                    self._pending[handle] = future
+                futures[handle] = future
+                if len(self._pending) >= self.max_batch:
+                    full_batches.append(self._pending)
+                    self._pending = {}
+            if self._pending and self._timer is None:
+                # Run the flush in this caller's context (e.g. its scrape deadline)
+                self._timer = threading.Timer(self.linger, contextvars.copy_context().run, args=(self._flush,))
+                self._timer.daemon = True
+                self._timer.start()
+
+        for batch in full_batches:
+            self._send(batch)
+
+        wait(futures.values(), timeout=timeout)
+        results = {}
+        for handle, future in futures.items():
+            if future.done() and future.exception() is None:
+                results[handle] = future.result()
+        return results
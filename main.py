@@ -1,11 +1,14 @@
 import os
 import json
 from dotenv import load_dotenv
-from core.query_generator import generate_search_queries, search_linkedin_profiles
+from core.query_generator import generate_search_queries, iter_linkedin_profiles
 from core.name_expansion import expand_name_from_initial, extract_name_from_snippet
 from core.social_scraper import scrape_social_profiles, enrich_persona_with_social_data
 from core.image_similarity import compare_image_similarity_clip, validate_persona_match
 from core.profile_scoring import score_linkedin_candidate, rank_linkedin_candidates
+from core.score_cache import create_score_cache
+from core.streaming_ranker import StreamingRanker
+from core.instrumentation import export_histograms
 from api.gemini_api import generate_enriched_persona
 from api.people_api import enrich_persona_with_pdl
 
@@ -142,17 +145,23 @@ def main():
     if os.environ.get("SERPAPI_API_KEY"):
         print("\nSearching for LinkedIn profiles...")
         try:
-            # Use the most enriched persona we have
-            results = search_linkedin_profiles(final_persona, max_results=5)
-            print(f"\nFound {len(results)} LinkedIn profiles:")
-            for i, result in enumerate(results, 1):
-                print(f"{i}. {result['title']}")
-                print(f"   {result['link']}")
-                print(f"   {result['snippet']}\n")
+            # Use the most enriched persona we have; candidates are scored as they arrive
+            score_cache = create_score_cache("disk")
+            ranker = StreamingRanker(final_persona, k=5, cache=score_cache, include_timings=True)
+            results = []
+            for candidate in iter_linkedin_profiles(final_persona, max_results=5):
+                results.append(candidate)
+                leader = ranker.add(candidate)[0]
+                print(f"{len(results)}. {candidate['title']}")
+                print(f"   {candidate['link']}")
+                print(f"   {candidate['snippet']}")
+                print(f"   Current best match: {leader['profile']['title']} ({leader['confidence']}%)\n")
+            print(f"\nFound {len(results)} LinkedIn profiles")
             
-            # Score candidates using the profile_scoring module
-            print("\nScoring LinkedIn profiles against persona...")
-            scored_results = rank_linkedin_candidates(final_persona, results)
+            scored_results = ranker.top_k()
+            print(f"Score cache: {score_cache.stats()}")
+            print("Scoring latency breakdown:")
+            print(export_histograms(scored_results))
             
             print("\nRanked LinkedIn profiles:")
             for i, result in enumerate(scored_results, 1):
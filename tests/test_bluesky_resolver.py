@@ -0,0 +1,70 @@
+from core import social_scraper
+from core.bluesky_resolver import BlueskyResolver
+from core.cache import MemoryCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data or {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def make_resolver(get):
+    return BlueskyResolver(get, profile_cache=MemoryCache(), did_cache=MemoryCache())
+
+
+def test_resolve_did_resolves_and_caches_handle():
+    requested = []
+
+    def get(url):
+        requested.append(url)
+        return FakeResponse(200, {"did": "did:plc:abc123"})
+
+    resolver = make_resolver(get)
+
+    assert resolver.resolve_did("@Alice.bsky.social") == "did:plc:abc123"
+    assert resolver.resolve_did("alice.bsky.social") == "did:plc:abc123"
+    assert len(requested) == 1
+    assert "resolveHandle?handle=alice.bsky.social" in requested[0]
+
+
+def test_resolve_did_returns_dids_without_a_request():
+    def get(url):
+        raise AssertionError("unexpected request")
+
+    assert make_resolver(get).resolve_did("did:plc:abc123") == "did:plc:abc123"
+
+
+def test_resolve_did_returns_none_for_unknown_handle():
+    resolver = make_resolver(lambda url: FakeResponse(400, {"error": "InvalidRequest"}))
+
+    assert resolver.resolve_did("nobody.bsky.social") is None
+    assert resolver.cached_did("nobody.bsky.social") is None
+
+
+def test_record_fallback_is_addressed_by_resolved_did(monkeypatch):
+    def appview_get(url):
+        if "getProfiles" in url:
+            return FakeResponse(502)
+        return FakeResponse(200, {"did": "did:plc:abc123"})
+
+    record_urls = []
+
+    def rate_limited_get(url, headers):
+        record_urls.append(url)
+        return FakeResponse(200, {"value": {"displayName": "Alice", "description": "Hi"}})
+
+    monkeypatch.setattr(social_scraper, "_bluesky_resolver", make_resolver(appview_get))
+    monkeypatch.setattr(social_scraper, "rate_limited_get", rate_limited_get)
+
+    profile = social_scraper.scrape_bluesky_profile("alice.bsky.social")
+
+    assert profile["display_name"] == "Alice"
+    assert "repo=did:plc:abc123&" in record_urls[0]
@@ -0,0 +1,58 @@
+from core.html_stream import HTMLFieldMatcher, MATCH_OVERLAP, read_html
+
+
+class FakeStreamedResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body.encode()
+        self.status_code = status_code
+        self.encoding = "utf-8"
+        self.bytes_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            chunk = self.body[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+PATTERNS = {
+    "display_name": r"<title>(.*?)</title>",
+    "location": r'<div class="location">(.*?)</div>',
+}
+
+
+def test_missing_optional_field_stops_after_the_optional_window():
+    response = FakeStreamedResponse("<title>Alice</title>" + "x" * 400_000)
+
+    page = read_html(response, PATTERNS, chunk_size=1024, required=["display_name"], optional_bytes=4096)
+
+    assert page.fields.group("display_name") == "Alice"
+    assert page.fields.group("location") is None
+    assert page.truncated
+    assert response.bytes_read <= 1024 + 4096
+    assert response.closed
+
+
+def test_optional_field_inside_the_window_is_found():
+    response = FakeStreamedResponse("<title>Alice</title>" + "x" * 2000 + '<div class="location">Paris</div>' + "x" * 50_000)
+
+    page = read_html(response, PATTERNS, chunk_size=1024, required=["display_name"], optional_bytes=4096)
+
+    assert page.fields.group("location") == "Paris"
+    assert response.bytes_read < 50_000
+
+
+def test_long_match_across_a_chunk_boundary_is_found_by_finish():
+    matcher = HTMLFieldMatcher({"bio": r'<div class="bio">(.*?)</div>'})
+    long_bio = "b" * (MATCH_OVERLAP * 2)
+
+    matcher.feed('<div class="bio">' + long_bio)
+    matcher.feed("</div>")
+    assert matcher.group("bio") is None
+
+    matcher.finish()
+    assert matcher.group("bio") == long_bio
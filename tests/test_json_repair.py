@@ -0,0 +1,28 @@
+from core.json_repair import parse_partial_json
+
+
+def test_complete_json_is_returned_as_is():
+    assert parse_partial_json('```json\n{"name": "A", "skills": ["py"]}\n```') == (
+        {"name": "A", "skills": ["py"]},
+        True,
+    )
+
+
+def test_truncated_list_value_drops_the_field():
+    value, complete = parse_partial_json('{"name": "A", "skills": ["py", "go", "ru')
+
+    assert complete is False
+    assert value == {"name": "A"}
+
+
+def test_truncated_nested_object_drops_the_field():
+    value, complete = parse_partial_json('{"name": "A", "links": {"github": "a", "twitter": [')
+
+    assert complete is False
+    assert value == {"name": "A"}
+
+
+def test_truncated_number_is_dropped():
+    value, _ = parse_partial_json('{"name": "A", "skills": ["py"], "years": 12')
+
+    assert value == {"name": "A", "skills": ["py"]}
@@ -0,0 +1,83 @@
+import time
+
+import requests
+
+from core import social_scraper
+from core.cache import MemoryCache
+from core.nitter_pool import NitterPool
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+def make_pool():
+    return NitterPool(instances=["https://a.example", "https://b.example"], health_store=MemoryCache())
+
+
+def test_not_found_page_counts_as_success():
+    pool = make_pool()
+
+    result = pool.fetch(
+        "/missing_user",
+        get=lambda url: FakeResponse(404, "User \"missing_user\" not found"),
+        validate=lambda html: "<title>" in html,
+    )
+
+    assert result is None
+    # Let the losing hedge finish recording
+    pool._executor.shutdown(wait=True)
+    for stats in pool.health().values():
+        assert stats["successes"] == 1
+        assert stats["failures"] == 0
+        assert stats["consecutive_failures"] == 0
+
+
+def test_local_timeout_leaves_health_unchanged():
+    pool = make_pool()
+    before = pool.health()
+
+    def get(url):
+        raise TimeoutError("Rate limit would exceed the scrape deadline")
+
+    result = pool.fetch("/someone", get=get, validate=lambda html: True)
+
+    assert result is None
+    assert pool.health() == before
+
+
+def test_request_timeout_cut_short_by_deadline_leaves_health_unchanged(monkeypatch):
+    pool = make_pool()
+    before = pool.health()
+
+    class SlowSession:
+        def request(self, method, url, headers=None, timeout=None, **kwargs):
+            # The timeout was shortened to the time left before the deadline
+            time.sleep(timeout)
+            raise requests.exceptions.ReadTimeout(f"Read timed out (timeout={timeout})")
+
+    monkeypatch.setattr(social_scraper, "get_session", lambda: SlowSession())
+    token = social_scraper._scrape_deadline.set(time.monotonic() + 0.05)
+    try:
+        result = pool.fetch(
+            "/someone",
+            get=lambda url: social_scraper.rate_limited_request("GET", url, {}),
+            validate=lambda html: True,
+        )
+    finally:
+        social_scraper._scrape_deadline.reset(token)
+
+    assert result is None
+    assert pool.health() == before
+
+
+def test_server_error_counts_as_failure():
+    pool = make_pool()
+
+    pool.fetch("/someone", get=lambda url: FakeResponse(502), validate=lambda html: True)
+
+    for stats in pool.health().values():
+        assert stats["failures"] == 1
+        assert stats["successes"] == 0
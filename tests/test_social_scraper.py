@@ -0,0 +1,47 @@
+from core import social_scraper
+
+
+class FailingBatcher:
+    def __init__(self):
+        self.lookups = []
+
+    def lookup(self, usernames, timeout=None):
+        # Failed and timed-out handles are omitted from the results
+        self.lookups.append(list(usernames))
+        return {}
+
+
+class NoNitter:
+    def fetch(self, path, get, validate, max_attempts=None, not_found=None):
+        return None
+
+
+def test_failed_twitter_batch_falls_back_without_retrying_the_api(monkeypatch):
+    batcher = FailingBatcher()
+    monkeypatch.setenv("TWITTER_BEARER_TOKEN", "token")
+    monkeypatch.setattr(social_scraper, "get_twitter_batcher", lambda: batcher)
+    monkeypatch.setattr(social_scraper, "get_nitter_pool", lambda: NoNitter())
+
+    def fetch_html(url, patterns):
+        raise TimeoutError("offline")
+
+    monkeypatch.setattr(social_scraper, "rate_limited_fetch_html", fetch_html)
+
+    results = social_scraper._run_scrape_jobs([("twitter", "alice"), ("twitter", "bob")], deadline=5)
+
+    assert batcher.lookups == [["alice", "bob"]]
+    assert set(results) == {("twitter", "alice"), ("twitter", "bob")}
+    assert results[("twitter", "alice")]["display_name"] is None
+
+
+def test_scrape_workers_record_calls_in_the_callers_metrics(monkeypatch):
+    from core.instrumentation import collect_metrics
+
+    monkeypatch.setitem(social_scraper.SCRAPERS, "github", lambda username: {"platform": "github", "username": username})
+    monkeypatch.setitem(social_scraper.BATCH_RESOLVERS, "github", lambda usernames: {})
+
+    with collect_metrics() as metrics:
+        social_scraper._run_scrape_jobs([("github", "alice"), ("github", "bob")], deadline=5)
+
+    assert metrics.calls["scrape:github_batch"] == 1
+    assert metrics.calls["scrape:github"] == 2
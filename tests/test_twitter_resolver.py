@@ -0,0 +1,32 @@
+import contextvars
+
+from core.twitter_resolver import TwitterUserBatcher
+
+deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def test_linger_flush_runs_in_the_callers_context():
+    seen = []
+
+    def get(url):
+        seen.append(deadline.get())
+        return FakeResponse({"data": [{"username": "Alice", "name": "Alice"}]})
+
+    batcher = TwitterUserBatcher(get, linger=0.01)
+    deadline.set(123.0)
+
+    users = batcher.lookup(["alice"], timeout=5)
+
+    assert users["alice"]["name"] == "Alice"
+    assert seen == [123.0]